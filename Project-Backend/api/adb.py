@@ -0,0 +1,127 @@
+# api/adb.py
+"""
+Async counterpart of api/db.py for the async read views
+(api/async_views.py, ASYNC_READ_VIEWS).
+
+A coroutine waiting on MySQL holds neither a thread nor an executor slot,
+only one connection of a bounded aiomysql pool – so one ASGI worker can
+keep thousands of slow reads in flight.
+
+• one pool per process and event loop, created on first use
+  (ASYNC_DB_POOL["SIZE"] connections at most)
+• checkout waits up to ASYNC_DB_POOL["TIMEOUT"] s, then DBError 503 like
+  api/pool.py
+• errors map onto DBError exactly as in api/db.py, UUID_STORAGE and the
+  preloaded CALL statements apply too
+• a connection whose call failed or was cancelled (client went away
+  mid-query) is closed, never handed to the next caller
+
+aiomysql is optional: without it available() is False and the sync views
+stay in place.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pymysql
+from django.conf import settings
+
+from . import metrics
+from .db import _call_sql, _db_errors, _db_params, _db_rows
+from .pool import connect_kwargs, PoolTimeout, _DEAD_CONNECTION_CODES
+
+try:
+    import aiomysql
+except ImportError:                        # optional: async read views
+    aiomysql = None
+
+
+def available():
+    return aiomysql is not None
+
+
+# ── per-process, per-loop pool ────────────────────────────────
+_pool      = None
+_pool_loop = None
+_pool_lock = None                          # asyncio.Lock of _pool_loop
+
+
+async def get_pool():
+    global _pool, _pool_loop, _pool_lock
+    loop = asyncio.get_running_loop()
+    if _pool_loop is not loop:
+        # a pool's sockets belong to the loop that opened them
+        _pool, _pool_loop, _pool_lock = None, loop, asyncio.Lock()
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                conf   = settings.ASYNC_DB_POOL
+                kwargs = connect_kwargs()
+                kwargs["db"] = kwargs.pop("database")
+                _pool = await aiomysql.create_pool(
+                    minsize=0,
+                    maxsize=conf["SIZE"],
+                    pool_recycle=conf["RECYCLE"],
+                    **kwargs,
+                )
+    return _pool
+
+
+@asynccontextmanager
+async def _cursor():
+    pool = await get_pool()
+    try:
+        conn = await asyncio.wait_for(pool.acquire(),
+                                      settings.ASYNC_DB_POOL["TIMEOUT"])
+    except asyncio.TimeoutError:
+        raise PoolTimeout("database pool exhausted")
+
+    discard = False
+    try:
+        async with conn.cursor() as cur:
+            yield cur
+    except pymysql.MySQLError as exc:
+        code = exc.args[0] if exc.args else None
+        discard = code in _DEAD_CONNECTION_CODES
+        if not discard:
+            try:
+                await conn.rollback()
+            except pymysql.MySQLError:
+                discard = True
+        raise
+    except BaseException:
+        discard = True                     # cancelled mid-query: state unknown
+        raise
+    finally:
+        if discard:
+            conn.close()                   # a closed connection leaves the pool
+        pool.release(conn)
+
+
+async def _call_procedure(name, params=()):
+    """call_procedure() of api/db.py, awaited."""
+    with _db_errors():
+        async with _cursor() as cur:
+            await cur.execute(_call_sql(name, len(params)), _db_params(params))
+            return _db_rows(await cur.fetchall())
+
+
+async def _query(name, sql, params=()):
+    """query() of api/db.py, awaited."""
+    with _db_errors():
+        async with _cursor() as cur:
+            await cur.execute(sql, _db_params(params))
+            return _db_rows(await cur.fetchall())
+
+
+# bound once at import, like api/db.py
+if metrics.enabled():
+    call_procedure = metrics.atimed("procedure", _call_procedure)
+    query          = metrics.atimed("query", _query)
+else:
+    call_procedure = _call_procedure
+    query          = _query
+
+
+async def query_one(name, sql, params=()):
+    rows = await query(name, sql, params)
+    return rows[0] if rows else None
@@ -0,0 +1,192 @@
+# api/async_views.py
+"""
+Async twins of the read-only endpoints, for the ASGI server
+(SERVER_INTERFACE=asgi, gunicorn.conf.py) with ASYNC_READ_VIEWS on:
+
+    GET /api/me                   MyProfileView
+    GET /api/presented-courses    PresentedCourseListView
+    GET /api/my-taken-courses     TakenCourseListView
+    GET /api/my-courses           RecordCourseListView
+    GET /api/my-student-records   StudentRecordListView
+
+Same query parameters, permissions, ETags and response bodies as the
+APIViews; the member lookup and the procedures are awaited on the aiomysql
+pool of api/adb.py, so a request waiting on MySQL costs a coroutine, not
+a thread.  Session and bearer credentials are accepted (HTTP Basic is
+not).
+
+urls.py routes through read_view(): with the setting off – or aiomysql
+not installed – the sync views stay in place.  Under a WSGI server keep
+it off: every request would run on a fresh event loop and open its own
+pool.
+"""
+import logging
+
+from django.conf import settings
+from django.views import View
+from rest_framework.exceptions import PermissionDenied
+
+from . import adb
+from .conditional import conditional_list
+from .db import DBError
+from .middleware import aget_user
+from .rows import json_response
+from .serializers import (MyProfileSerializer, PresentedCourseListQuerySerializer,
+                          TakenCourseQuerySerializer, PRESENTED_COURSE_ROWS,
+                          RECORD_COURSE_ROWS, STUDENT_RECORD_ROWS, TAKEN_COURSE_ROWS)
+from .views import (MyProfileView, PresentedCourseListView, TakenCourseListView,
+                    RecordCourseListView, StudentRecordListView)
+
+log = logging.getLogger(__name__)
+
+
+class AsyncReadView(View):
+    """
+    The part of APIView the read endpoints use – IsAuthenticated,
+    PermissionDenied → 403, JSON errors – around `async def get`.
+    """
+    http_method_names = ["get", "head", "options"]
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await aget_user(request)
+        if not request.user.is_authenticated:
+            return json_response(
+                {"detail": "Authentication credentials were not provided."},
+                status=403)
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except PermissionDenied as e:
+            return json_response({"detail": e.detail}, status=403)
+
+
+class AsyncMyProfileView(AsyncReadView):
+    """
+    GET /api/me    – MyProfileView, awaited
+    """
+    async def get(self, request):
+        rows = await adb.call_procedure("get_member_profile", (request.user.id,))
+        if not rows:
+            return json_response({"detail": "Profile not found"}, status=404)
+        return json_response(MyProfileSerializer.from_row(rows[0]).data)
+
+
+class AsyncPresentedCourseListView(AsyncReadView):
+    """
+    GET /api/presented-courses?semester_id=<sid>&major_id=<mid>
+        – PresentedCourseListView, awaited
+    """
+    @conditional_list("presented_courses", "majors", "courses", "members", "workers", "rooms")
+    async def get(self, request):
+        ser = PresentedCourseListQuerySerializer(data=request.GET)
+        if not ser.is_valid():
+            return json_response(ser.errors, status=400)
+        try:
+            rows = await adb.call_procedure(
+                "list_presented_courses",
+                (ser.validated_data["semester_id"], ser.validated_data["major_id"]),
+            )
+        except DBError as e:
+            return json_response({"detail": e.msg}, status=400)
+        return PRESENTED_COURSE_ROWS.response(rows)
+
+
+class AsyncTakenCourseListView(AsyncReadView):
+    """
+    GET /api/my-taken-courses[?semester_id=<sid>][&member_mid=<mid>]
+        – TakenCourseListView, awaited
+    """
+    @conditional_list("taken_courses", "std_records", "presented_courses", "courses", "members", "rooms")
+    async def get(self, request):
+        q = TakenCourseQuerySerializer(data=request.GET)
+        if not q.is_valid():
+            return json_response(q.errors, status=400)
+        semester_id = q.validated_data.get("semester_id", "")
+        member_mid  = q.validated_data.get("member_mid")
+
+        if member_mid:
+            if not request.user.is_staff:
+                raise PermissionDenied("Only admins may specify member_mid")
+        else:
+            member_mid = request.user.id
+
+        try:
+            rows = await adb.call_procedure("list_taken_courses",
+                                            (member_mid, semester_id or None))
+        except DBError as e:
+            return json_response({"detail": e.msg}, status=400)
+
+        return TAKEN_COURSE_ROWS.response(rows)
+
+
+class AsyncRecordCourseListView(AsyncReadView):
+    """
+    GET /api/my-courses?record_id=<record>&semester_id=<sid>
+        – RecordCourseListView, awaited
+    """
+    async def _owns_record(self, record_id, user_id):
+        return await adb.query_one(
+            "owns_record",
+            "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
+            (record_id, user_id),
+        ) is not None
+
+    @conditional_list("taken_courses", "presented_courses", "courses", "rooms", "staffs", "members")
+    async def get(self, request):
+        record_id   = request.GET.get("record_id")
+        semester_id = request.GET.get("semester_id")
+
+        if not record_id or not semester_id:
+            return json_response({"detail": "record_id and semester_id are required"},
+                                 status=400)
+
+        try:
+            if not request.user.is_staff and not await self._owns_record(record_id, request.user.id):
+                raise PermissionDenied("You do not own this student record")
+            rows = await adb.call_procedure("list_record_courses", (record_id, semester_id))
+        except DBError as e:
+            return json_response({"detail": e.msg}, status=400)
+
+        return RECORD_COURSE_ROWS.response(rows)
+
+
+class AsyncStudentRecordListView(AsyncReadView):
+    """
+    GET /api/my-student-records[?member_mid=<uuid>]
+        – StudentRecordListView, awaited
+    """
+    @conditional_list("std_records", "majors")
+    async def get(self, request):
+        member_mid = request.GET.get("member_mid")
+
+        if member_mid:
+            if not request.user.is_staff:
+                raise PermissionDenied("Only admins may specify member_mid")
+        else:
+            member_mid = request.user.id     # your own
+
+        try:
+            rows = await adb.call_procedure("list_student_records", (member_mid,))
+        except DBError as e:
+            return json_response({"detail": e.msg}, status=400)
+
+        return STUDENT_RECORD_ROWS.response(rows)
+
+
+# sync view → async twin
+ASYNC_VIEWS = {
+    MyProfileView:           AsyncMyProfileView,
+    PresentedCourseListView: AsyncPresentedCourseListView,
+    TakenCourseListView:     AsyncTakenCourseListView,
+    RecordCourseListView:    AsyncRecordCourseListView,
+    StudentRecordListView:   AsyncStudentRecordListView,
+}
+
+
+def read_view(view):
+    """view.as_view(), or its async twin's when ASYNC_READ_VIEWS is on."""
+    if getattr(settings, "ASYNC_READ_VIEWS", False):
+        if adb.available():
+            return ASYNC_VIEWS[view].as_view()
+        log.warning("ASYNC_READ_VIEWS is on but aiomysql is not installed; "
+                    "serving %s synchronously", view.__name__)
+    return view.as_view()
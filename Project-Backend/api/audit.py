@@ -0,0 +1,224 @@
+# api/audit.py
+"""
+Where grade changes are audited (GRADE_AUDIT["SINK"]).
+
+The grade procedures (set_student_grade_tx, set_section_grades_tx) take
+the acting member and return the grades they changed.  With the default
+"transaction" sink they also insert grade_audit themselves – one
+statement per transaction, rolled back with it.  The other sinks move
+the write out of the grade transaction:
+
+• "table" – grade_audit, filled by a background thread with multi-row
+  INSERTs of up to BATCH entries
+• "file"  – one JSON object per line appended to PATH, same batching
+• "off"   – no audit at all
+
+A batch is written when BATCH entries are waiting or the oldest is
+FLUSH_SECONDS old; what is still pending at interpreter exit is flushed.
+Out-of-band sinks trade atomicity for write amplification: a crash may
+lose the last unflushed batch, and more than MAX_PENDING waiting entries
+(sink down) drops the oldest.
+"""
+import atexit
+import datetime
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections, connection
+
+from .db import DBError, execute_many
+
+log = logging.getLogger(__name__)
+
+SINKS = ("transaction", "table", "file", "off")
+
+
+def in_transaction():
+    """Pass as p_log_audit: should the procedure write grade_audit itself?"""
+    return settings.GRADE_AUDIT["SINK"] == "transaction"
+
+
+def record(actor_mid, changes):
+    """
+    Queue the rows a grade procedure returned – (record_id, semester_id,
+    pcid, old_grade, new_grade) – for the out-of-band sink, if any.
+    """
+    if not changes:
+        return
+    sink = get_sink()
+    if sink is None:
+        return
+    changed_at = datetime.datetime.now().replace(microsecond=0)
+    sink.put([(r[0], r[1], r[2], r[3], r[4], str(actor_mid), changed_at)
+              for r in changes])
+
+
+class _BatchSink:
+    """Append-only buffer drained in batches by one daemon thread."""
+
+    def __init__(self, batch, flush_seconds, max_pending):
+        self.batch         = batch
+        self.flush_seconds = flush_seconds
+
+        self._cond    = threading.Condition()
+        self._pending = deque(maxlen=max_pending)  # full → oldest dropped
+        self._oldest  = None                       # monotonic time of first pending
+        self._thread  = None
+        self._write_lock = threading.Lock()        # worker vs. atexit flush
+
+        # metrics
+        self.written = 0
+        self.dropped = 0
+
+    # ---------- producer side -------------------------------------
+    def put(self, entries):
+        with self._cond:
+            overflow = len(self._pending) + len(entries) - self._pending.maxlen
+            if overflow > 0:
+                self.dropped += overflow
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.extend(entries)
+            self._start()
+            if len(self._pending) >= self.batch:
+                self._cond.notify()
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, daemon=True,
+                                            name=f"grade-audit-{self.name}")
+            self._thread.start()
+
+    # ---------- consumer side -------------------------------------
+    def _take(self):
+        """Block until a batch is due, then pop it."""
+        with self._cond:
+            while True:
+                if self._pending:
+                    due = self._oldest + self.flush_seconds - time.monotonic()
+                    if len(self._pending) >= self.batch or due <= 0:
+                        break
+                    self._cond.wait(due)
+                else:
+                    self._cond.wait()
+            n = min(self.batch, len(self._pending))
+            entries = [self._pending.popleft() for _ in range(n)]
+            self._oldest = time.monotonic() if self._pending else None
+            return entries
+
+    def _requeue(self, entries):
+        """Put a failed batch back in front; what no longer fits is dropped."""
+        with self._cond:
+            room = self._pending.maxlen - len(self._pending)
+            if room < len(entries):
+                self.dropped += len(entries) - room
+                entries = entries[len(entries) - room:]
+            self._pending.extendleft(reversed(entries))
+            self._oldest = time.monotonic()
+
+    def _work(self):
+        while True:
+            entries = self._take()
+            try:
+                with self._write_lock:
+                    self.write(entries)
+                self.written += len(entries)
+            except Exception:
+                log.exception("grade audit: %s sink failed, retrying %d entries",
+                              self.name, len(entries))
+                self._requeue(entries)
+                time.sleep(self.flush_seconds)
+
+    def flush(self):
+        """Write everything pending now, in the calling thread."""
+        with self._cond:
+            entries = list(self._pending)
+            self._pending.clear()
+            self._oldest = None
+        with self._write_lock:
+            for i in range(0, len(entries), self.batch):
+                self.write(entries[i:i + self.batch])
+                self.written += len(entries[i:i + self.batch])
+
+    def stats(self):
+        with self._cond:
+            return {"sink": self.name, "pending": len(self._pending),
+                    "written": self.written, "dropped": self.dropped}
+
+
+class TableSink(_BatchSink):
+    name = "table"
+    SQL  = ("INSERT INTO grade_audit (record_id, semester_id, pcid, old_grade,"
+            " new_grade, actor_mid, changed_at) VALUES (%s,%s,%s,%s,%s,%s,%s)")
+
+    def write(self, entries):
+        close_old_connections()
+        try:
+            execute_many(self.SQL, entries)
+        except DBError:
+            connection.close()             # reconnect on the next batch
+            raise
+
+
+class FileSink(_BatchSink):
+    name = "file"
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+
+    @staticmethod
+    def _line(e):
+        return json.dumps({
+            "record_id":   e[0],
+            "semester_id": e[1],
+            "pcid":        e[2],
+            "old_grade":   None if e[3] is None else str(e[3]),
+            "new_grade":   None if e[4] is None else str(e[4]),
+            "actor_mid":   e[5],
+            "changed_at":  e[6].isoformat(),
+        }) + "\n"
+
+    def write(self, entries):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(self._line(e) for e in entries))
+
+
+# ── per-process singleton ─────────────────────────────────────
+_sink      = None
+_sink_lock = threading.Lock()
+
+
+def get_sink():
+    """The out-of-band sink of this process, or None ("transaction"/"off")."""
+    global _sink
+    conf = settings.GRADE_AUDIT
+    if conf["SINK"] not in SINKS:
+        raise ImproperlyConfigured(
+            f"GRADE_AUDIT['SINK'] must be one of {', '.join(SINKS)}")
+    if conf["SINK"] in ("transaction", "off"):
+        return None
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                kwargs = dict(batch=conf["BATCH"],
+                              flush_seconds=conf["FLUSH_SECONDS"],
+                              max_pending=conf["MAX_PENDING"])
+                if conf["SINK"] == "file":
+                    _sink = FileSink(conf["PATH"], **kwargs)
+                else:
+                    _sink = TableSink(**kwargs)
+                atexit.register(_flush_at_exit)
+    return _sink
+
+
+def _flush_at_exit():
+    try:
+        _sink.flush()
+    except Exception:
+        log.exception("grade audit: final flush failed")
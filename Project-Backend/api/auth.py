@@ -1,6 +1,8 @@
 from django.contrib.auth.backends import BaseBackend
+from rest_framework.authentication import BaseAuthentication
 from types import SimpleNamespace
-from django.db import connection
+from api.db import query_one
+from api.cache import get_member, set_member, aget_member, aset_member
 
 class _UserLite(SimpleNamespace):
     """
@@ -14,6 +16,9 @@ class _UserLite(SimpleNamespace):
         return True
 
 
+_IDENTITY_SQL = "SELECT mid, is_admin, fname, lname FROM members WHERE mid = %s"
+
+
 class MemberBackend(BaseBackend):
     def authenticate(self, request, username=None, password=None):
         return None   # handled by sign‑in procedure
@@ -22,17 +27,36 @@ class MemberBackend(BaseBackend):
         if member_id is None:
             return None   # middleware will swap in AnonymousUser()
 
-        with connection.cursor() as cur:
-            cur.execute(
-                "SELECT mid, is_admin, fname, lname "
-                "FROM members WHERE mid = %s",
-                (member_id,),
-            )
-            row = cur.fetchone()
-
+        # cache first: identity rarely changes, so a signed-in request
+        # normally costs no DB round-trip at all
+        row = get_member(member_id)
         if row is None:
+            row = query_one("member_identity", _IDENTITY_SQL, (member_id,))
+
+            if row is None:
+                return None
+            set_member(member_id, tuple(row))
+
+        return self._user(row)
+
+    async def aget_user(self, member_id):
+        """get_user() for the async views – a cache miss awaits api/adb.py."""
+        from api import adb
+
+        if member_id is None:
             return None
 
+        row = await aget_member(member_id)
+        if row is None:
+            row = await adb.query_one("member_identity", _IDENTITY_SQL, (member_id,))
+            if row is None:
+                return None
+            await aset_member(member_id, tuple(row))
+
+        return self._user(row)
+
+    @staticmethod
+    def _user(row):
         # Return a fully‑featured user object
         return _UserLite(
             id=row[0],
@@ -42,3 +66,22 @@ class MemberBackend(BaseBackend):
             is_superuser=False,
             is_active=True,            # required by SessionAuthentication
         )
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    DRF authentication for `Authorization: Bearer <token>` requests.
+
+    The middleware has already resolved the user; this class only exists so
+    bearer clients are not put through SessionAuthentication's CSRF check –
+    a header token is not an ambient credential.  Cookie tokens fall through
+    to SessionAuthentication and keep CSRF enforcement.
+    """
+    def authenticate(self, request):
+        user   = request._request.user          # resolves the lazy user
+        claims = getattr(request._request, "member_token", None)
+        if claims is None or claims["via"] != "bearer":
+            return None
+        if not user.is_authenticated:
+            return None
+        return (user, claims)
@@ -0,0 +1,267 @@
+# api/cache.py
+"""
+Small caching helpers shared by the API.
+
+Two layers are used everywhere:
+
+• LocalCache – bounded, per-process LRU with a TTL.  Served straight from
+  memory, so a hit costs no I/O at all.
+• django.core.cache – the shared layer (LocMem by default, Redis when
+  REDIS_URL is set) so every worker sees the same invalidations.  Only
+  Redis is shared between processes: with LocMem a version bump, a member
+  invalidation or a management command's write stays in the process that
+  made it (settings.py; gunicorn refuses several workers without Redis).
+
+Used for the member identity behind request.user and for the reference
+lists (semesters, departments, majors, courses, rooms).
+
+The a* variants are for the async views (api/async_views.py): a local hit
+is answered on the event loop, a shared-cache round trip (Redis) runs on
+a worker thread so it never stalls the other coroutines.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+_MISSING = object()
+
+# backends whose entries only the writing process can see
+_PROCESS_LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def shared():
+    """True when every process sees the same default cache (settings.py)."""
+    return settings.CACHES["default"]["BACKEND"] not in _PROCESS_LOCAL_BACKENDS
+
+
+class LocalCache:
+    """
+    Thread-safe LRU with a per-entry TTL.
+
+    The TTL bounds how long a worker can serve a value after another worker
+    invalidated it through the shared cache.
+    """
+
+    def __init__(self, maxsize=1024, ttl=5.0):
+        self.maxsize = maxsize
+        self.ttl     = ttl
+        self._data   = OrderedDict()      # key → (expires_at, value)
+        self._lock   = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# ── member identity cache ──────────────────────────────────────
+# value: (mid, is_admin, fname, lname) – exactly the columns that
+# MemberBackend.get_user() reads from `members`.
+_member_local = LocalCache(
+    maxsize=getattr(settings, "MEMBER_CACHE_LOCAL_SIZE", 4096),
+    ttl=getattr(settings, "MEMBER_CACHE_LOCAL_TTL", 5),
+)
+
+
+def _member_key(member_id):
+    return f"member:{member_id}"
+
+
+def get_member(member_id):
+    """Cached identity row for *member_id*, or None on a miss."""
+    row = _member_local.get(member_id)
+    if row is None:
+        row = cache.get(_member_key(member_id))
+        if row is not None:
+            _member_local.set(member_id, row)
+    return row
+
+
+def set_member(member_id, row):
+    cache.set(_member_key(member_id), row,
+              getattr(settings, "MEMBER_CACHE_TIMEOUT", 300))
+    _member_local.set(member_id, row)
+
+
+async def aget_member(member_id):
+    row = _member_local.get(member_id)
+    if row is None:
+        row = await sync_to_async(get_member, thread_sensitive=False)(member_id)
+    return row
+
+
+aset_member = sync_to_async(set_member, thread_sensitive=False)
+
+
+def invalidate_member(member_id):
+    """
+    Drop a member from both layers.  Call after anything that changes
+    `members.fname/lname/is_admin` or deletes the member.  Other processes
+    drop it from their local layer within MEMBER_CACHE_LOCAL_TTL – given a
+    shared() cache; with LocMem they never hear of it.
+    """
+    if member_id is None:
+        return
+    member_id = str(member_id)
+    cache.delete(_member_key(member_id))
+    _member_local.delete(member_id)
+
+
+# ── versioned reference data ───────────────────────────────────
+# Each table has a version number in the shared cache; every write path
+# calls bump_version(table).  Cached row sets are keyed by the versions of
+# all tables they read, so a bump makes old entries unreachable – nothing
+# has to be deleted.  The same versions drive the list ETags
+# (api/conditional.py).  They track what the lists *read*:
+# presented_courses.seats_used is read by none, so enrolling bumps only
+# "taken_courses".
+#
+# procedure → tables it reads
+REFERENCE_PROCEDURES = {
+    "list_semesters":   ("semesters",),
+    "list_departments": ("departments", "workers", "members"),   # active HEAD + name
+    "list_majors":      ("majors", "departments"),
+    "list_courses":     ("courses",),
+    "list_rooms":       ("rooms",),
+}
+# The *_page procedures are not here: their parameters come from the
+# client's cursor and limit, which must not pick cache keys.
+
+_version_local = LocalCache(
+    maxsize=256,
+    ttl=getattr(settings, "REFERENCE_CACHE_VERSION_TTL", 1),
+)
+_reference_local = LocalCache(
+    maxsize=getattr(settings, "REFERENCE_CACHE_LOCAL_SIZE", 256),
+    ttl=getattr(settings, "REFERENCE_CACHE_TIMEOUT", 3600),
+)
+
+
+def _version_key(table):
+    return f"table-version:{table}"
+
+
+def table_versions(tables):
+    """
+    Current version of each table, in order.  A table never written (or
+    whose counter was evicted) starts from a clock value, so it cannot
+    collide with a version that is still referenced by cached rows.
+    """
+    versions = {t: _version_local.get(t) for t in tables}
+    missing  = [t for t, v in versions.items() if v is None]
+    if missing:
+        found = cache.get_many([_version_key(t) for t in missing])
+        for t in missing:
+            v = found.get(_version_key(t))
+            if v is None:
+                cache.add(_version_key(t), time.time_ns(), None)
+                v = cache.get(_version_key(t))
+            versions[t] = v
+            _version_local.set(t, v)
+    return [versions[t] for t in tables]
+
+
+async def atable_versions(tables):
+    versions = [_version_local.get(t) for t in tables]
+    if None in versions:
+        versions = await sync_to_async(table_versions, thread_sensitive=False)(tables)
+    return versions
+
+
+def bump_version(*tables):
+    """Invalidate every cached row set that reads one of *tables*."""
+    for table in tables:
+        key = _version_key(table)
+        try:
+            v = cache.incr(key)
+        except ValueError:                 # never set or evicted
+            v = time.time_ns()
+            cache.set(key, v, None)
+        _version_local.set(table, v)
+
+
+# ON DELETE CASCADE (db/01_schema_mysql.sql), transitively: deleting rows
+# of the key also deletes rows of these tables, which no write path bumps
+# itself.  Triggers need no entry – the std_records ones only maintain
+# gpa / major_gpa_stats, which every list reads under "std_records".
+DELETE_CASCADES = {
+    "members":     ("credentials", "staffs", "workers"),
+    "staffs":      ("workers",),
+    "departments": ("majors", "std_records", "major_gpa_stats",
+                    "student_semesters", "taken_courses"),
+    "majors":      ("std_records", "major_gpa_stats",
+                    "student_semesters", "taken_courses"),
+    "std_records": ("student_semesters", "taken_courses"),
+    "student_semesters": ("taken_courses",),
+    "semesters":   ("semester_closeouts",),
+    "courses":     ("prerequisites",),
+}
+
+
+def bump_deleted(table):
+    """bump_version() after deleting rows of *table*, cascades included."""
+    bump_version(table, *DELETE_CASCADES.get(table, ()))
+
+
+# printed by management commands that bumped versions a server can't see
+NOT_SHARED_NOTICE = ("The default cache is per-process (no REDIS_URL): a running "
+                     "server keeps serving its cached lists until it restarts.")
+
+
+def bump_version_from_command(*tables):
+    """
+    bump_version() for management commands.  False when no running server
+    will notice – the cache is not shared(); print NOT_SHARED_NOTICE then.
+    """
+    bump_version(*tables)
+    return shared()
+
+
+def reference_rows(procedure, params=(), extra=""):
+    """
+    Rows of a REFERENCE_PROCEDURES procedure, served from memory, then the
+    shared cache, then MySQL.  *extra* goes into the key for inputs that
+    are not table data (e.g. today's date).
+    """
+    from .db import call_procedure
+
+    versions = table_versions(REFERENCE_PROCEDURES[procedure])
+    key = f"ref:{procedure}:{params!r}:{extra}:" + ".".join(map(str, versions))
+
+    rows = _reference_local.get(key)
+    if rows is None:
+        rows = cache.get(key)
+        if rows is None:
+            rows = call_procedure(procedure, params)
+            cache.set(key, rows, getattr(settings, "REFERENCE_CACHE_TIMEOUT", 3600))
+        _reference_local.set(key, rows)
+    return rows
@@ -0,0 +1,215 @@
+# api/catalog.py
+"""
+In-memory, per-semester section catalog behind
+GET /api/presented-courses/search.
+
+One list_semester_catalog call loads a semester's sections; the index is
+a set of bitmaps over their positions (course_code order) – one per
+weekday, professor, department and name token – so a search is a few
+integer ANDs plus a bisect for each prefix, with no SQL at all:
+
+    days=MW          sections meeting only on Monday / Wednesday
+    after / before   inside the time window (minutes, api/schedule.py)
+    prof_id          that professor
+    professor=sm     professor name word starting with "sm"
+    q=data str       every word prefixes a course code / name word
+    major_id         taught by staff of the major's department
+    open=1           seats_used < max_capacity
+
+Freshness follows the table versions of api/cache.py, checked on every
+lookup (a memory read, see REFERENCE_CACHE_VERSION_TTL):
+
+• presented_courses, courses, members, workers, rooms, majors changed
+  (section created / deleted, close-out, …) → the semester is rebuilt
+• only taken_courses changed (a seat was taken or given back)
+  → list_semester_seats re-reads the counters, the index is kept
+
+At most CATALOG_SEMESTERS semesters are held per process.
+"""
+import bisect
+import re
+import threading
+
+from django.conf import settings
+
+from .cache import LocalCache, table_versions
+from .db import call_procedure, call_procedure_sets
+
+STRUCTURE_TABLES = ("presented_courses", "courses", "members", "workers",
+                    "rooms", "majors")
+SEAT_TABLES      = ("taken_courses",)
+
+# positions in a list_semester_catalog section row
+(PCID, CODE, NAME, PROF_ID, PROFESSOR, ON_DAYS, ON_TIMES, DAY_MASK,
+ START_MIN, END_MIN, ROOM, CAPACITY, MAX_CAPACITY, SEATS_USED) = range(14)
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def words(text):
+    """Lower-case words of *text* – what the prefix indexes store."""
+    return _WORD.findall(text.lower())
+
+
+def _positions(bits):
+    """Set bits of *bits*, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class _PrefixIndex:
+    """Sorted words, each with the bitmap of the sections containing it."""
+
+    def __init__(self, texts):
+        by_word = {}
+        for pos, text in enumerate(texts):
+            for w in words(text):
+                by_word[w] = by_word.get(w, 0) | (1 << pos)
+        self._words = sorted(by_word)
+        self._bits  = [by_word[w] for w in self._words]
+
+    def prefix(self, prefix):
+        """Bitmap of the sections with a word starting with *prefix*."""
+        bits = 0
+        i = bisect.bisect_left(self._words, prefix)
+        while i < len(self._words) and self._words[i].startswith(prefix):
+            bits |= self._bits[i]
+            i += 1
+        return bits
+
+    def match_all(self, text):
+        """Every word of *text* must prefix-match; None for no words."""
+        result = None
+        for w in words(text):
+            bits   = self.prefix(w)
+            result = bits if result is None else result & bits
+            if not result:
+                break
+        return result
+
+
+class SemesterCatalog:
+    def __init__(self, sections, departments, majors, versions, seat_versions):
+        self.sections      = sections
+        self.versions      = versions
+        self.seat_versions = seat_versions
+
+        self._pos    = {row[PCID]: pos for pos, row in enumerate(sections)}
+        self._seats  = [row[SEATS_USED] for row in sections]
+        self._majors = dict(majors)            # major_id → did
+
+        self._all       = (1 << len(sections)) - 1
+        self._scheduled = 0                    # start_min parsed
+        self._day_bits  = [0] * 7              # bit i of day_mask → sections
+        self._by_prof   = {}
+        for pos, row in enumerate(sections):
+            bit = 1 << pos
+            if row[START_MIN] is not None:
+                self._scheduled |= bit
+            for day in range(7):
+                if row[DAY_MASK] & (1 << day):
+                    self._day_bits[day] |= bit
+            self._by_prof[row[PROF_ID]] = self._by_prof.get(row[PROF_ID], 0) | bit
+
+        self._by_dept = {}
+        for pcid, did in departments:
+            if pcid in self._pos:
+                self._by_dept[did] = self._by_dept.get(did, 0) | (1 << self._pos[pcid])
+
+        self._courses    = _PrefixIndex(f"{r[CODE]} {r[NAME]}" for r in sections)
+        self._professors = _PrefixIndex(r[PROFESSOR] for r in sections)
+
+    @classmethod
+    def load(cls, semester_id, versions, seat_versions):
+        sections, departments, majors = call_procedure_sets(
+            "list_semester_catalog", (semester_id,))
+        return cls([tuple(r) for r in sections], departments, majors,
+                   versions, seat_versions)
+
+    def refresh_seats(self, semester_id, seat_versions):
+        seats = list(self._seats)
+        for pcid, used in call_procedure("list_semester_seats", (semester_id,)):
+            pos = self._pos.get(pcid)
+            if pos is not None:
+                seats[pos] = used
+        self._seats        = seats         # one assignment: readers never see a mix
+        self.seat_versions = seat_versions
+
+    def knows_major(self, major_id):
+        return major_id in self._majors
+
+    def search(self, days=None, after=None, before=None, prof_id=None,
+               professor=None, q=None, major_id=None, open_only=False, limit=None):
+        """Matching sections as dicts, in course_code order."""
+        bits = self._all
+        if days is not None:
+            for day in range(7):
+                if not days & (1 << day):
+                    bits &= ~self._day_bits[day]
+            bits &= self._scheduled
+        if after is not None or before is not None:
+            bits &= self._scheduled
+        if prof_id is not None:
+            bits &= self._by_prof.get(prof_id, 0)
+        if major_id is not None:
+            bits &= self._by_dept.get(self._majors.get(major_id), 0)
+        if q:
+            bits &= self._courses.match_all(q) or 0
+        if professor:
+            bits &= self._professors.match_all(professor) or 0
+
+        seats, out = self._seats, []
+        for pos in _positions(bits):
+            row = self.sections[pos]
+            if after is not None and row[START_MIN] < after:
+                continue
+            if before is not None and row[END_MIN] > before:
+                continue
+            if open_only and seats[pos] >= row[MAX_CAPACITY]:
+                continue
+            out.append({
+                "pcid":         row[PCID],
+                "course_code":  row[CODE],
+                "course_name":  row[NAME],
+                "prof_id":      row[PROF_ID],
+                "professor":    row[PROFESSOR],
+                "on_days":      row[ON_DAYS],
+                "on_times":     row[ON_TIMES],
+                "room":         row[ROOM],
+                "capacity":     row[CAPACITY],
+                "max_capacity": row[MAX_CAPACITY],
+                "seats_used":   seats[pos],
+            })
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+
+# ── per-process semester catalogs ─────────────────────────────
+_catalogs = LocalCache(
+    maxsize=getattr(settings, "CATALOG_SEMESTERS", 8),
+    ttl=getattr(settings, "REFERENCE_CACHE_TIMEOUT", 3600),
+)
+_build_lock = threading.Lock()
+
+
+def get_catalog(semester_id):
+    """Current catalog of *semester_id*, built or refreshed as needed."""
+    versions      = table_versions(STRUCTURE_TABLES)
+    seat_versions = table_versions(SEAT_TABLES)
+
+    catalog = _catalogs.get(semester_id)
+    if (catalog is not None and catalog.versions == versions
+            and catalog.seat_versions == seat_versions):
+        return catalog
+
+    with _build_lock:
+        catalog = _catalogs.get(semester_id)   # another thread may have done it
+        if catalog is None or catalog.versions != versions:
+            catalog = SemesterCatalog.load(semester_id, versions, seat_versions)
+            _catalogs.set(semester_id, catalog)
+        elif catalog.seat_versions != seat_versions:
+            catalog.refresh_seats(semester_id, seat_versions)
+    return catalog
@@ -0,0 +1,124 @@
+# api/closeout.py
+"""
+Chunked, resumable semester close-out.
+
+    POST /api/semesters/<sid>/deactivate
+      → begin_semester_closeout (flip is_active, create progress row)
+      → closeout_next_chunk until no section is left,
+        compute_semester_gpa, finish_semester_closeout
+    GET  /api/semesters/<sid>/closeout      → progress
+
+The request only runs begin_semester_closeout and answers 202; the
+chunks run in a separate `manage.py resume_closeouts <sid>` process –
+not inside the request or in a thread of the server worker, both of
+which gunicorn kills on timeout, max_requests or a deploy.
+
+Each chunk closes SEMESTER_CLOSEOUT["CHUNK"] sections in its own short
+transaction and moves the cursor in semester_closeouts in that same
+transaction, so a crash loses nothing: POSTing deactivate again or
+`manage.py resume_closeouts` carries on from the last committed chunk,
+and the server resumes every RUNNING close-out when it starts
+(gunicorn.conf.py).  Two drivers on one semester are harmless –
+closeout_next_chunk locks the progress row, so they just take turns.
+"""
+import logging
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+from .cache import bump_version
+from .db import call_procedure, query, DBError
+
+log = logging.getLogger(__name__)
+
+
+def status(sid):
+    """get_semester_closeout row, or None if the semester was never closed."""
+    rows = call_procedure("get_semester_closeout", (sid,))
+    return rows[0] if rows else None
+
+
+def unfinished():
+    """sids of every RUNNING or FAILED close-out, oldest first."""
+    return [r[0] for r in query(
+        "unfinished_closeouts",
+        "SELECT sid FROM semester_closeouts WHERE state <> 'DONE' ORDER BY started_at",
+    )]
+
+
+def running():
+    """sids of the RUNNING close-outs – left by a killed driver."""
+    return [r[0] for r in query(
+        "running_closeouts",
+        "SELECT sid FROM semester_closeouts WHERE state = 'RUNNING' ORDER BY started_at",
+    )]
+
+
+def begin(sid):
+    """Start (or resume a FAILED) close-out; returns its status row."""
+    try:
+        rows = call_procedure("begin_semester_closeout", (sid,))
+    finally:
+        bump_version("semesters")
+    return rows[0]
+
+
+def run(sid):
+    """
+    Drive close-out *sid* to the end in the calling thread; returns the
+    final status row.  On error the close-out is marked FAILED and the
+    error re-raised.
+    """
+    conf = settings.SEMESTER_CLOSEOUT
+    try:
+        while True:
+            closed = call_procedure("closeout_next_chunk", (sid, conf["CHUNK"]))[0][0]
+            if not closed:
+                break
+            bump_version("taken_courses", "std_records", "presented_courses")
+            time.sleep(conf["PAUSE"])          # let grade entry in between chunks
+
+        call_procedure("compute_semester_gpa", (sid, settings.SEMESTER_GPA_CHUNK))
+        bump_version("student_semesters")
+        return call_procedure("finish_semester_closeout", (sid,))[0]
+    except Exception as e:
+        _fail(sid, e.msg if isinstance(e, DBError) else repr(e))
+        raise
+
+
+def _fail(sid, error):
+    try:
+        call_procedure("fail_semester_closeout", (sid, error))
+    except DBError:
+        pass                                   # stays RUNNING; resume picks it up
+
+
+def start(sid):
+    """
+    begin() and, if the close-out is RUNNING, spawn() its driver.
+    Returns the status row as begin() left it.
+    """
+    row = begin(sid)
+    if row[1] == "RUNNING":
+        try:
+            spawn(sid)
+        except OSError as exc:
+            # the close-out stays RUNNING: the next POST or server start
+            # resumes it
+            log.warning("close-out %s not started: %s", sid, exc)
+    return row
+
+
+def spawn(*sids):
+    """
+    `manage.py resume_closeouts <sids>` in a new session: it outlives the
+    worker (or master) that started it, and logs to the same stderr.
+    """
+    subprocess.Popen(
+        [sys.executable, str(settings.BASE_DIR / "manage.py"), "resume_closeouts", *sids],
+        stdin=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
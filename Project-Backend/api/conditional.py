@@ -0,0 +1,104 @@
+# api/conditional.py
+"""
+Conditional GET for the list endpoints.
+
+    class CourseView(APIView):
+        @conditional_list("courses")
+        def get(self, request): ...
+
+The ETag is a hash of the version numbers of the tables the list reads
+(api/cache.py – bumped by every write path), the full path + query string,
+the caller's id / admin flag and today's date (some lists depend on
+CURDATE()).  A matching If-None-Match gets 304 before the view body – and
+so the stored procedure – runs.
+
+Versions are read *before* the view runs: a write racing with the request
+can only make the ETag older than the data, never newer.  A client keeps
+a stale list only if a write was never bumped, hence two conditions:
+
+• every process reads the same versions – the shared cache is Redis
+  (settings.py; with per-process LocMem another worker may answer 304
+  for a list that changed, so several workers require REDIS_URL)
+• every write bumps: the API paths and management commands do,
+  deletes bump their ON DELETE CASCADE tables too (cache.bump_deleted);
+  after changing tables by hand run `manage.py bump_versions`
+"""
+import hashlib
+import inspect
+from datetime import date
+from functools import wraps
+
+from django.http import HttpResponseNotModified
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import atable_versions, table_versions
+
+
+def _etag(request, versions):
+    user  = request.user
+    parts = [
+        request.get_full_path(),
+        str(getattr(user, "id", "")),
+        "1" if getattr(user, "is_staff", False) else "0",
+        date.today().isoformat(),
+    ]
+    parts += map(str, versions)
+    return '"' + hashlib.sha1("\x1f".join(parts).encode()).hexdigest() + '"'
+
+
+def list_etag(request, tables):
+    return _etag(request, table_versions(tables))
+
+
+async def alist_etag(request, tables):
+    """list_etag() without blocking the event loop on the shared cache."""
+    return _etag(request, await atable_versions(tables))
+
+
+def _matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: ignore a W/ prefix
+    return any(tag.strip().removeprefix("W/") == etag
+               for tag in if_none_match.split(","))
+
+
+def _tag(resp, etag):
+    resp["ETag"] = etag
+    resp["Cache-Control"] = "private, no-cache"   # always revalidate
+    return resp
+
+
+def conditional_list(*tables):
+    """
+    Decorate an APIView.get reading *tables* with ETag / 304 handling.
+    Works on the `async def get` of api/async_views.py too.
+    """
+    def decorator(get):
+        if inspect.iscoroutinefunction(get):
+            @wraps(get)
+            async def async_wrapper(self, request, *args, **kwargs):
+                etag = await alist_etag(request, tables)
+                if _matches(request.META.get("HTTP_IF_NONE_MATCH"), etag):
+                    return _tag(HttpResponseNotModified(), etag)
+                resp = await get(self, request, *args, **kwargs)
+                if resp.status_code != status.HTTP_200_OK:
+                    return resp
+                return _tag(resp, etag)
+            return async_wrapper
+
+        @wraps(get)
+        def wrapper(self, request, *args, **kwargs):
+            etag = list_etag(request, tables)
+            if _matches(request.META.get("HTTP_IF_NONE_MATCH"), etag):
+                resp = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                resp = get(self, request, *args, **kwargs)
+                if resp.status_code != status.HTTP_200_OK:
+                    return resp
+            return _tag(resp, etag)
+        return wrapper
+    return decorator
@@ -1,27 +1,334 @@
 # api/db.py
+import re
+import uuid
+from contextlib import contextmanager
+
+import pymysql
+from django.conf import settings
 from django.db import connection, DatabaseError
 
+from . import metrics
+from .pool import get_pool, connect_kwargs, preloaded_statements, PoolTimeout
+
 class DBError(Exception):
     def __init__(self, status, msg):
         self.status = status
         self.msg = msg
         super().__init__(msg)
 
-def call_procedure(name, params=()):
+# ---- UUID storage (UUID_STORAGE) ----------------------------------
+# "char"   – CHAR(36) keys, values pass through untouched
+# "binary" – BINARY(16) keys as UUID_TO_BIN(uuid, 1) stores them
+#            (db/binary_uuid/, `manage.py build_binary_uuid_schema`):
+#            UUID strings going in become those 16 bytes, 16-byte values
+#            coming out become strings again, so callers never notice.
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+                      r"[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+def uuid_to_bin(value):
+    """UUID_TO_BIN(value, 1): time-high and time-low swapped, so UUID()
+    values (version 1) sort – and insert – in creation order."""
+    b = uuid.UUID(str(value)).bytes
+    return b[6:8] + b[4:6] + b[0:4] + b[8:]
+
+
+def bin_to_uuid(raw):
+    """BIN_TO_UUID(raw, 1)."""
+    return str(uuid.UUID(bytes=raw[4:8] + raw[2:4] + raw[0:2] + raw[8:]))
+
+
+def binary_uuids():
+    return getattr(settings, "UUID_STORAGE", "char") == "binary"
+
+
+def uuid_key(value):
+    """A UUID as the database stores it under the current UUID_STORAGE."""
+    return uuid_to_bin(value) if binary_uuids() else str(value)
+
+
+def _params_to_bin(params):
+    return tuple(
+        uuid_to_bin(p) if (isinstance(p, str) and _UUID_RE.fullmatch(p))
+                          or isinstance(p, uuid.UUID) else p
+        for p in params
+    )
+
+
+def _rows_from_bin(rows):
+    return [
+        tuple(bin_to_uuid(v) if type(v) is bytes and len(v) == 16 else v
+              for v in row)
+        for row in rows
+    ]
+
+
+def _as_is(value):
+    return value
+
+
+# bound once at import, like the metrics wrappers below
+if binary_uuids():
+    _db_params, _db_rows = _params_to_bin, _rows_from_bin
+else:
+    _db_params = _db_rows = _as_is
+
+def _call_sql(name, arity):
+    sql = preloaded_statements.get((name, arity))
+    if sql is None:
+        sql = f"CALL {name}({','.join(['%s'] * arity)})"
+    return sql
+
+@contextmanager
+def _cursor():
     """
-    Runs a stored procedure safely and returns all rows (if any).
-    Works on Postgres & MySQL with positional parameters.
+    Yields (cursor, sql_builder).  Pooled connection when DB_POOL is on,
+    Django's per-thread connection otherwise.
     """
-    try:
+    pool = get_pool()
+    if pool is None:
         with connection.cursor() as cur:
-            placeholders = ",".join(["%s"] * len(params))
-            cur.execute(f"CALL {name}({placeholders})", params)
-            try:
-                rows = cur.fetchall()
-            except Exception:
-                rows = []
-        return rows
-    except DatabaseError as exc:
+            yield cur, _call_sql
+        return
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            yield cur, conn.call_sql
+
+@contextmanager
+def _db_errors():
+    """Map driver errors onto DBError (409 full / 404 missing / 400 other)."""
+    try:
+        yield
+    except PoolTimeout as exc:
+        raise DBError(503, str(exc))
+    except (DatabaseError, pymysql.MySQLError) as exc:
         msg = str(exc)
         status = 409 if "full" in msg else 404 if "exist" in msg else 400
         raise DBError(status, msg)
+
+def _execute_call(cur, call_sql, name, params):
+    cur.execute(call_sql(name, len(params)), _db_params(params))
+    try:
+        return _db_rows(cur.fetchall())
+    except Exception:
+        return []
+
+def _execute_call_sets(cur, call_sql, name, params):
+    cur.execute(call_sql(name, len(params)), _db_params(params))
+    sets = []
+    while True:
+        if cur.description is not None:        # a SELECT, not the OK packet
+            sets.append(_db_rows(cur.fetchall()))
+        if not cur.nextset():
+            return sets
+
+def _call_procedure(name, params=()):
+    """
+    Runs a stored procedure safely and returns all rows (if any).
+    Works on Postgres & MySQL with positional parameters.
+    """
+    with _db_errors():
+        with _cursor() as (cur, call_sql):
+            rows = _execute_call(cur, call_sql, name, params)
+        return rows
+
+def _call_procedure_sets(name, params=()):
+    """
+    Like call_procedure, for procedures that SELECT more than once:
+    returns one list of rows per result set, in order.
+    """
+    with _db_errors():
+        with _cursor() as (cur, call_sql):
+            return _execute_call_sets(cur, call_sql, name, params)
+
+def _tx_call(name, cur, call_sql, params=()):
+    with _db_errors():
+        return _execute_call(cur, call_sql, name, params)
+
+def _query(name, sql, params=()):
+    """
+    Runs one ad-hoc statement and returns all rows.  `name` labels the
+    statement in the metrics (e.g. "owns_record").
+    """
+    with _db_errors():
+        with _cursor() as (cur, _):
+            cur.execute(sql, _db_params(params))
+            return _db_rows(cur.fetchall())
+
+# bound once at import: with metrics off there is no wrapper at all
+if metrics.enabled():
+    call_procedure = metrics.timed("procedure", _call_procedure)
+    call_procedure_sets = metrics.timed("procedure", _call_procedure_sets,
+                                        rows=metrics.rows_in_sets)
+    query          = metrics.timed("query", _query)
+    tx_call        = metrics.timed("procedure", _tx_call)
+else:
+    call_procedure = _call_procedure
+    call_procedure_sets = _call_procedure_sets
+    query          = _query
+    tx_call        = _tx_call
+
+def query_one(name, sql, params=()):
+    rows = query(name, sql, params)
+    return rows[0] if rows else None
+
+def load_procedures():
+    """
+    Reads the schema's stored procedures and their parameter counts and
+    builds the CALL text of each one, shared by every connection opened
+    afterwards.  Meant for a pre-fork master (api/preload.py), so workers
+    inherit the statements instead of each building them on first use.
+    Returns {name: arity}.
+    """
+    rows = query(
+        "load_procedures",
+        "SELECT r.ROUTINE_NAME, COUNT(p.PARAMETER_NAME)"
+        "  FROM information_schema.ROUTINES r"
+        "  LEFT JOIN information_schema.PARAMETERS p"
+        "    ON p.SPECIFIC_SCHEMA = r.ROUTINE_SCHEMA"
+        "   AND p.SPECIFIC_NAME   = r.SPECIFIC_NAME"
+        "   AND p.ROUTINE_TYPE    = 'PROCEDURE'"
+        " WHERE r.ROUTINE_SCHEMA = DATABASE() AND r.ROUTINE_TYPE = 'PROCEDURE'"
+        " GROUP BY r.ROUTINE_NAME",
+    )
+    arities = {name: int(arity) for name, arity in rows}
+    for name, arity in arities.items():
+        preloaded_statements[(name, arity)] = \
+            f"CALL {name}({','.join(['%s'] * arity)})"
+    return arities
+
+def execute_many(sql, rows):
+    """
+    One parameterised statement over many rows (pymysql folds an INSERT …
+    VALUES into multi-row statements).  Returns the affected row count.
+    """
+    with _db_errors():
+        with _cursor() as (cur, _):
+            return cur.executemany(sql, [_db_params(r) for r in rows])
+
+
+# ---- explicit multi-call transactions ----------------------------
+class Transaction:
+    """
+    One connection, one open transaction.  Only call procedures that do NOT
+    manage their own transaction (e.g. take_seat, not add_taken_course_tx) –
+    a COMMIT inside the procedure would end this one early.
+    """
+
+    def __init__(self, cur, call_sql):
+        self._cur      = cur
+        self._call_sql = call_sql
+
+    def call(self, name, params=()):
+        return tx_call(name, self._cur, self._call_sql, params)
+
+    def _execute(self, sql):
+        with _db_errors():
+            self._cur.execute(sql)
+
+    # savepoint names are ours, never user input
+    def savepoint(self, name):
+        self._execute(f"SAVEPOINT {name}")
+
+    def rollback_to(self, name):
+        self._execute(f"ROLLBACK TO SAVEPOINT {name}")
+
+    def release(self, name):
+        self._execute(f"RELEASE SAVEPOINT {name}")
+
+@contextmanager
+def procedure_transaction():
+    """
+    with procedure_transaction() as tx:
+        tx.call("take_seat", (...))
+
+    Commits when the block exits normally, rolls back on any exception.
+    A procedure that SIGNALs mid-way keeps its earlier statements inside
+    the open transaction – use savepoints to undo just that call.
+    """
+    failure = None
+    with _db_errors():
+        with _cursor() as (cur, call_sql):
+            cur.execute("START TRANSACTION")
+            try:
+                yield Transaction(cur, call_sql)
+            except DBError as exc:
+                # rolled back cleanly → the connection can be reused
+                cur.execute("ROLLBACK")
+                failure = exc
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            else:
+                cur.execute("COMMIT")
+    if failure is not None:
+        raise failure
+
+# ---- streaming -----------------------------------------------------
+class RowStream:
+    """
+    Rows of one CALL read through an unbuffered (server-side) cursor,
+    batch by batch, so memory stays flat whatever the result size.
+
+    Holds its connection until exhausted or closed.  A stream abandoned
+    half-way (client went away) leaves unread rows on the socket, so its
+    connection is thrown away rather than drained or reused.
+    """
+
+    def __init__(self, cur, release, batch_size):
+        self._cur        = cur
+        self._release    = release
+        self._batch_size = batch_size
+        self._finished   = False
+        self._closed     = False
+
+    def __iter__(self):
+        try:
+            while True:
+                with _db_errors():
+                    rows = self._cur.fetchmany(self._batch_size)
+                if not rows:
+                    break
+                yield from _db_rows(rows)
+            with _db_errors():
+                self._cur.close()          # reads the CALL's trailing status
+            self._finished = True
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._release(discard=not self._finished)
+
+def stream_procedure(name, params=(), batch_size=500):
+    """
+    Runs the CALL right away – so a SIGNAL surfaces as DBError before any
+    output is sent – and returns a RowStream over its rows.  Uses a pool
+    connection when DB_POOL is on, a dedicated connection otherwise
+    (never Django's, which the request may still need).
+    """
+    pool = get_pool()
+    with _db_errors():
+        if pool is None:
+            raw = pymysql.connect(**connect_kwargs())
+            call_sql = _call_sql
+
+            def release(discard):
+                raw.close()
+        else:
+            pooled   = pool.acquire()
+            raw      = pooled.raw
+            call_sql = pooled.call_sql
+
+            def release(discard):
+                pool.release(pooled, discard=discard)
+
+    try:
+        with _db_errors():
+            cur = raw.cursor(pymysql.cursors.SSCursor)
+            cur.execute(call_sql(name, len(params)), _db_params(params))
+    except BaseException:
+        release(discard=True)
+        raise
+    return RowStream(cur, release, batch_size)
@@ -0,0 +1,232 @@
+# api/enrollment_queue.py
+"""
+Admission-controlled enrolment (ENROLLMENT_QUEUE["ENABLED"]).
+
+Instead of every request running add_taken_course_tx inline – thousands of
+them fighting over the same presented_courses rows when registration opens –
+POST /api/taken-courses hands the job to this queue and returns 202 with a
+ticket.
+
+• bounded: more than MAX_PENDING queued jobs → QueueFull (503 Retry-After)
+• a fixed set of worker threads, started lazily per process
+• jobs are grouped per pcid; one group = one transaction, a savepoint per
+  job, so a section's row lock is taken once per group, not once per job
+• at most PER_SECTION groups of one pcid and DB_CONCURRENCY groups overall
+  run at the same time – in this process: each server worker has its own
+  queue, so the database sees up to workers × these limits
+• results live in the shared cache for RESULT_TTL seconds, so a poll that
+  lands on another worker process still finds them (Redis – LocMem is
+  only shared by a single process, see settings.py)
+"""
+import threading
+import uuid
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from .cache import bump_version
+from .db import DBError, procedure_transaction
+
+
+class QueueFull(Exception):
+    pass
+
+
+class _Job:
+    __slots__ = ("ticket", "owner", "record_id", "semester_id", "pcid", "status")
+
+    def __init__(self, ticket, owner, record_id, semester_id, pcid, status):
+        self.ticket      = ticket
+        self.owner       = owner
+        self.record_id   = record_id
+        self.semester_id = semester_id
+        self.pcid        = pcid
+        self.status      = status
+
+
+def _ticket_key(ticket):
+    return f"enrol-ticket:{ticket}"
+
+
+class EnrollmentQueue:
+    def __init__(self, workers, max_pending, per_section, db_concurrency,
+                 group_size, result_ttl):
+        self.workers     = workers
+        self.max_pending = max_pending
+        self.per_section = per_section
+        self.group_size  = group_size
+        self.result_ttl  = result_ttl
+
+        self._cond     = threading.Condition()
+        self._sections = OrderedDict()     # pcid → deque[_Job], round-robin order
+        self._active   = {}                # pcid → groups running now
+        self._pending  = 0
+        self._db_slots = threading.BoundedSemaphore(db_concurrency)
+        self._events   = {}                # ticket → Event, for local long-polls
+        self._threads  = []
+
+        # metrics
+        self.accepted  = 0
+        self.rejected  = 0
+        self.processed = 0
+
+    # ---------- producer side -------------------------------------
+    def submit(self, owner, record_id, semester_id, pcid, status):
+        ticket = uuid.uuid4().hex
+        job = _Job(ticket, str(owner), record_id, semester_id, pcid, status)
+        with self._cond:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise QueueFull("enrolment queue is full")
+            # publish before the job is visible to a worker, so the
+            # "done" write can never be overwritten by "queued"
+            self._publish(job, {"state": "queued"})
+            self._events[ticket] = threading.Event()
+            self._sections.setdefault(pcid, deque()).append(job)
+            self._pending  += 1
+            self.accepted  += 1
+            self._start_workers()
+            self._cond.notify()
+        return ticket
+
+    def wait(self, ticket, timeout):
+        """Block up to *timeout* s for a ticket submitted by this process."""
+        event = self._events.get(ticket)
+        if event is not None:
+            event.wait(timeout)
+
+    # ---------- consumer side -------------------------------------
+    def _start_workers(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"enrol-worker-{i}",
+                                 daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _next_group(self):
+        """Pop up to group_size jobs of the first section below its limit."""
+        with self._cond:
+            while True:
+                for pcid, jobs in self._sections.items():
+                    if self._active.get(pcid, 0) < self.per_section:
+                        group = [jobs.popleft()
+                                 for _ in range(min(self.group_size, len(jobs)))]
+                        if jobs:
+                            self._sections.move_to_end(pcid)   # fairness
+                        else:
+                            del self._sections[pcid]
+                        self._active[pcid] = self._active.get(pcid, 0) + 1
+                        self._pending -= len(group)
+                        return pcid, group
+                self._cond.wait()
+
+    def _done_with(self, pcid, n):
+        with self._cond:
+            self._active[pcid] -= 1
+            if not self._active[pcid]:
+                del self._active[pcid]
+            self.processed += n
+            self._cond.notify_all()        # a section may be runnable again
+
+    def _work(self):
+        while True:
+            pcid, group = self._next_group()
+            try:
+                with self._db_slots:
+                    close_old_connections()
+                    self._run_group(group)
+            finally:
+                self._done_with(pcid, len(group))
+
+    def _run_group(self, group):
+        results = []
+        try:
+            with procedure_transaction() as tx:
+                for job in group:
+                    tx.savepoint("queued_job")
+                    try:
+                        tx.call("take_seat", (job.record_id, job.semester_id,
+                                              job.pcid, job.status))
+                    except DBError as e:
+                        tx.rollback_to("queued_job")
+                        results.append((job, {"state": "failed",
+                                              "status": e.status,
+                                              "detail": e.msg}))
+                    else:
+                        results.append((job, {"state": "done", "status": 201,
+                                              "enrolled": True}))
+        except DBError as e:
+            # START/COMMIT or checkout failed → nothing in the group stuck
+            results = [(job, {"state": "failed", "status": e.status,
+                              "detail": e.msg}) for job in group]
+        except Exception as e:
+            results = [(job, {"state": "failed", "status": 500,
+                              "detail": str(e)}) for job in group]
+
+        completed = any(job.status == "COMPLETED" for job in group)
+        bump_version("taken_courses", *(("std_records",) if completed else ()))
+        for job, result in results:
+            self._publish(job, result)
+            event = self._events.pop(job.ticket, None)
+            if event is not None:
+                event.set()
+
+    # ---------- results -------------------------------------------
+    def _publish(self, job, result):
+        result = dict(result, ticket=job.ticket, owner=job.owner,
+                      record_id=job.record_id, semester_id=job.semester_id,
+                      pcid=job.pcid)
+        cache.set(_ticket_key(job.ticket), result, self.result_ttl)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending":        self._pending,
+                "sections":       len(self._sections),
+                "active_groups":  sum(self._active.values()),
+                "workers":        len(self._threads),
+                "accepted":       self.accepted,
+                "rejected":       self.rejected,
+                "processed":      self.processed,
+            }
+
+
+def get_ticket(ticket):
+    """Stored state of *ticket* (any process), or None once expired."""
+    return cache.get(_ticket_key(ticket))
+
+
+# ── per-process singleton ─────────────────────────────────────
+_queue      = None
+_queue_lock = threading.Lock()
+
+
+def enabled():
+    return settings.ENROLLMENT_QUEUE["ENABLED"]
+
+
+def get_queue():
+    """
+    The queue for this process, or None when queued mode is off.  Workers
+    start on the first submit, so a pre-fork master never owns threads.
+    """
+    global _queue
+    if not enabled():
+        return None
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                conf = settings.ENROLLMENT_QUEUE
+                _queue = EnrollmentQueue(
+                    workers=conf["WORKERS"],
+                    max_pending=conf["MAX_PENDING"],
+                    per_section=conf["PER_SECTION"],
+                    db_concurrency=conf["DB_CONCURRENCY"],
+                    group_size=conf["GROUP_SIZE"],
+                    result_ttl=conf["RESULT_TTL"],
+                )
+    return _queue
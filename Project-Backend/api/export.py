@@ -0,0 +1,100 @@
+# api/export.py
+"""
+CSV / NDJSON encoders for the streaming export endpoints.
+
+Both take an iterable of dicts (built row by row from a RowStream) and
+yield text chunks of roughly CHUNK_SIZE characters – small enough that
+the first bytes leave immediately, large enough not to issue one socket
+write per row.
+"""
+import csv
+import datetime
+import decimal
+import json
+
+from django.http import StreamingHttpResponse
+
+CHUNK_SIZE = 64 * 1024
+
+FORMATS = {
+    "csv":    "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _scalar(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class _Line:
+    """File-like target for csv.writer: hands back the line just written."""
+    def write(self, value):
+        return value
+
+
+def _chunked(lines):
+    buf, size = [], 0
+    for line in lines:
+        buf.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf)
+
+
+def csv_rows(fields, items):
+    writer = csv.writer(_Line())
+
+    def lines():
+        yield writer.writerow(fields)
+        for item in items:
+            yield writer.writerow(["" if item[f] is None else _scalar(item[f])
+                                   for f in fields])
+    return _chunked(lines())
+
+
+def ndjson_rows(fields, items):
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def lines():
+        for item in items:
+            yield dumps({f: _scalar(item[f]) for f in fields}) + "\n"
+    return _chunked(lines())
+
+
+def encode(fmt, fields, items):
+    return csv_rows(fields, items) if fmt == "csv" else ndjson_rows(fields, items)
+
+
+class _Body:
+    """
+    Response body that also closes the RowStream – even when the client
+    disconnects before iteration started and the generators never ran.
+    """
+    def __init__(self, chunks, stream):
+        self._chunks = chunks
+        self._stream = stream
+
+    def __iter__(self):
+        return self._chunks
+
+    def close(self):
+        self._chunks.close()
+        self._stream.close()
+
+
+def export_response(fmt, filename, fields, items, stream):
+    """StreamingHttpResponse writing *items* (dicts) as CSV or NDJSON."""
+    response = StreamingHttpResponse(
+        _Body(encode(fmt, fields, items), stream),
+        content_type=FORMATS[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    response["X-Accel-Buffering"] = "no"      # don't let a proxy buffer it
+    return response
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import schedule
+from api.cache import bump_version_from_command, NOT_SHARED_NOTICE
+from api.db import query, execute_many, DBError
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill presented_courses.day_mask / start_min / end_min from on_days / "
+        "on_times for sections created before those columns existed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="re-parse every section, not only the ones without start_min",
+        )
+
+    def handle(self, *args, **opts):
+        where = "" if opts["all"] else " WHERE start_min IS NULL"
+        try:
+            rows = query(
+                "backfill_schedule",
+                "SELECT pcid, on_days, on_times FROM presented_courses" + where)
+        except DBError as e:
+            raise CommandError(e.msg)
+
+        parsed, bad = [], []
+        for pcid, on_days, on_times in rows:
+            try:
+                parsed.append((*schedule.parse(on_days, on_times), pcid))
+            except ValueError as e:
+                bad.append((pcid, on_days, on_times, str(e)))
+
+        if parsed:
+            try:
+                execute_many(
+                    "UPDATE presented_courses"
+                    "   SET day_mask = %s, start_min = %s, end_min = %s"
+                    " WHERE pcid = %s", parsed)
+            except DBError as e:
+                raise CommandError(e.msg)
+            if not bump_version_from_command("presented_courses"):
+                self.stderr.write(self.style.WARNING(NOT_SHARED_NOTICE))
+        self.stdout.write(self.style.SUCCESS(f"Parsed {len(parsed)} section(s)."))
+
+        if bad:
+            # left at NULL: they take part in no conflict check until fixed
+            for pcid, on_days, on_times, reason in bad:
+                self.stdout.write(f"{pcid:36}  {on_days!r:>10}  {on_times!r:>16}  {reason}")
+            raise CommandError(f"{len(bad)} section(s) have an unparseable schedule")
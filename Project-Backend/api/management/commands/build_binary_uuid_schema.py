@@ -0,0 +1,71 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DB_DIR = Path(settings.BASE_DIR) / "db"
+
+SOURCES = (
+    "01_schema_mysql.sql",
+    "02_seed_mysql.sql",
+    "03_procedures_mysql.sql",
+    "04_triggers_mysql.sql",
+    "05_views_mysql.sql",
+)
+
+# JSON_TABLE reads the record ids as text; they are converted on insert
+_JSON_ID   = "record_id CHAR(36)     PATH '$.record_id'"
+_JSON_HOLD = "record_id @JSON_ID@     PATH '$.record_id'"
+
+# (file, old, new, minimum count) – applied in order.  A rule that no
+# longer matches fails the build instead of silently producing a schema
+# that mixes key formats.
+REWRITES = (
+    ("03_procedures_mysql.sql", _JSON_ID, _JSON_HOLD, 1),
+    ("03_procedures_mysql.sql",
+     "SELECT j.record_id, j.grade",
+     "SELECT UUID_TO_BIN(j.record_id, 1), j.grade", 1),
+    ("*", "DEFAULT (UUID())", "DEFAULT (UUID_TO_BIN(UUID(), 1))", 0),
+    ("*", "CHAR(36)", "BINARY(16)", 0),
+    ("03_procedures_mysql.sql", _JSON_HOLD, _JSON_ID, 1),
+)
+
+HEADER = (
+    "-- GENERATED from db/{name} by `manage.py build_binary_uuid_schema`.\n"
+    "-- Keys are BINARY(16) UUID_TO_BIN(UUID(), 1) values (UUID_STORAGE=binary).\n"
+    "-- Edit the source file and re-run the command instead of this one.\n"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the BINARY(16) time-ordered-UUID variant of db/0*.sql "
+        "(for UUID_STORAGE=binary) into db/binary_uuid/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--out", default=str(DB_DIR / "binary_uuid"),
+            help="output directory (default: db/binary_uuid)",
+        )
+
+    def handle(self, *args, **opts):
+        out = Path(opts["out"])
+        out.mkdir(parents=True, exist_ok=True)
+
+        for name in SOURCES:
+            text = (DB_DIR / name).read_text(encoding="utf-8")
+            for target, old, new, minimum in REWRITES:
+                if target not in ("*", name):
+                    continue
+                n = text.count(old)
+                if n < minimum:
+                    raise CommandError(
+                        f"{name}: expected {old!r} at least {minimum}x, found {n}")
+                text = text.replace(old, new)
+            (out / name).write_text(HEADER.format(name=name) + text, encoding="utf-8")
+            self.stdout.write(f"  {out / name}")
+
+        self.stdout.write(self.style.SUCCESS(
+            "Done.  Load these instead of db/0*.sql (e.g. mount db/binary_uuid "
+            "as /docker-entrypoint-initdb.d) and set UUID_STORAGE=binary."))
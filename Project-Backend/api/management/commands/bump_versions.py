@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import bump_version_from_command, DELETE_CASCADES, NOT_SHARED_NOTICE
+
+
+class Command(BaseCommand):
+    help = (
+        "Bump table versions after changing tables outside the API (plain "
+        "SQL, imports, restores), so reference caches and list ETags of the "
+        "running servers move on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("table", nargs="+", help="tables that changed")
+        parser.add_argument(
+            "--deleted", action="store_true",
+            help="rows were deleted: also bump the ON DELETE CASCADE children",
+        )
+
+    def handle(self, *args, **opts):
+        tables = list(opts["table"])
+        if opts["deleted"]:
+            for table in opts["table"]:
+                tables += DELETE_CASCADES.get(table, ())
+        tables = list(dict.fromkeys(tables))
+        if not bump_version_from_command(*tables):
+            self.stderr.write(self.style.WARNING(NOT_SHARED_NOTICE))
+        self.stdout.write(self.style.SUCCESS("Bumped " + ", ".join(tables) + "."))
@@ -0,0 +1,240 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, DatabaseError
+
+# Sample arguments, taken from the seeded data itself.  Assigning them from
+# the columns keeps the columns' charset/collation, so the comparisons
+# below can use an index exactly like the procedures' CHAR parameters.
+SAMPLE_ARGS = (
+    "SET @pcid   = (SELECT pcid FROM presented_courses ORDER BY pcid LIMIT 1)",
+    "SET @sid    = (SELECT semester_id FROM presented_courses WHERE pcid = @pcid)",
+    "SET @prof   = (SELECT prof_id FROM presented_courses WHERE pcid = @pcid)",
+    "SET @room   = (SELECT room_id FROM presented_courses WHERE room_id IS NOT NULL LIMIT 1)",
+    "SET @record = (SELECT record_id FROM taken_courses WHERE pcid = @pcid LIMIT 1)",
+    "SET @mid    = (SELECT mid FROM std_records WHERE record_id = @record)",
+    "SET @major  = (SELECT major_id FROM std_records WHERE record_id = @record)",
+    "SET @did    = (SELECT did FROM majors WHERE major_id = @major)",
+    "SET @nid    = (SELECT national_id FROM members WHERE mid = @prof)",
+    "SET @title  = (SELECT sem_title FROM semesters WHERE sid = @sid)",
+    "SET @lname  = (SELECT lname FROM members WHERE mid = @mid)",
+    "SET @fname  = (SELECT fname FROM members WHERE mid = @mid)",
+)
+
+# (procedure, main statement, tables it may scan in full).
+# Whole-table listings are allowed to scan the table they list; anything
+# else reading a whole table is a missing index.  reconcile_* are
+# deliberate full passes and are not listed.
+PLANS = (
+    ("list_semesters",
+     "SELECT sid, start_date, end_date, sem_title, is_active FROM semesters "
+     "ORDER BY start_date DESC, end_date DESC",
+     {"semesters"}),
+    ("list_departments",
+     "SELECT d.did, w.member_id, m.fname FROM departments d "
+     "LEFT JOIN workers w ON w.did = d.did AND w.staff_role = 'HEAD' "
+     "AND (w.end_date IS NULL OR w.end_date >= CURDATE()) "
+     "LEFT JOIN members m ON m.mid = w.member_id ORDER BY d.department_name",
+     {"departments"}),
+    ("list_majors",
+     "SELECT m.major_id, d.department_name FROM majors m "
+     "JOIN departments d ON d.did = m.did ORDER BY d.department_name, m.major_name",
+     {"majors", "departments"}),
+    ("list_members_page",
+     "SELECT m.mid, c.username FROM members m "
+     "LEFT JOIN credentials c ON c.member_id = m.mid "
+     "WHERE m.lname > @lname OR (m.lname = @lname AND (m.fname > @fname "
+     "OR (m.fname = @fname AND m.mid > @mid))) "
+     "ORDER BY m.lname, m.fname, m.mid LIMIT 51",
+     set()),
+    ("list_staff_by_role",
+     "SELECT DISTINCT m.mid, d.department_name FROM workers w "
+     "JOIN members m ON m.mid = w.member_id "
+     "LEFT JOIN departments d ON d.did = w.did WHERE w.staff_role = 'PROF'",
+     set()),
+    ("list_presented_courses",
+     "SELECT DISTINCT pc.pcid, c.course_code FROM presented_courses pc "
+     "JOIN courses c ON c.cid = pc.course_id JOIN members m ON m.mid = pc.prof_id "
+     "JOIN workers w ON w.member_id = pc.prof_id "
+     "LEFT JOIN rooms r ON r.rid = pc.room_id "
+     "WHERE pc.semester_id = @sid AND w.did = @did ORDER BY c.course_code",
+     set()),
+    ("list_semester_catalog",
+     "SELECT pc.pcid, c.course_code, m.lname, r.room_label FROM presented_courses pc "
+     "JOIN courses c ON c.cid = pc.course_id JOIN members m ON m.mid = pc.prof_id "
+     "LEFT JOIN rooms r ON r.rid = pc.room_id WHERE pc.semester_id = @sid "
+     "ORDER BY c.course_code, pc.pcid",
+     set()),
+    ("list_semester_catalog (departments)",
+     "SELECT DISTINCT pc.pcid, w.did FROM presented_courses pc "
+     "JOIN workers w ON w.member_id = pc.prof_id WHERE pc.semester_id = @sid",
+     set()),
+    ("add_presented_course (room)",
+     "SELECT 1 FROM presented_courses pc WHERE pc.semester_id = @sid "
+     "AND pc.room_id = @room AND pc.start_min < 720 AND pc.end_min > 600 "
+     "AND (pc.day_mask & 5) <> 0",
+     set()),
+    ("add_presented_course (professor)",
+     "SELECT 1 FROM presented_courses pc WHERE pc.prof_id = @prof "
+     "AND pc.semester_id = @sid AND pc.start_min < 720 AND pc.end_min > 600 "
+     "AND (pc.day_mask & 5) <> 0",
+     set()),
+    ("add_presented_course (lookups)",
+     "SELECT (SELECT s.member_id FROM staffs s JOIN members m ON m.mid = s.member_id "
+     "WHERE m.national_id = @nid LIMIT 1), "
+     "(SELECT sid FROM semesters WHERE sem_title = @title LIMIT 1)",
+     set()),
+    ("active semester",
+     "SELECT sid FROM semesters WHERE is_active = TRUE ORDER BY start_date DESC LIMIT 1",
+     set()),
+    ("take_seat (timetable clash)",
+     "SELECT 1 FROM taken_courses tc JOIN presented_courses pc ON pc.pcid = tc.pcid "
+     "WHERE tc.record_id = @record AND tc.semester_id = @sid "
+     "AND tc.status IN ('RESERVED','TAKING') AND pc.start_min < 720 "
+     "AND pc.end_min > 600 AND (pc.day_mask & 5) <> 0",
+     set()),
+    ("take_seat",
+     "UPDATE presented_courses SET seats_used = seats_used + 1 "
+     "WHERE pcid = @pcid AND semester_id = @sid AND seats_used < max_capacity",
+     set()),
+    ("list_students_in_section",
+     "SELECT sr.student_number, m.lname, tc.status FROM taken_courses tc "
+     "JOIN student_semesters ss ON ss.record_id = tc.record_id AND ss.semester_id = tc.semester_id "
+     "JOIN std_records sr ON sr.record_id = ss.record_id "
+     "JOIN members m ON m.mid = sr.mid WHERE tc.pcid = @pcid ORDER BY m.lname, m.fname",
+     set()),
+    ("list_sections_by_prof",
+     "SELECT pc.pcid, c.course_code, s.sem_title FROM presented_courses pc "
+     "JOIN courses c ON c.cid = pc.course_id JOIN semesters s ON s.sid = pc.semester_id "
+     "LEFT JOIN rooms r ON r.rid = pc.room_id WHERE pc.prof_id = @prof "
+     "ORDER BY s.start_date DESC, c.course_code",
+     set()),
+    ("list_professor_course_load",
+     "SELECT m.mid, d.department_name, COUNT(*) FROM presented_courses pc "
+     "JOIN members m ON m.mid = pc.prof_id "
+     "JOIN workers w ON w.member_id = pc.prof_id AND (w.end_date IS NULL OR w.end_date >= CURDATE()) "
+     "JOIN departments d ON d.did = w.did WHERE pc.semester_id = @sid AND w.staff_role = 'PROF' "
+     "GROUP BY m.mid, m.fname, m.lname, d.department_name",
+     set()),
+    ("list_low_enrolment_courses",
+     "SELECT pc.pcid, COUNT(tc.pcid) FROM presented_courses pc "
+     "JOIN courses c ON c.cid = pc.course_id JOIN semesters s ON s.sid = pc.semester_id "
+     "LEFT JOIN taken_courses tc ON tc.pcid = pc.pcid "
+     "GROUP BY pc.pcid, c.course_code, c.course_name, s.sem_title, pc.max_capacity "
+     "HAVING COUNT(tc.pcid) < 10",
+     {"presented_courses"}),
+    ("list_record_courses",
+     "SELECT pc.pcid, tc.status FROM taken_courses tc "
+     "JOIN presented_courses pc ON pc.pcid = tc.pcid JOIN courses c ON c.cid = pc.course_id "
+     "WHERE tc.record_id = @record AND tc.semester_id = @sid",
+     set()),
+    ("list_taken_courses",
+     "SELECT tc.record_id, c.course_code FROM std_records sr "
+     "JOIN taken_courses tc ON tc.record_id = sr.record_id "
+     "JOIN presented_courses pc ON pc.pcid = tc.pcid JOIN courses c ON c.cid = pc.course_id "
+     "JOIN members mp ON mp.mid = pc.prof_id LEFT JOIN rooms r ON r.rid = pc.room_id "
+     "WHERE sr.mid = @mid ORDER BY tc.semester_id, c.course_code",
+     set()),
+    ("list_student_records",
+     "SELECT sr.record_id, m.major_name FROM std_records sr "
+     "JOIN majors m ON m.major_id = sr.major_id WHERE sr.mid = @mid",
+     set()),
+    ("list_term_gpa",
+     "SELECT ss.semester_id, s.sem_title FROM student_semesters ss "
+     "JOIN semesters s ON s.sid = ss.semester_id WHERE ss.record_id = @record "
+     "ORDER BY s.start_date, s.sid",
+     set()),
+    ("set_section_grades_tx",
+     "SELECT COUNT(*) FROM taken_courses WHERE semester_id = @sid AND pcid = @pcid",
+     set()),
+    ("closeout_next_chunk",
+     "SELECT pcid FROM presented_courses WHERE semester_id = @sid AND pcid > '' "
+     "ORDER BY pcid LIMIT 50",
+     set()),
+    ("closeout_next_chunk (rows)",
+     "UPDATE taken_courses SET status = 'COMPLETED' WHERE semester_id = @sid "
+     "AND pcid > '' AND pcid <= @pcid AND status <> 'COMPLETED'",
+     set()),
+    ("compute_semester_gpa",
+     "SELECT record_id FROM student_semesters WHERE semester_id = @sid "
+     "AND record_id > '' ORDER BY record_id LIMIT 500",
+     set()),
+)
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(\w+))?", re.I)
+_NOT_ALIAS = {"ON", "WHERE", "SET", "LEFT", "JOIN", "ORDER", "GROUP", "LIMIT"}
+
+
+def _aliases(sql):
+    """EXPLAIN reports aliases; map each back to its table name."""
+    names = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        names[table] = table
+        if alias and alias.upper() not in _NOT_ALIAS:
+            names[alias] = table
+    return names
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the main statement of every hot stored procedure against "
+        "the current (seeded) database and fail if one scans a whole table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-rows", type=int, default=1000,
+            help="ignore full scans of tables smaller than this (estimated "
+                 "rows) – the optimizer rightly scans tiny tables (default 1000)",
+        )
+        parser.add_argument(
+            "--verbose-plans", action="store_true",
+            help="print every plan row, not just the offending ones",
+        )
+
+    def handle(self, *args, **opts):
+        try:
+            with connection.cursor() as cur:
+                sizes = self._table_sizes(cur)
+                for sql in SAMPLE_ARGS:
+                    cur.execute(sql)
+                failures = []
+                for name, sql, allowed in PLANS:
+                    failures += self._check(cur, name, sql, allowed, sizes, opts)
+        except DatabaseError as e:
+            raise CommandError(str(e))
+
+        if failures:
+            raise CommandError(f"{len(failures)} full table scan(s): "
+                               + ", ".join(failures))
+        self.stdout.write(self.style.SUCCESS(
+            f"All {len(PLANS)} plans use an index."))
+
+    @staticmethod
+    def _table_sizes(cur):
+        cur.execute(
+            "SELECT table_name, table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE()")
+        return {name: rows or 0 for name, rows in cur.fetchall()}
+
+    def _check(self, cur, name, sql, allowed, sizes, opts):
+        cur.execute("EXPLAIN " + sql)
+        cols = [c[0].lower() for c in cur.description]
+        plan = [dict(zip(cols, row)) for row in cur.fetchall()]
+
+        aliases  = _aliases(sql)
+        failures = []
+        for step in plan:
+            table = step["table"] or ""
+            alias_of = aliases.get(table, table)
+            full = (step["type"] == "ALL"
+                    and not table.startswith("<")          # derived / union
+                    and alias_of not in allowed
+                    and sizes.get(alias_of, 0) >= opts["min_rows"])
+            if full:
+                failures.append(f"{name}:{alias_of}")
+            if full or opts["verbose_plans"]:
+                self.stdout.write(
+                    f"{'FULL SCAN' if full else 'ok':9}  {name:32}  {alias_of:18}"
+                    f"  type={step['type']}  key={step['key']}  rows={step['rows']}")
+        return failures
@@ -0,0 +1,117 @@
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, DatabaseError
+
+_IDENT = re.compile(r"[A-Za-z0-9_$]+")
+
+# copy order inside a table where a BEFORE INSERT trigger cares:
+# trg_one_head_per_dept must see past heads before the current one
+ROW_ORDER = {
+    "workers": "(end_date IS NULL), end_date",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy every row of the current CHAR(36) database into a database "
+        "built from db/binary_uuid/ (BINARY(16) keys), converting each key "
+        "with UUID_TO_BIN(key, 1).  Run with the application stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "target",
+            help="empty database created from db/binary_uuid/*.sql "
+                 "(same server as the source)",
+        )
+        parser.add_argument(
+            "--source", default=settings.DATABASES["default"]["NAME"],
+            help="CHAR(36) database to copy (default: DB_NAME)",
+        )
+
+    def handle(self, *args, **opts):
+        source, target = opts["source"], opts["target"]
+        for name in (source, target):
+            if not name or not _IDENT.fullmatch(name):
+                raise CommandError(f"invalid database name: {name!r}")
+        if source == target:
+            raise CommandError("source and target must differ")
+
+        try:
+            with connection.cursor() as cur:
+                src_cols = self._columns(cur, source)
+                dst_cols = self._columns(cur, target)
+                self._check(cur, target, src_cols, dst_cols)
+
+                cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+                try:
+                    for table in sorted(dst_cols):
+                        self._copy(cur, source, target, table,
+                                   src_cols[table], dst_cols[table])
+                finally:
+                    cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+        except DatabaseError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Copied {len(dst_cols)} tables.  Point DB_NAME at {target} "
+            f"and set UUID_STORAGE=binary."))
+
+    @staticmethod
+    def _columns(cur, schema):
+        """{table: [(column, data_type, char_length), …]} of base tables."""
+        cur.execute(
+            "SELECT c.table_name, c.column_name, c.data_type,"
+            "       c.character_maximum_length"
+            "  FROM information_schema.columns c"
+            "  JOIN information_schema.tables t"
+            "    ON t.table_schema = c.table_schema AND t.table_name = c.table_name"
+            " WHERE c.table_schema = %s AND t.table_type = 'BASE TABLE'"
+            " ORDER BY c.table_name, c.ordinal_position",
+            (schema,))
+        tables = {}
+        for table, column, data_type, length in cur.fetchall():
+            tables.setdefault(table, []).append((column, data_type, length))
+        return tables
+
+    @staticmethod
+    def _check(cur, target, src_cols, dst_cols):
+        if not dst_cols:
+            raise CommandError(f"{target} has no tables – load db/binary_uuid/ first")
+        if set(src_cols) != set(dst_cols):
+            raise CommandError(
+                "table sets differ: "
+                f"only in source {sorted(set(src_cols) - set(dst_cols))}, "
+                f"only in target {sorted(set(dst_cols) - set(src_cols))}")
+        for table in dst_cols:
+            cur.execute(f"SELECT EXISTS (SELECT 1 FROM `{target}`.`{table}`)")
+            if cur.fetchone()[0]:
+                raise CommandError(f"{target}.{table} is not empty")
+
+    def _copy(self, cur, source, target, table, src, dst):
+        src_types = {col: (dtype, length) for col, dtype, length in src}
+        names, exprs = [], []
+        for col, dtype, length in dst:
+            if col not in src_types:
+                raise CommandError(f"{table}.{col} missing in {source}")
+            names.append(f"`{col}`")
+            if dtype == "binary" and length == 16 and src_types[col] == ("char", 36):
+                # '' is the close-out cursor's "nothing yet" value
+                exprs.append(f"IF(`{col}` = '', '', UUID_TO_BIN(`{col}`, 1))")
+            else:
+                exprs.append(f"`{col}`")
+
+        order = f" ORDER BY {ROW_ORDER[table]}" if table in ROW_ORDER else ""
+        cur.execute(
+            f"INSERT INTO `{target}`.`{table}` ({', '.join(names)}) "
+            f"SELECT {', '.join(exprs)} FROM `{source}`.`{table}`{order}")
+
+        cur.execute(f"SELECT COUNT(*) FROM `{source}`.`{table}`")
+        expected = cur.fetchone()[0]
+        cur.execute(f"SELECT COUNT(*) FROM `{target}`.`{table}`")
+        copied = cur.fetchone()[0]
+        if copied != expected:
+            raise CommandError(f"{table}: copied {copied} of {expected} rows")
+        self.stdout.write(f"  {table:22} {copied:>9} rows")
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import bump_version_from_command, NOT_SHARED_NOTICE
+from api.db import call_procedure, DBError
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the running GPA totals (std_records.grade_sum/graded_cnt "
+        "and major_gpa_stats) and report every row that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix", action="store_true",
+            help="write the recomputed totals back (default: report only)",
+        )
+
+    def handle(self, *args, **opts):
+        try:
+            rows = call_procedure("reconcile_gpa_stats", (opts["fix"],))
+        except DBError as e:
+            raise CommandError(e.msg)
+
+        if not rows:
+            self.stdout.write(self.style.SUCCESS("No drift: all GPA totals match."))
+            return
+
+        self.stdout.write(f"{'kind':6}  {'id':36}  {'sum':>8}  {'count':>5}"
+                          f"  {'actual':>8}  {'count':>5}")
+        for kind, id_, counter_sum, counter_cnt, actual_sum, actual_cnt in rows:
+            self.stdout.write(f"{kind:6}  {id_:36}  {counter_sum:>8}  {counter_cnt:>5}"
+                              f"  {actual_sum:>8}  {actual_cnt:>5}")
+
+        if opts["fix"]:
+            if not bump_version_from_command("std_records"):
+                self.stderr.write(self.style.WARNING(NOT_SHARED_NOTICE))
+            self.stdout.write(self.style.WARNING(f"Fixed {len(rows)} row(s)."))
+        else:
+            # non-zero exit so cron / CI notices
+            raise CommandError(f"{len(rows)} row(s) drifted; re-run with --fix")
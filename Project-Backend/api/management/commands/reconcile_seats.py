@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import bump_version_from_command, NOT_SHARED_NOTICE
+from api.db import call_procedure, DBError
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute presented_courses.seats_used from taken_courses and "
+        "report every section whose counter drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix", action="store_true",
+            help="write the recomputed counts back (default: report only)",
+        )
+
+    def handle(self, *args, **opts):
+        try:
+            rows = call_procedure("reconcile_seat_counters", (opts["fix"],))
+        except DBError as e:
+            raise CommandError(e.msg)
+
+        if not rows:
+            self.stdout.write(self.style.SUCCESS("No drift: all seat counters match."))
+            return
+
+        self.stdout.write(f"{'pcid':36}  {'counter':>7}  {'actual':>6}  {'drift':>5}")
+        for pcid, counter, actual, drift in rows:
+            self.stdout.write(f"{pcid:36}  {counter:>7}  {actual:>6}  {drift:>+5}")
+
+        if opts["fix"]:
+            # seats_used is read by the section search and its seat refresh
+            if not bump_version_from_command("presented_courses", "taken_courses"):
+                self.stderr.write(self.style.WARNING(NOT_SHARED_NOTICE))
+            self.stdout.write(self.style.WARNING(f"Fixed {len(rows)} section(s)."))
+        else:
+            # non-zero exit so cron / CI notices
+            raise CommandError(f"{len(rows)} section(s) drifted; re-run with --fix")
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import closeout
+from api.cache import shared, NOT_SHARED_NOTICE
+from api.db import DBError
+
+
+class Command(BaseCommand):
+    help = (
+        "Finish semester close-outs left RUNNING or FAILED (e.g. by a "
+        "crashed worker), from their last committed chunk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "sid", nargs="*",
+            help="semester ids (default: every unfinished close-out)",
+        )
+
+    def handle(self, *args, **opts):
+        try:
+            sids = opts["sid"] or closeout.unfinished()
+        except DBError as e:
+            raise CommandError(e.msg)
+
+        if not sids:
+            self.stdout.write(self.style.SUCCESS("No unfinished close-outs."))
+            return
+
+        failed = 0
+        for sid in sids:
+            try:
+                row = closeout.status(sid)
+                if row is None:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f"{sid}  no close-out to resume"))
+                    continue
+                if row[1] != "DONE":
+                    closeout.begin(sid)          # FAILED → RUNNING
+                    row = closeout.run(sid)
+            except DBError as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"{sid}  failed: {e.msg}"))
+                continue
+            self.stdout.write(f"{sid}  {row[1]}  {row[3]}/{row[2]} sections")
+
+        if not shared():
+            # api/closeout.py bumped the versions – in this process only
+            self.stderr.write(self.style.WARNING(NOT_SHARED_NOTICE))
+        if failed:
+            raise CommandError(f"{failed} close-out(s) failed")
@@ -0,0 +1,435 @@
+import math
+import random
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api import schedule
+from api.cache import bump_version_from_command, NOT_SHARED_NOTICE
+from api.db import call_procedure, execute_many, query_one, DBError
+
+# FK order; truncated in reverse by --flush
+TABLES = (
+    "members", "credentials", "departments", "majors", "semesters",
+    "rooms", "courses", "prerequisites", "staffs", "workers",
+    "presented_courses", "std_records", "major_gpa_stats",
+    "student_semesters", "taken_courses", "grade_audit", "semester_closeouts",
+)
+
+SUBJECTS = (
+    ("Computer Science", "CS"), ("Mathematics", "MATH"), ("Physics", "PHYS"),
+    ("Chemistry", "CHEM"), ("Biology", "BIO"), ("Economics", "ECON"),
+    ("History", "HIST"), ("Philosophy", "PHIL"), ("Psychology", "PSY"),
+    ("Civil Engineering", "CE"), ("Electrical Engineering", "EE"),
+    ("Mechanical Engineering", "ME"), ("Literature", "LIT"),
+    ("Sociology", "SOC"), ("Statistics", "STAT"), ("Architecture", "ARCH"),
+)
+MAJOR_KINDS = ("", "Applied ", "Computational ", "Theoretical ", "Environmental ")
+TOPICS = (
+    "Foundations", "Methods", "Theory", "Laboratory", "Seminar", "Analysis",
+    "Design", "Modelling", "Applications", "Systems", "Advanced Topics",
+    "Research Project",
+)
+FIRST_NAMES = (
+    "Ada", "Alan", "Ali", "Amir", "Anna", "Ben", "Cara", "Dara", "Elif",
+    "Emma", "Farid", "Hana", "Ivan", "Jon", "Kian", "Lea", "Lina", "Mara",
+    "Mina", "Nima", "Omar", "Pia", "Reza", "Sara", "Tara", "Yara", "Zoe",
+)
+LAST_NAMES = (
+    "Ahmadi", "Berg", "Chen", "Diaz", "Evans", "Farahani", "Garcia", "Hall",
+    "Ito", "Jansen", "Karimi", "Lopez", "Moradi", "Novak", "Okafor", "Park",
+    "Rahimi", "Silva", "Tehrani", "Ueda", "Weber", "Yilmaz", "Zand",
+)
+
+# disjoint day sets × disjoint time blocks: two different slots never
+# overlap, so "different slot" is the whole conflict rule below
+DAY_PATTERNS = ("MW", "TR", "F")
+TIME_BLOCKS  = ("8:00-9:15", "9:30-10:45", "11:00-12:15", "12:30-13:45",
+                "14:00-15:15", "15:30-16:45", "17:00-18:15")
+SLOTS = [(d, t, *schedule.parse(d, t)) for d in DAY_PATTERNS for t in TIME_BLOCKS]
+
+INSERT = {
+    "members":           ("mid, is_admin, fname, lname, national_id, birthday", 6),
+    "credentials":       ("member_id, username, password_hash", 3),
+    "departments":       ("did, department_name, location", 3),
+    "majors":            ("major_id, major_name, did", 3),
+    "semesters":         ("sid, start_date, end_date, sem_title, is_active", 5),
+    "rooms":             ("rid, room_label, capacity", 3),
+    "courses":           ("cid, course_code, course_name", 3),
+    "prerequisites":     ("course_id, prerequisite_id", 2),
+    "staffs":            ("member_id", 1),
+    "workers":           ("member_id, did, staff_role, start_date, end_date", 5),
+    "presented_courses": ("pcid, prof_id, capacity, max_capacity, seats_used, "
+                          "semester_id, on_days, on_times, day_mask, start_min, "
+                          "end_min, room_id, course_id", 13),
+    "std_records":       ("record_id, mid, gpa, grade_sum, graded_cnt, major_id, "
+                          "entrance_sem, student_number", 8),
+    "major_gpa_stats":   ("major_id, gpa_sum, gpa_cnt", 3),
+    "student_semesters": ("record_id, semester_id, sem_gpa, sem_status", 4),
+    "taken_courses":     ("record_id, semester_id, pcid, status, grade", 5),
+}
+
+CENT = Decimal("0.01")
+
+
+def _avg(total, count):
+    """ROUND(total / count, 2) as MySQL does it, None for no rows."""
+    return (total / count).quantize(CENT, ROUND_HALF_UP) if count else None
+
+
+class _Ids:
+    """
+    Version-1 UUIDs like MySQL's UUID(), from a counter instead of the
+    clock: consecutive, and the same for the same seed.
+    """
+
+    def __init__(self, rng, start):
+        unix = (start - date(1970, 1, 1)).days * 86400
+        self._t    = unix * 10_000_000 + 0x01B21DD213814000
+        self._seq  = rng.getrandbits(14)
+        self._node = rng.getrandbits(48)
+
+    def __call__(self):
+        self._t += 1
+        t = self._t
+        return str(uuid.UUID(fields=(
+            t & 0xFFFFFFFF, (t >> 32) & 0xFFFF, ((t >> 48) & 0x0FFF) | 0x1000,
+            0x80 | (self._seq >> 8), self._seq & 0xFF, self._node)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill an empty database with synthetic, repeatable data – departments, "
+        "majors, courses with prerequisites, rooms, professors, semesters, "
+        "sections, students and their enrolments – for load tests and "
+        "benchmarks.  The same --seed and sizes always give the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--students", type=int, default=2000)
+        parser.add_argument("--sections", type=int, default=200,
+                            help="sections per semester (default 200)")
+        parser.add_argument("--semesters", type=int, default=3,
+                            help="the last one is active, the others completed")
+        parser.add_argument("--departments", type=int, default=8)
+        parser.add_argument("--majors-per-department", type=int, default=2)
+        parser.add_argument("--courses", type=int, default=None,
+                            help="default: sections / 2")
+        parser.add_argument("--professors", type=int, default=None,
+                            help="default: sections / 3")
+        parser.add_argument("--rooms", type=int, default=None,
+                            help="default: sections / 15")
+        parser.add_argument("--courses-per-term", type=int, default=4)
+        parser.add_argument("--start-year", type=int, default=2023)
+        parser.add_argument("--password", default="synthetic-pass",
+                            help="password of every generated login "
+                                 "(admin, prof<N>, student<N>)")
+        parser.add_argument("--batch", type=int, default=1000,
+                            help="rows per multi-row INSERT (default 1000)")
+        parser.add_argument("--flush", action="store_true",
+                            help="empty every table first instead of refusing "
+                                 "a non-empty database")
+
+    def handle(self, *args, **opts):
+        self.opts = opts
+        self.rng  = random.Random(opts["seed"])
+        self.ids  = _Ids(self.rng, date(opts["start_year"], 1, 1))
+        self.counts = dict.fromkeys(INSERT, 0)
+        for name in ("students", "sections", "semesters", "departments",
+                     "majors_per_department", "courses_per_term", "batch"):
+            if opts[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be >= 1")
+        if opts["students"] > 999_999:
+            # student_number is CHAR(10): entrance year + 6 digits
+            raise CommandError("--students must be <= 999999")
+
+        started = time.monotonic()
+        try:
+            self._prepare(opts["flush"])
+            # one hash for every login: hashing 100k passwords would
+            # dominate the run.  Salted from the seed, so it repeats too.
+            self.password_hash = make_password(opts["password"],
+                                               salt=f"synthetic{opts['seed']}")
+            self._people_and_catalog()
+            self._semesters()
+            self._sections()
+            self._students()
+            self._finish()
+        except DBError as e:
+            raise CommandError(e.msg)
+
+        if not bump_version_from_command(*TABLES):
+            self.stderr.write(self.style.WARNING(NOT_SHARED_NOTICE))
+        for table, n in self.counts.items():
+            self.stdout.write(f"  {table:18} {n:>10}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded in {time.monotonic() - started:.1f}s (seed {opts['seed']}).  "
+            f"Logins: admin, prof1…prof{len(self.profs)}, "
+            f"student1…student{opts['students']} / {opts['password']}"))
+
+    # ---------- helpers -------------------------------------------
+    def _insert(self, table, rows):
+        columns, arity = INSERT[table]
+        sql = (f"INSERT INTO {table} ({columns}) VALUES "
+               f"({', '.join(['%s'] * arity)})")
+        batch = self.opts["batch"]
+        for i in range(0, len(rows), batch):
+            execute_many(sql, rows[i:i + batch])
+        self.counts[table] += len(rows)
+
+    def _prepare(self, flush):
+        if flush:
+            with connection.cursor() as cur:
+                cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+                try:
+                    for table in reversed(TABLES):
+                        cur.execute(f"TRUNCATE TABLE {table}")
+                finally:
+                    cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+            return
+        for table in TABLES:
+            if query_one("seed_synthetic", f"SELECT 1 FROM {table} LIMIT 1"):
+                raise CommandError(f"{table} is not empty; use --flush to "
+                                   "replace everything")
+
+    def _person(self, n, min_age, max_age, is_admin=False):
+        rng = self.rng
+        age = rng.randint(min_age, max_age)
+        born = date(self.opts["start_year"] - age, 1, 1) + timedelta(rng.randrange(365))
+        return (self.ids(), is_admin, rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES), f"{n:012d}", born)
+
+    # ---------- reference data ------------------------------------
+    def _people_and_catalog(self):
+        o, rng, ids = self.opts, self.rng, self.ids
+        per_sem = o["sections"]
+        n_courses = max(o["courses"] or per_sem // 2, o["departments"])
+        n_profs   = max(o["professors"] or math.ceil(per_sem / 3), o["departments"])
+        n_rooms   = max(o["rooms"] or math.ceil(per_sem / 15), 1)
+
+        # departments and majors
+        self.depts = []
+        for i in range(o["departments"]):
+            name, abbr = SUBJECTS[i % len(SUBJECTS)]
+            if i >= len(SUBJECTS):
+                name, abbr = f"{name} {i // len(SUBJECTS) + 1}", f"{abbr}{i // len(SUBJECTS) + 1}"
+            self.depts.append((ids(), name, abbr))
+        self._insert("departments", [(d, name, f"Building {abbr}")
+                                     for d, name, abbr in self.depts])
+
+        self.majors = []                           # (major_id, dept index)
+        for di, (did, name, _) in enumerate(self.depts):
+            for k in range(o["majors_per_department"]):
+                kind = MAJOR_KINDS[k % len(MAJOR_KINDS)]
+                suffix = f" {k // len(MAJOR_KINDS) + 1}" if k >= len(MAJOR_KINDS) else ""
+                self.majors.append((ids(), f"{kind}{name}{suffix}", di))
+        self._insert("majors", [(m, name, self.depts[di][0])
+                                for m, name, di in self.majors])
+
+        # courses, numbered per department; prerequisites point at lower
+        # numbers of the same department, so the graph is acyclic
+        self.courses_by_dept = [[] for _ in self.depts]
+        courses, prereqs = [], []
+        for i in range(n_courses):
+            di = i % len(self.depts)
+            own = self.courses_by_dept[di]
+            code = f"{self.depts[di][2]}{100 + len(own)}"
+            cid = ids()
+            courses.append((cid, code, f"{rng.choice(TOPICS)} ({code})"))
+            for pre in rng.sample(own, min(len(own), rng.choice((0, 1, 1, 2)))):
+                prereqs.append((cid, pre))
+            own.append(cid)
+        self._insert("courses", courses)
+        self._insert("prerequisites", prereqs)
+
+        self.rooms = [(ids(), f"R{i + 1:04d}", rng.choice((30, 40, 60, 80, 120, 200)))
+                      for i in range(n_rooms)]
+        self._insert("rooms", self.rooms)
+
+        # one admin, then professors spread over the departments; the first
+        # professor of each department is also its head
+        admin = self._person(1, 30, 60, is_admin=True)
+        members, creds = [admin], [(admin[0], "admin", self.password_hash)]
+        self.profs = []                            # (mid, dept index)
+        workers = []
+        hired = date(o["start_year"] - 5, 9, 1)
+        for i in range(n_profs):
+            p = self._person(2 + i, 30, 65)
+            di = i % len(self.depts)
+            members.append(p)
+            creds.append((p[0], f"prof{i + 1}", self.password_hash))
+            self.profs.append((p[0], di))
+            workers.append((p[0], self.depts[di][0], "PROF", hired, None))
+            if i < len(self.depts):
+                workers.append((p[0], self.depts[di][0], "HEAD",
+                                hired + timedelta(1), None))
+        self._insert("members", members)
+        self._insert("credentials", creds)
+        self._insert("staffs", [(mid,) for mid, _ in self.profs])
+        self._insert("workers", workers)
+
+        self.profs_by_dept = [[] for _ in self.depts]
+        for mid, di in self.profs:
+            self.profs_by_dept[di].append(mid)
+
+    def _semesters(self):
+        o = self.opts
+        self.semesters = []                        # (sid, title, is_active)
+        rows = []
+        for i in range(o["semesters"]):
+            year = o["start_year"] + (i + 1) // 2
+            if i % 2 == 0:
+                title, start, end = f"Fall {year}", date(year, 9, 1), date(year + 1, 1, 20)
+            else:
+                title, start, end = f"Spring {year}", date(year, 2, 1), date(year, 6, 20)
+            active = i == o["semesters"] - 1
+            sid = self.ids()
+            self.semesters.append((sid, title, active))
+            rows.append((sid, start, end, title, active))
+        self._insert("semesters", rows)
+
+    # ---------- sections ------------------------------------------
+    def _sections(self):
+        """Per semester: no professor and no room is booked twice in a slot."""
+        rng = self.rng
+        self.sections = []       # per semester: list of [pcid, course, slot, max, dept]
+        self.seats    = {}       # pcid → RESERVED/TAKING rows (→ seats_used)
+        demand = self.opts["students"] * self.opts["courses_per_term"]
+        target = max(10, math.ceil(1.3 * demand / self.opts["sections"]))
+
+        for sid, _, _ in self.semesters:
+            prof_busy, room_busy, secs, rows = set(), set(), [], []
+            for _ in range(self.opts["sections"]):
+                di = rng.randrange(len(self.depts))
+                cid = rng.choice(self.courses_by_dept[di])
+                prof = slot = None
+                for mid in rng.sample(self.profs_by_dept[di], len(self.profs_by_dept[di])):
+                    free = [s for s in range(len(SLOTS)) if (mid, s) not in prof_busy]
+                    if free:
+                        prof, slot = mid, rng.choice(free)
+                        break
+                if prof is None:               # department fully booked
+                    continue
+                prof_busy.add((prof, slot))
+
+                max_cap = rng.randint(max(1, target * 3 // 4), target * 5 // 4)
+                room = None
+                for rid, _, cap in rng.sample(self.rooms, min(8, len(self.rooms))):
+                    if cap >= max_cap and (rid, slot) not in room_busy:
+                        room = rid
+                        room_busy.add((rid, slot))
+                        break
+
+                pcid = self.ids()
+                on_days, on_times, day_mask, start_min, end_min = SLOTS[slot]
+                rows.append((pcid, prof, max(1, max_cap * 9 // 10), max_cap, 0, sid,
+                             on_days, on_times, day_mask, start_min, end_min,
+                             room, cid))
+                secs.append((pcid, cid, slot, max_cap, di))
+                self.seats[pcid] = 0
+            self._insert("presented_courses", rows)
+            self.sections.append(secs)
+
+        self.sections_by_dept = [
+            [[s for s in secs if s[4] == di] for di in range(len(self.depts))]
+            for secs in self.sections
+        ]
+
+    # ---------- students ------------------------------------------
+    def _students(self):
+        """Students in chunks of --batch, each chunk inserted in FK order."""
+        o = self.opts
+        self.major_gpa = {}                        # major_id → (Σ gpa, count)
+        self.taken     = {}                        # pcid → rows of any status
+        for first in range(0, o["students"], o["batch"]):
+            chunk = range(first, min(first + o["batch"], o["students"]))
+            tables = {t: [] for t in ("members", "credentials", "std_records",
+                                      "student_semesters", "taken_courses")}
+            for n in chunk:
+                self._student(n, tables)
+            for table, rows in tables.items():
+                self._insert(table, rows)
+
+    def _student(self, n, out):
+        rng, o = self.rng, self.opts
+        person = self._person(10_000_000 + n, 18, 30)
+        mid = person[0]
+        out["members"].append(person)
+        out["credentials"].append((mid, f"student{n + 1}", self.password_hash))
+
+        major_id, _, di = rng.choice(self.majors)
+        record_id = self.ids()
+        entrance = rng.randrange(len(self.semesters))
+
+        grade_sum, graded = Decimal(0), 0
+        for si in range(entrance, len(self.semesters)):
+            sid, _, active = self.semesters[si]
+            if rng.random() < 0.05:
+                out["student_semesters"].append((record_id, sid, None, "ON_LEAVE"))
+                continue
+            term_sum, term_cnt = Decimal(0), 0
+            for pcid in self._pick_sections(si, di):
+                if active:
+                    status, grade = rng.choice(("RESERVED", "TAKING")), Decimal(0)
+                    self.seats[pcid] += 1
+                else:
+                    status = "COMPLETED"
+                    grade = (Decimal(round(rng.triangular(6, 20, 15) * 4)) / 4).quantize(CENT)
+                    term_sum += grade
+                    term_cnt += 1
+                out["taken_courses"].append((record_id, sid, pcid, status, grade))
+            grade_sum += term_sum
+            graded    += term_cnt
+            out["student_semesters"].append(
+                (record_id, sid, _avg(term_sum, term_cnt), "ACTIVE"))
+
+        gpa = _avg(grade_sum, graded)
+        if gpa is not None:
+            s, c = self.major_gpa.get(major_id, (Decimal(0), 0))
+            self.major_gpa[major_id] = (s + gpa, c + 1)
+        entrance_year = o["start_year"] + (entrance + 1) // 2
+        # std_records go in before the chunk's student_semesters
+        out["std_records"].append((record_id, mid, gpa, grade_sum, graded, major_id,
+                                   self.semesters[entrance][0],
+                                   f"{entrance_year}{n + 1:06d}"))
+
+    def _pick_sections(self, si, di):
+        """Sections for one term: own department first, no clash, not full."""
+        rng = self.rng
+        want = self.opts["courses_per_term"]
+        own, every = self.sections_by_dept[si][di], self.sections[si]
+        picked, slots, courses = [], set(), set()
+        if not every:
+            return picked
+        for _ in range(want * 4):
+            if len(picked) == want:
+                break
+            pool = own if own and rng.random() < 0.7 else every
+            pcid, cid, slot, max_cap, _ = rng.choice(pool)
+            if slot in slots or cid in courses or self.taken.get(pcid, 0) >= max_cap:
+                continue
+            picked.append(pcid)
+            slots.add(slot)
+            courses.add(cid)
+            self.taken[pcid] = self.taken.get(pcid, 0) + 1
+        return picked
+
+    # ---------- counters and self-check ---------------------------
+    def _finish(self):
+        self._insert("major_gpa_stats", [(m, s, c) for m, (s, c) in self.major_gpa.items()])
+        used = [(n, pcid) for pcid, n in self.seats.items() if n]
+        if used:
+            execute_many("UPDATE presented_courses SET seats_used = %s WHERE pcid = %s", used)
+
+        # the counters were written directly – the repo's own reconcilers
+        # must find nothing to fix
+        for procedure in ("reconcile_seat_counters", "reconcile_gpa_stats"):
+            drift = call_procedure(procedure, (False,))
+            if drift:
+                raise CommandError(f"{procedure} reports {len(drift)} drifted row(s)")
@@ -0,0 +1,380 @@
+# api/metrics.py
+"""
+In-process instrumentation for the DB hot path (METRICS_ENABLED).
+
+• per stored procedure / named query: calls, latency histogram, rows
+  returned, errors by DBError status (409/404/400/503)
+• per view: requests by method+status, latency histogram, DB calls and
+  DB time spent inside the request
+• rendered in Prometheus text format by GET /api/metrics
+
+When disabled, api.db binds the plain functions and MetricsMiddleware is
+not installed, so nothing here runs at all.
+
+Counters live in each process.  Under a multi-worker server set
+METRICS_DIR to a directory the workers share: every process writes its
+snapshot there (at most once per METRICS_FLUSH_SECONDS, and at exit) and
+/api/metrics sums all of them, whichever worker answers the scrape –
+like Prometheus' own multiprocess mode.  Counters of exited workers stay
+in the sums; pool gauges are reported per live pid.  gunicorn.conf.py
+empties the directory when the server starts.
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_lock = threading.Lock()
+
+# pool.stats() keys that only ever grow
+_POOL_COUNTERS = {"checkouts", "timeouts", "discarded", "wait_seconds_total"}
+
+# request-scoped accumulator: [db_calls, db_seconds]
+_request_db = ContextVar("request_db", default=None)
+
+
+def enabled():
+    return getattr(settings, "METRICS_ENABLED", False)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "n")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)     # last slot = +Inf
+        self.total  = 0.0
+        self.n      = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.n     += 1
+
+
+class _DBStats:
+    __slots__ = ("calls", "rows", "errors", "latency")
+
+    def __init__(self):
+        self.calls   = 0
+        self.rows    = 0
+        self.errors  = {}                 # status → count
+        self.latency = _Histogram()
+
+
+class _ViewStats:
+    __slots__ = ("requests", "latency", "db_calls", "db_seconds")
+
+    def __init__(self):
+        self.requests   = {}              # (method, status) → count
+        self.latency    = _Histogram()
+        self.db_calls   = 0
+        self.db_seconds = 0.0
+
+
+_db    = {}       # (kind, name) → _DBStats   kind ∈ {"procedure", "query"}
+_views = {}       # view name     → _ViewStats
+
+
+# ── recording ───────────────────────────────────────────────────
+def _record_db(kind, name, elapsed, rows, error_status):
+    with _lock:
+        stats = _db.get((kind, name))
+        if stats is None:
+            stats = _db[(kind, name)] = _DBStats()
+        stats.calls += 1
+        stats.latency.observe(elapsed)
+        if error_status is None:
+            stats.rows += rows
+        else:
+            stats.errors[error_status] = stats.errors.get(error_status, 0) + 1
+
+    acc = _request_db.get()
+    if acc is not None:
+        acc[0] += 1
+        acc[1] += elapsed
+
+
+def rows_in_sets(result):
+    """Rows returned by call_procedure_sets: every result set counts."""
+    return sum(map(len, result))
+
+
+def timed(kind, fn, rows=len):
+    """
+    Wrap call_procedure / query; both take the metric name first.
+    *rows* counts the rows of a result (rows_in_sets for
+    call_procedure_sets, whose result is a list of result sets).
+    """
+    from .db import DBError
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        name = args[0]
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except DBError as exc:
+            _record_db(kind, name, time.perf_counter() - started, 0, exc.status)
+            raise
+        _record_db(kind, name, time.perf_counter() - started, rows(result), None)
+        return result
+    return wrapper
+
+
+def atimed(kind, fn, rows=len):
+    """timed() for the coroutines of api/adb.py."""
+    from .db import DBError
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        name = args[0]
+        started = time.perf_counter()
+        try:
+            result = await fn(*args, **kwargs)
+        except DBError as exc:
+            _record_db(kind, name, time.perf_counter() - started, 0, exc.status)
+            raise
+        _record_db(kind, name, time.perf_counter() - started, rows(result), None)
+        return result
+    return wrapper
+
+
+def begin_request():
+    return _request_db.set([0, 0.0])
+
+
+def end_request(token, view, method, status_code, elapsed):
+    acc = _request_db.get()
+    _request_db.reset(token)
+    with _lock:
+        stats = _views.get(view)
+        if stats is None:
+            stats = _views[view] = _ViewStats()
+        key = (method, status_code)
+        stats.requests[key] = stats.requests.get(key, 0) + 1
+        stats.latency.observe(elapsed)
+        if acc is not None:
+            stats.db_calls   += acc[0]
+            stats.db_seconds += acc[1]
+    if _metrics_dir():
+        _maybe_flush()
+
+
+# ── multiprocess snapshots (METRICS_DIR) ───────────────────────
+_started    = time.time_ns()           # tells a new process from an old one with the same pid
+_last_flush = 0.0
+
+
+def _metrics_dir():
+    return getattr(settings, "METRICS_DIR", "")
+
+
+def _snapshot(pool_stats=None):
+    with _lock:
+        return {
+            "pid":  os.getpid(),
+            "db":   [[kind, name, s.calls, s.rows, sorted(s.errors.items()),
+                      list(s.latency.counts), s.latency.total, s.latency.n]
+                     for (kind, name), s in _db.items()],
+            "views": [[view, [[m, st, n] for (m, st), n in s.requests.items()],
+                       list(s.latency.counts), s.latency.total, s.latency.n,
+                       s.db_calls, s.db_seconds]
+                      for view, s in _views.items()],
+            "pool": pool_stats,
+        }
+
+
+def flush(pool_stats=None):
+    """Write this process' snapshot to METRICS_DIR (atomically)."""
+    global _last_flush
+    directory = _metrics_dir()
+    if not directory:
+        return
+    _last_flush = time.monotonic()
+    if pool_stats is None:
+        from .pool import get_pool
+        pool = get_pool()
+        pool_stats = pool.stats() if pool else None
+    path = os.path.join(directory, f"metrics-{os.getpid()}-{_started}.json")
+    tmp  = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_snapshot(pool_stats), f)
+    os.replace(tmp, path)
+
+
+def _maybe_flush():
+    if time.monotonic() - _last_flush >= getattr(settings, "METRICS_FLUSH_SECONDS", 1.0):
+        try:
+            flush()
+        except OSError:
+            pass                       # never fail a request over metrics
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _merge(snapshots):
+    """Sum the snapshots into fresh (_db, _views, [(pid, pool stats)])."""
+    db, views, pools = {}, {}, []
+    for snap in snapshots:
+        for kind, name, calls, rows, errors, counts, total, n in snap["db"]:
+            s = db.get((kind, name))
+            if s is None:
+                s = db[(kind, name)] = _DBStats()
+            s.calls += calls
+            s.rows  += rows
+            for status, count in errors:
+                s.errors[status] = s.errors.get(status, 0) + count
+            _add_histogram(s.latency, counts, total, n)
+        for view, requests, counts, total, n, db_calls, db_seconds in snap["views"]:
+            s = views.get(view)
+            if s is None:
+                s = views[view] = _ViewStats()
+            for method, status, count in requests:
+                s.requests[(method, status)] = s.requests.get((method, status), 0) + count
+            _add_histogram(s.latency, counts, total, n)
+            s.db_calls   += db_calls
+            s.db_seconds += db_seconds
+        if snap["pool"]:
+            pools.append((snap["pid"], snap["pool"]))
+    return db, views, pools
+
+
+def _add_histogram(hist, counts, total, n):
+    hist.counts = [a + b for a, b in zip(hist.counts, counts)]
+    hist.total += total
+    hist.n     += n
+
+
+def _collect(pool_stats):
+    """(db, views, pools) over every process of METRICS_DIR."""
+    flush(pool_stats)
+    snapshots = []
+    for path in glob.glob(os.path.join(_metrics_dir(), "metrics-*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue                   # replaced or removed meanwhile
+    db, views, pools = _merge(snapshots)
+    # gauges of exited workers describe nothing any more
+    pools = [(pid, stats) for pid, stats in pools if _alive(pid)]
+    return db, views, pools
+
+
+@atexit.register
+def _flush_at_exit():
+    if enabled() and _metrics_dir():
+        try:
+            flush()
+        except Exception:
+            pass
+
+
+# ── Prometheus text exposition ─────────────────────────────────
+def _esc(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_esc(v)}"' for k, v in labels.items()) + "}"
+
+
+def _histogram_lines(metric, hist, **labels):
+    cumulative = 0
+    for bound, count in zip(BUCKETS + ("+Inf",), hist.counts):
+        cumulative += count
+        yield f"{metric}_bucket{_labels(**labels, le=bound)} {cumulative}"
+    yield f"{metric}_sum{_labels(**labels)} {hist.total:.6f}"
+    yield f"{metric}_count{_labels(**labels)} {hist.n}"
+
+
+def render_prometheus(pool_stats=None):
+    if _metrics_dir():
+        db, views, pools = _collect(pool_stats)
+        db, views = sorted(db.items()), sorted(views.items())
+    else:
+        with _lock:
+            db    = sorted(_db.items())
+            views = sorted(_views.items())
+        pools = [(None, pool_stats)] if pool_stats else []
+    return _render(db, views, pools)
+
+
+def _render(db, views, pools):
+    out = [
+        "# HELP api_db_calls_total Stored-procedure / named-query calls.",
+        "# TYPE api_db_calls_total counter",
+    ]
+    for (kind, name), s in db:
+        out.append(f"api_db_calls_total{_labels(kind=kind, name=name)} {s.calls}")
+
+    out += ["# HELP api_db_rows_total Rows returned by successful calls.",
+            "# TYPE api_db_rows_total counter"]
+    for (kind, name), s in db:
+        out.append(f"api_db_rows_total{_labels(kind=kind, name=name)} {s.rows}")
+
+    out += ["# HELP api_db_errors_total Failed calls by DBError status.",
+            "# TYPE api_db_errors_total counter"]
+    for (kind, name), s in db:
+        for status, n in sorted(s.errors.items()):
+            out.append(f"api_db_errors_total"
+                       f"{_labels(kind=kind, name=name, status=status)} {n}")
+
+    out += ["# HELP api_db_duration_seconds Call latency.",
+            "# TYPE api_db_duration_seconds histogram"]
+    for (kind, name), s in db:
+        out.extend(_histogram_lines("api_db_duration_seconds", s.latency,
+                                    kind=kind, name=name))
+
+    out += ["# HELP api_view_requests_total Requests per view.",
+            "# TYPE api_view_requests_total counter"]
+    for view, s in views:
+        for (method, status), n in sorted(s.requests.items()):
+            out.append(f"api_view_requests_total"
+                       f"{_labels(view=view, method=method, status=status)} {n}")
+
+    out += ["# HELP api_view_duration_seconds Request latency per view.",
+            "# TYPE api_view_duration_seconds histogram"]
+    for view, s in views:
+        out.extend(_histogram_lines("api_view_duration_seconds", s.latency, view=view))
+
+    out += ["# HELP api_view_db_calls_total DB calls made while serving a view.",
+            "# TYPE api_view_db_calls_total counter"]
+    for view, s in views:
+        out.append(f"api_view_db_calls_total{_labels(view=view)} {s.db_calls}")
+
+    out += ["# HELP api_view_db_seconds_total Time spent in DB calls per view.",
+            "# TYPE api_view_db_seconds_total counter"]
+    for view, s in views:
+        out.append(f"api_view_db_seconds_total{_labels(view=view)} {s.db_seconds:.6f}")
+
+    # one series per process under METRICS_DIR (pid label), else unlabelled
+    for key in (pools[0][1] if pools else ()):
+        if key in _POOL_COUNTERS:
+            metric = f"api_db_pool_{key.removesuffix('_total')}_total"
+            out.append(f"# TYPE {metric} counter")
+        else:
+            metric = f"api_db_pool_{key}"
+            out.append(f"# TYPE {metric} gauge")
+        for pid, stats in sorted(pools, key=lambda p: p[0] or 0):
+            labels = _labels(pid=pid) if pid is not None else ""
+            out.append(f"{metric}{labels} {stats[key]}")
+
+    return "\n".join(out) + "\n"
@@ -1,9 +1,93 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 from django.contrib.auth.models import AnonymousUser
 from api.auth import MemberBackend
+from api.tokens import read_token, token_from_request
+from api import metrics
+
+
+def _member_id(request):
+    if settings.SESSION_MODE == "signed":
+        # no django_session I/O at all: everything is in the token
+        token, via = token_from_request(request)
+        claims = read_token(token)
+        if claims is None:
+            return None
+        request.member_token = dict(claims, via=via)
+        return claims["mid"]
+    return request.session.get("member_id")
+
+
+def get_user(request):
+    """Resolve (once per request) the member behind the session."""
+    if not hasattr(request, "_cached_user"):
+        user_obj  = MemberBackend().get_user(_member_id(request))
+        request._cached_user = user_obj if user_obj else AnonymousUser()
+    return request._cached_user
+
+
+async def _amember_id(request):
+    if settings.SESSION_MODE == "signed":
+        # no MySQL, but the revocation check is a shared-cache round trip
+        return await sync_to_async(_member_id, thread_sensitive=False)(request)
+    # the row django.contrib.sessions' db backend would load, read through
+    # the async pool; request.session itself stays unloaded
+    from api import adb
+    key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not key:
+        return None
+    row = await adb.query_one(
+        "session_data",
+        "SELECT session_data, expire_date FROM django_session WHERE session_key = %s",
+        (key,),
+    )
+    if row is None or row[1] <= timezone.now():
+        return None
+    return request.session.decode(row[0]).get("member_id")
+
+
+async def aget_user(request):
+    """get_user() for the async views (api/async_views.py)."""
+    if not hasattr(request, "_cached_user"):
+        user_obj  = await MemberBackend().aget_user(await _amember_id(request))
+        request._cached_user = user_obj if user_obj else AnonymousUser()
+    return request._cached_user
+
 
 class MemberSessionMiddleware(MiddlewareMixin):
     def process_request(self, request):
-        member_id = request.session.get("member_id")
-        user_obj  = MemberBackend().get_user(member_id)
-        request.user = user_obj if user_obj else AnonymousUser()
+        # lazy: neither the session nor `members` is touched until a view
+        # actually looks at request.user
+        request.user = SimpleLazyObject(lambda: get_user(request))
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """
+    Per-view request totals for api/metrics.py.  Only installed when
+    METRICS_ENABLED is on.
+    """
+    def process_request(self, request):
+        request._metrics_token = metrics.begin_request()
+        request._metrics_start = time.perf_counter()
+        request._metrics_view  = "<unresolved>"
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        request._metrics_view = (view_class or view_func).__name__
+
+    def process_response(self, request, response):
+        token = getattr(request, "_metrics_token", None)
+        if token is not None:
+            metrics.end_request(
+                token,
+                request._metrics_view,
+                request.method,
+                response.status_code,
+                time.perf_counter() - request._metrics_start,
+            )
+        return response
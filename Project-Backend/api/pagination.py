@@ -0,0 +1,78 @@
+# api/pagination.py
+"""
+Keyset (seek) pagination for the *_page procedures.
+
+    GET /api/members?limit=100
+    GET /api/members?limit=100&cursor=<next_cursor>
+    → {"results": [...], "next_cursor": "..." | null}
+
+The cursor is the sort key of the last row served, as base64url JSON –
+opaque to clients.  A cursor that decodes to anything but strings,
+integers and nulls is a 400, never a parameter for PyMySQL.  Requests
+without limit/cursor get the full list in the old shape, so existing
+clients keep working.
+"""
+import base64
+import binascii
+import json
+
+from rest_framework import serializers
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT     = 500
+
+
+def encode_cursor(key):
+    raw = json.dumps(list(key), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _key_part(value):
+    # what encode_cursor() writes: names, ids (UUIDs as str), integers, null
+    return value is None or isinstance(value, str) or (
+        isinstance(value, int) and not isinstance(value, bool))
+
+
+def decode_cursor(cursor, size):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError):
+        key = None
+    if (not isinstance(key, list) or len(key) != size
+            or not all(_key_part(k) for k in key)):
+        raise serializers.ValidationError({"cursor": "Invalid cursor"})
+    return tuple(key)
+
+
+class PageQuerySerializer(serializers.Serializer):
+    limit  = serializers.IntegerField(min_value=1, max_value=MAX_LIMIT,
+                                      default=DEFAULT_LIMIT)
+    cursor = serializers.CharField(max_length=1024, required=False)
+
+
+def page_request(request, key_size):
+    """
+    None for an unpaginated request, else (after, limit) where *after* is
+    the decoded key (all None for the first page).
+    """
+    params = request.query_params
+    if "limit" not in params and "cursor" not in params:
+        return None
+    q = PageQuerySerializer(data=params)
+    q.is_valid(raise_exception=True)
+    cursor = q.validated_data.get("cursor")
+    after  = decode_cursor(cursor, key_size) if cursor else (None,) * key_size
+    return after, q.validated_data["limit"]
+
+
+def split_page(rows, limit, key):
+    """
+    *rows* were fetched with limit + 1.  Returns (rows of this page,
+    next_cursor or None).
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
@@ -0,0 +1,235 @@
+# api/pool.py
+"""
+Bounded PyMySQL connection pool for the stored-procedure path.
+
+Django keeps one connection per worker thread with no upper bound; under a
+threaded/ASGI server that means as many MySQL connections as threads.
+call_procedure() checks connections out of this pool instead when
+DB_POOL["SIZE"] > 0.
+
+• bounded size, callers wait up to DB_POOL["TIMEOUT"] seconds
+• connections idle longer than DB_POOL["PING_AFTER"] are pinged on checkout
+• each connection caches the CALL text per (procedure, arity), starting
+  from the statements db.load_procedures() built before fork
+• stats() feeds the /api/db-pool endpoint
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+from django.conf import settings
+
+# client-side codes meaning the socket is gone → never reuse the connection
+_DEAD_CONNECTION_CODES = {2006, 2013, 2014, 2045, 2055}
+
+
+# (name, arity) → "CALL name(%s,…)" for every procedure in the schema,
+# filled once before fork by db.load_procedures(); each new connection
+# starts from a copy
+preloaded_statements = {}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PooledConnection:
+    def __init__(self, raw):
+        self.raw        = raw
+        self.last_used  = time.monotonic()
+        self.statements = dict(preloaded_statements)   # (name, arity) → "CALL name(%s,…)"
+
+    def call_sql(self, name, arity):
+        key = (name, arity)
+        sql = self.statements.get(key)
+        if sql is None:
+            sql = f"CALL {name}({','.join(['%s'] * arity)})"
+            self.statements[key] = sql
+        return sql
+
+    def cursor(self, cursor_class=None):
+        return self.raw.cursor(cursor_class)
+
+
+class ConnectionPool:
+    def __init__(self, size, timeout, ping_after, connect_kwargs):
+        self.size           = size
+        self.timeout        = timeout
+        self.ping_after     = ping_after
+        self.connect_kwargs = connect_kwargs
+
+        self._idle    = []                 # LIFO: warmest connection first
+        self._created = 0
+        self._cond    = threading.Condition()
+
+        # metrics
+        self.waiters     = 0
+        self.checkouts   = 0
+        self.timeouts    = 0
+        self.discarded   = 0
+        self.wait_total  = 0.0             # seconds spent waiting, summed
+        self.wait_max    = 0.0
+
+    # ---------- checkout / return ---------------------------------
+    def acquire(self):
+        started = time.monotonic()
+        with self._cond:
+            self.waiters += 1
+            try:
+                while not self._idle and self._created >= self.size:
+                    remaining = self.timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout("database pool exhausted")
+                    self._cond.wait(remaining)
+
+                conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    self._created += 1     # reserve the slot, connect below
+            finally:
+                self.waiters -= 1
+
+            waited = time.monotonic() - started
+            self.checkouts  += 1
+            self.wait_total += waited
+            self.wait_max    = max(self.wait_max, waited)
+
+        if conn is not None and not self._alive(conn):
+            self._drop(conn)               # keep its slot for the new one
+            conn = None
+
+        if conn is None:
+            try:
+                conn = PooledConnection(pymysql.connect(**self.connect_kwargs))
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def release(self, conn, discard=False):
+        if discard:
+            self._drop(conn)
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            return
+        conn.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except pymysql.MySQLError as exc:
+            code = exc.args[0] if exc.args else None
+            discard = code in _DEAD_CONNECTION_CODES
+            if not discard:
+                # a SIGNAL after START TRANSACTION leaves the tx open –
+                # never hand its locks to the next caller
+                discard = not self._rollback(conn)
+            raise
+        except BaseException:
+            discard = True                 # state unknown, don't reuse
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    # ---------- helpers -------------------------------------------
+    def _alive(self, conn):
+        if time.monotonic() - conn.last_used < self.ping_after:
+            return True
+        try:
+            conn.raw.ping(reconnect=False)
+            return True
+        except pymysql.MySQLError:
+            return False
+
+    def _rollback(self, conn):
+        try:
+            conn.raw.rollback()
+            return True
+        except pymysql.MySQLError:
+            return False
+
+    def _drop(self, conn):
+        self.discarded += 1
+        try:
+            conn.raw.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for conn in idle:
+            try:
+                conn.raw.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size":          self.size,
+                "open":          self._created,
+                "idle":          len(self._idle),
+                "in_use":        self._created - len(self._idle),
+                "waiters":       self.waiters,
+                "checkouts":     self.checkouts,
+                "timeouts":      self.timeouts,
+                "discarded":     self.discarded,
+                "wait_seconds_total": round(self.wait_total, 6),
+                "wait_seconds_max":   round(self.wait_max, 6),
+            }
+
+
+# ── per-process singleton ─────────────────────────────────────
+_pool     = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def connect_kwargs():
+    db = settings.DATABASES["default"]
+    return {
+        "host":       db.get("HOST") or "127.0.0.1",
+        "port":       int(db.get("PORT") or 3306),
+        "user":       db.get("USER"),
+        "password":   db.get("PASSWORD") or "",
+        "database":   db.get("NAME"),
+        "charset":    db.get("OPTIONS", {}).get("charset", "utf8mb4"),
+        "autocommit": True,                # procedures manage their own tx
+    }
+
+
+def get_pool():
+    """
+    The pool for this process, or None when pooling is disabled.
+    Created lazily and re-created after fork – sockets must not be shared
+    between a pre-fork master and its workers.
+    """
+    global _pool, _pool_pid
+    conf = settings.DB_POOL
+    if conf["SIZE"] <= 0:
+        return None
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = ConnectionPool(
+                    size=conf["SIZE"],
+                    timeout=conf["TIMEOUT"],
+                    ping_after=conf["PING_AFTER"],
+                    connect_kwargs=connect_kwargs(),
+                )
+                _pool_pid = pid
+    return _pool
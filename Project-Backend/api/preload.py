@@ -0,0 +1,43 @@
+# api/preload.py
+"""
+Start-up work a pre-fork server does once, in the master, before any
+worker exists (gunicorn.conf.py, preload_app):
+
+• the URLconf is resolved → every view, serializer and api module is
+  imported and compiled once, shared copy-on-write by the workers
+• db.load_procedures() → the CALL text of every stored procedure
+• Django's connections are closed again, so no worker inherits a socket
+  (the DB_POOL pool is per-pid already, see api/pool.py)
+• gc.freeze() → the objects above are never touched by a worker's
+  garbage collector, which would otherwise copy their pages
+
+The workers then answer their first request without import or
+statement-building latency.
+"""
+import gc
+import logging
+
+from django.db import connections
+from django.urls import get_resolver
+
+from .db import DBError, load_procedures
+
+log = logging.getLogger(__name__)
+
+
+def preload():
+    get_resolver().reverse_dict            # imports and compiles every route
+
+    try:
+        procedures = load_procedures()
+    except DBError as exc:
+        # the database may come up after the server – statements are
+        # then built on first use, as without preloading
+        log.warning("procedure metadata not preloaded: %s", exc.msg)
+    else:
+        log.info("preloaded %d stored procedures", len(procedures))
+    finally:
+        connections.close_all()
+
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,68 @@
+# api/schedule.py
+"""
+Parsed form of a section's on_days / on_times.
+
+    on_days  "MW"          → day_mask  = M|W = 1 | 4 = 5
+    on_times "10-12"       → start_min = 600, end_min = 720
+    on_times "8:30-9:45"   → start_min = 510, end_min = 585
+
+presented_courses keeps the text as typed (it is what the pages show)
+and these three columns next to it.  Every conflict check – room,
+professor, student timetable – is then the same integer test:
+
+    (maskA & maskB) <> 0 AND startA < endB AND endA > startB
+
+add_presented_course receives the parsed values from the serializer;
+`manage.py backfill_schedule` fills rows that predate the columns.
+"""
+import re
+
+DAY_BITS = {"M": 1, "T": 2, "W": 4, "R": 8, "F": 16, "S": 32, "U": 64}
+
+_TIME  = r"(\d{1,2})(?::(\d{2}))?"
+_RANGE = re.compile(rf"^\s*{_TIME}\s*[-‐‑–—]\s*{_TIME}\s*$")
+
+
+def parse_days(on_days):
+    """'MW' → 5.  Case-insensitive; ValueError on anything but MTWRFSU."""
+    mask = 0
+    for ch in on_days.replace(" ", "").upper():
+        if ch not in DAY_BITS:
+            raise ValueError(f"unknown day {ch!r} (use {''.join(DAY_BITS)})")
+        mask |= DAY_BITS[ch]
+    if not mask:
+        raise ValueError("no days given")
+    return mask
+
+
+def _minutes(hours, minutes):
+    h, m = int(hours), int(minutes or 0)
+    if m > 59 or h > 24 or (h == 24 and m):
+        raise ValueError(f"invalid time {hours}:{minutes or '00'}")
+    return h * 60 + m
+
+
+def parse_time(text):
+    """'10' / '10:30' → minutes after midnight (search time windows)."""
+    match = re.match(rf"^\s*{_TIME}\s*$", text)
+    if not match:
+        raise ValueError("expected a time like 10 or 10:30")
+    return _minutes(match.group(1), match.group(2))
+
+
+def parse_times(on_times):
+    """'10-12' / '10:00-11:15' → (start_min, end_min), minutes after midnight."""
+    match = _RANGE.match(on_times)
+    if not match:
+        raise ValueError("expected a range like 10-12 or 10:00-11:15")
+    start = _minutes(match.group(1), match.group(2))
+    end   = _minutes(match.group(3), match.group(4))
+    if end <= start:
+        raise ValueError("end time must be after start time")
+    return start, end
+
+
+def parse(on_days, on_times):
+    """(day_mask, start_min, end_min) for add_presented_course."""
+    return (parse_days(on_days), *parse_times(on_times))
+
@@ -1,8 +1,17 @@
+import csv
+import json
+import math
+
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.hashers import check_password
-from django.db import connection
-from .db import call_procedure, DBError  
+from django.conf import settings
+from .db import (call_procedure, call_procedure_sets, query_one, DBError,
+                 procedure_transaction)
+from .cache import invalidate_member, bump_version
+from . import audit, catalog, closeout, schedule
+from .rows import (RowSpec, Column, boolean, integer, floating,
+                   date_iso, datetime_iso, decimal)
 
 class EnrollSerializer(serializers.Serializer):
     section_id = serializers.IntegerField(min_value=1)
@@ -40,6 +49,8 @@ class SignupSerializer(serializers.Serializer):
         except DBError as e:
             # map DB errors to serializer errors
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("members", "credentials")
 
         # procedure returns a single row with one column (member_id)
         return {"member_id": rows[0][0]}
@@ -49,7 +60,6 @@ class SignupSerializer(serializers.Serializer):
 # api/serializers.py
 from rest_framework import serializers
 from django.contrib.auth.hashers import check_password
-from django.db import connection
 
 class SignInSerializer(serializers.Serializer):
     username = serializers.CharField(max_length=150)
@@ -60,17 +70,16 @@ class SignInSerializer(serializers.Serializer):
         username = data["username"]
         password = data["password"]
 
-        with connection.cursor() as cur:
-            cur.execute(
-                """
-                SELECT c.member_id, m.is_admin, c.password_hash
-                FROM   credentials c
-                JOIN   members     m ON m.mid = c.member_id
-                WHERE  c.username = %s
-                """,
-                (username,),
-            )
-            row = cur.fetchone()
+        row = query_one(
+            "signin_credentials",
+            """
+            SELECT c.member_id, m.is_admin, c.password_hash
+            FROM   credentials c
+            JOIN   members     m ON m.mid = c.member_id
+            WHERE  c.username = %s
+            """,
+            (username,),
+        )
 
         if row is None or not check_password(password, row[2]):
             raise serializers.ValidationError("Invalid credentials")
@@ -105,6 +114,8 @@ class SemesterCreateSerializer(serializers.Serializer):
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("semesters")
 
         # procedure returns one row with the new UUID
         return {"sid": rows[0][0]}
@@ -125,6 +136,8 @@ class DepartmentCreateSerializer(serializers.Serializer):
         except DBError as e:
             # Stored proc raises SQLSTATE‑45000 for “name already exists”
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("departments")
 
         # procedure returns one row with did
         return {"did": rows[0][0]}
@@ -148,6 +161,8 @@ class MajorCreateSerializer(serializers.Serializer):
             # • "department_name not found"
             # • "major_name already exists"
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("majors")
 
         return {"major_id": rows[0][0]}
     
@@ -172,59 +187,37 @@ class StudentRecordCreateSerializer(serializers.Serializer):
             #  • 'Student already registered for this major'
             #  • 'No active semester defined'
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("std_records")
 
         # procedure returns record_id + entrance_sem
         return {"record_id": rows[0][0], "entrance_sem": rows[0][1]}
     
 
-class SemesterListSerializer(serializers.ListSerializer):
-    """
-    Serializer is trivial here—just map SQL tuples → dicts.
-    """
-    def to_representation(self, data):
-        # `data` is the list of tuples returned by call_procedure
-        return [
-            {
-                "sid":        row[0],
-                "start_date": row[1],
-                "end_date":   row[2],
-                "sem_title":  row[3],
-                "is_active":  bool(row[4]),
-            }
-            for row in data
-        ]
+
+SEMESTER_ROWS = RowSpec(                 # list_semesters
+    Column("sid",        0),
+    Column("start_date", 1, date_iso),
+    Column("end_date",   2, date_iso),
+    Column("sem_title",  3),
+    Column("is_active",  4, boolean),
+)
     
-class DepartmentListSerializer(serializers.ListSerializer):
-    """
-    Serializer is trivial here—just map SQL tuples → dicts.
-    """
-    def to_representation(self, data):
-        # `data` is the list of tuples returned by call_procedure
-        return [
-            {
-                "did":        row[0],
-                "department_name": row[1],
-                "department_head": row[3],
-                "location": row[2],
-                "department_head_name": row[4],
-            }
-            for row in data
-        ]
+
+DEPARTMENT_ROWS = RowSpec(               # list_departments
+    Column("did",                  0),
+    Column("department_name",      1),
+    Column("department_head",      3),
+    Column("location",             2),
+    Column("department_head_name", 4),
+)
     
-class MajorListSerializer(serializers.ListSerializer):
-    """
-    Serializer is trivial here—just map SQL tuples → dicts.
-    """
-    def to_representation(self, data):
-        # `data` is the list of tuples returned by call_procedure
-        return [
-            {
-                "major_id":        row[0],
-                "major_name": row[1],
-                "department_name": row[2],
-            }
-            for row in data
-        ]
+
+MAJOR_ROWS = RowSpec(                    # list_majors
+    Column("major_id",        0),
+    Column("major_name",      1),
+    Column("department_name", 2),
+)
     
 
 class StaffRoleCreateSerializer(serializers.Serializer):
@@ -255,6 +248,8 @@ class StaffRoleCreateSerializer(serializers.Serializer):
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("workers")
 
         return {
             "staff_id":       rows[0][0],
@@ -276,6 +271,8 @@ class StaffPromoteSerializer(serializers.Serializer):
         except DBError as e:
             # • 'No member with that national_id'
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("staffs")
 
         return {"staff_id": rows[0][0]}     # the UUID returned by procedure
     
@@ -297,6 +294,8 @@ class CourseCreateSerializer(serializers.Serializer):
         except DBError as e:
             # 'course_code already exists'  or  'course_name already exists'
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("courses")
 
         return {"cid": rows[0][0]}
 class PresentedCourseCreateSerializer(serializers.Serializer):
@@ -312,6 +311,17 @@ class PresentedCourseCreateSerializer(serializers.Serializer):
     def validate(self, data):
         if data["capacity"] > data["max_capacity"]:
             raise serializers.ValidationError("capacity cannot exceed max_capacity")
+        errors = {}
+        try:
+            data["day_mask"] = schedule.parse_days(data["on_days"])
+        except ValueError as e:
+            errors["on_days"] = [str(e)]
+        try:
+            data["start_min"], data["end_min"] = schedule.parse_times(data["on_times"])
+        except ValueError as e:
+            errors["on_times"] = [str(e)]
+        if errors:
+            raise serializers.ValidationError(errors)
         return data
 
     def create(self, validated):
@@ -326,11 +336,16 @@ class PresentedCourseCreateSerializer(serializers.Serializer):
                     validated["max_capacity"],
                     validated["on_days"],
                     validated["on_times"],
+                    validated["day_mask"],
+                    validated["start_min"],
+                    validated["end_min"],
                     validated.get("room_label"),
                 ),
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("presented_courses")
 
         return {"pcid": rows[0][0]}
     
@@ -348,6 +363,8 @@ class RoomCreateSerializer(serializers.Serializer):
         except DBError as e:
             # 45000 messages: 'capacity must be > 0', 'room_label already exists'
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("rooms")
 
         return {"rid": rows[0][0]}
     
@@ -361,24 +378,35 @@ class StudentSemesterCreateSerializer(serializers.Serializer):
         except DBError as e:
             # 'No active semester' or 'Student semester already exists'
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("student_semesters")
 
         return {
             "record_id":   validated["record_id"],
             "semester_id": rows[0][0],
         }   
 
-class StudentRecordItemSerializer(serializers.Serializer):
-    record_id     = serializers.CharField()
-    entrance_sem  = serializers.CharField()
-    gpa           = serializers.DecimalField(max_digits=5, decimal_places=2,
-                                             allow_null=True)
-    major_id      = serializers.CharField()
-    major_name    = serializers.CharField()
+
+STUDENT_RECORD_ROWS = RowSpec(           # list_student_records
+    Column("record_id",    0),
+    Column("entrance_sem", 1),
+    Column("gpa",          2, decimal(5, 2)),
+    Column("major_id",     3),
+    Column("major_name",   4),
+)
 
 
 
 VALID_ROLES = ["INSTRUCTOR", "CLERK", "CHAIR", "ADMIN", "PROF"]
 
+STAFF_ROWS = RowSpec(                    # list_staff_by_role
+    Column("staff_id",        0),
+    Column("fname",           1),
+    Column("lname",           2),
+    Column("role",            3),
+    Column("department_name", 4),
+)
+
 class StaffByRoleQuerySerializer(serializers.Serializer):
     role = serializers.ChoiceField(choices=VALID_ROLES)
 
@@ -390,22 +418,26 @@ class StaffByRoleQuerySerializer(serializers.Serializer):
             # Only 'Invalid staff_role' possible here, already filtered by ChoiceField
             raise serializers.ValidationError({"detail": e.msg})
 
-        # rows: (staff_id, fname, lname, role, department_name)
-        return [
-            {
-                "staff_id": row[0],
-                "fname":    row[1],
-                "lname":    row[2],
-                "role":     row[3],
-                "department_name": row[4],
-            }
-            for row in rows
-        ]
+        return STAFF_ROWS.dicts(rows)
     
-class CourseItemSerializer(serializers.Serializer):
-    cid         = serializers.CharField()
-    course_code = serializers.CharField()
-    course_name = serializers.CharField()
+
+COURSE_ROWS = RowSpec(                   # list_courses / list_courses_page
+    Column("cid",         0),
+    Column("course_code", 1),
+    Column("course_name", 2),
+)
+
+PRESENTED_COURSE_ROWS = RowSpec(         # list_presented_courses
+    Column("pcid",         0),
+    Column("course_code",  1),
+    Column("course_name",  2),
+    Column("professor",    3),
+    Column("on_days",      4),
+    Column("on_times",     5),
+    Column("room",         6),
+    Column("capacity",     7),
+    Column("max_capacity", 8),
+)
 
 class PresentedCourseListQuerySerializer(serializers.Serializer):
     semester_id = serializers.CharField(max_length=36)
@@ -423,21 +455,61 @@ class PresentedCourseListQuerySerializer(serializers.Serializer):
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
 
-        return [
-            {
-                "pcid":          r[0],
-                "course_code":   r[1],
-                "course_name":   r[2],
-                "professor":     r[3],
-                "on_days":       r[4],
-                "on_times":      r[5],
-                "room":          r[6],
-                "capacity":      r[7],
-                "max_capacity":  r[8],
-            }
-            for r in rows
-        ]
+        return PRESENTED_COURSE_ROWS.dicts(rows)
     
+
+class PresentedCourseSearchSerializer(serializers.Serializer):
+    """Query string of GET /api/presented-courses/search (api/catalog.py)."""
+    semester_id = serializers.CharField(max_length=36)
+    major_id    = serializers.CharField(max_length=36, required=False)
+    days        = serializers.CharField(max_length=7, required=False)    # "MW"
+    after       = serializers.CharField(max_length=5, required=False)    # "10", "9:30"
+    before      = serializers.CharField(max_length=5, required=False)
+    prof_id     = serializers.CharField(max_length=36, required=False)
+    professor   = serializers.CharField(max_length=100, required=False)
+    q           = serializers.CharField(max_length=100, required=False)
+    open        = serializers.BooleanField(required=False, default=False)
+    limit       = serializers.IntegerField(min_value=1, max_value=500, required=False)
+
+    def validate_days(self, value):
+        try:
+            return schedule.parse_days(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+    def validate_after(self, value):
+        try:
+            return schedule.parse_time(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+    validate_before = validate_after
+
+    def fetch(self):
+        v = self.validated_data
+        try:
+            cat = catalog.get_catalog(v["semester_id"])
+        except DBError as e:
+            raise serializers.ValidationError({"detail": e.msg})
+        if "major_id" in v and not cat.knows_major(v["major_id"]):
+            raise serializers.ValidationError({"detail": "major_id not found"})
+
+        return cat.search(
+            days=v.get("days"),
+            after=v.get("after"),
+            before=v.get("before"),
+            prof_id=v.get("prof_id"),
+            professor=v.get("professor"),
+            q=v.get("q"),
+            major_id=v.get("major_id"),
+            open_only=v["open"],
+            limit=v.get("limit"),
+        )
+
+def _gpa_tables(status):
+    # a seat taken as COMPLETED is graded, so it moves std_records.gpa too
+    return ("std_records",) if status == "COMPLETED" else ()
+
 class TakenCourseCreateSerializer(serializers.Serializer):
     record_id   = serializers.CharField(max_length=36)
     semester_id = serializers.CharField(max_length=36)
@@ -460,6 +532,8 @@ class TakenCourseCreateSerializer(serializers.Serializer):
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("taken_courses", *_gpa_tables(validated["status"]))
         return validated
     
 class TakenCourseDeleteSerializer(serializers.Serializer):
@@ -479,37 +553,143 @@ class TakenCourseDeleteSerializer(serializers.Serializer):
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("taken_courses")
         return validated
 
-class MemberItemSerializer(serializers.Serializer):
-    mid          = serializers.CharField()
-    is_admin     = serializers.BooleanField()
-    fname        = serializers.CharField()
-    lname        = serializers.CharField()
-    national_id  = serializers.CharField()
-    birthday     = serializers.DateField()
-    username     = serializers.CharField(allow_null=True)
-    last_login   = serializers.DateTimeField(allow_null=True)
+class TakenCourseBatchSerializer(serializers.Serializer):
+    """
+    Many adds/drops for one record + semester in a single transaction.
 
+    • all_or_nothing → the first failure rolls everything back
+    • best_effort    → a failing item is undone via its savepoint, the
+                       rest commit
 
-class SectionStudentItemSerializer(serializers.Serializer):
-    student_number = serializers.CharField()
-    record_id      = serializers.CharField()
-    fname          = serializers.CharField()
-    lname          = serializers.CharField()
-    status         = serializers.CharField()
-    grade          = serializers.DecimalField(max_digits=3, decimal_places=1, allow_null=True)
-
-class MySectionItemSerializer(serializers.Serializer):
-    pcid         = serializers.CharField()
-    course_code  = serializers.CharField()
-    course_name  = serializers.CharField()
-    sem_title    = serializers.CharField()
-    on_days      = serializers.CharField()
-    on_times     = serializers.CharField()
-    room         = serializers.CharField()
-    capacity     = serializers.IntegerField()
-    max_capacity = serializers.IntegerField()
+    Drops run first so they free seats for the adds; adds run in pcid
+    order so concurrent batches lock sections in the same order.
+    """
+    MAX_ITEMS = 50
+
+    record_id   = serializers.CharField(max_length=36)
+    semester_id = serializers.CharField(max_length=36)
+    add         = serializers.ListField(
+        child=serializers.CharField(max_length=36),
+        required=False, default=list, max_length=MAX_ITEMS,
+    )
+    drop        = serializers.ListField(
+        child=serializers.CharField(max_length=36),
+        required=False, default=list, max_length=MAX_ITEMS,
+    )
+    status      = serializers.ChoiceField(
+        choices=["RESERVED", "TAKING", "COMPLETED"],
+        default="RESERVED"
+    )
+    mode        = serializers.ChoiceField(
+        choices=["all_or_nothing", "best_effort"],
+        default="all_or_nothing"
+    )
+
+    def validate(self, attrs):
+        add  = sorted(set(attrs["add"]))
+        drop = sorted(set(attrs["drop"]))
+        if not add and not drop:
+            raise serializers.ValidationError("Nothing to add or drop")
+        if len(add) + len(drop) > self.MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_ITEMS} items per batch")
+        both = set(add) & set(drop)
+        if both:
+            raise serializers.ValidationError(
+                {"detail": f"pcid in both add and drop: {', '.join(sorted(both))}"})
+        attrs["add"], attrs["drop"] = add, drop
+        return attrs
+
+    def _items(self, v):
+        for pcid in v["drop"]:
+            yield "drop", pcid, "drop_reserved_seat", (
+                v["record_id"], v["semester_id"], pcid)
+        for pcid in v["add"]:
+            yield "add", pcid, "take_seat", (
+                v["record_id"], v["semester_id"], pcid, v["status"])
+
+    def save(self):
+        """
+        Returns (committed, results, first_error).  results has one entry
+        per item in execution order.
+        """
+        v           = self.validated_data
+        atomic      = v["mode"] == "all_or_nothing"
+        items       = list(self._items(v))
+        results     = []
+        first_error = None
+
+        try:
+            with procedure_transaction() as tx:
+                for op, pcid, proc, params in items:
+                    if not atomic:
+                        tx.savepoint("batch_item")
+                    try:
+                        tx.call(proc, params)
+                    except DBError as e:
+                        results.append({"op": op, "pcid": pcid, "ok": False,
+                                        "status": e.status, "detail": e.msg})
+                        if atomic:
+                            raise
+                        first_error = first_error or e
+                        tx.rollback_to("batch_item")
+                    else:
+                        results.append({"op": op, "pcid": pcid, "ok": True})
+        except DBError as e:
+            first_error = first_error or e
+            if not atomic or not results or results[-1]["ok"]:
+                raise      # START/COMMIT/savepoint failed, not an item
+            for op, pcid, _, _ in items[len(results):]:
+                results.append({"op": op, "pcid": pcid, "ok": False,
+                                "detail": "not attempted"})
+            for r in results:
+                if r["ok"]:
+                    r["ok"], r["detail"] = False, "rolled back"
+            return False, results, first_error
+        finally:
+            bump_version("taken_courses", *_gpa_tables(v["status"]))
+
+        return True, results, first_error
+
+
+MEMBER_ROWS = RowSpec(                   # list_members / list_members_page
+    Column("mid",         0),
+    Column("is_admin",    1, boolean),
+    Column("fname",       2),
+    Column("lname",       3),
+    Column("national_id", 4),
+    Column("birthday",    5, date_iso),
+    Column("username",    6),
+    Column("last_login",  7, datetime_iso),
+)
+
+
+
+SECTION_STUDENT_ROWS = RowSpec(          # list_students_in_section[_page]
+    Column("student_number", 0),
+    Column("record_id",      1),
+    Column("fname",          2),
+    Column("lname",          3),
+    Column("status",         4),
+    Column("grade",          5, decimal(3, 1)),
+)
+
+
+MY_SECTION_ROWS = RowSpec(               # list_sections_by_prof
+    Column("pcid",         0),
+    Column("course_code",  1),
+    Column("course_name",  2),
+    Column("sem_title",    3),
+    Column("on_days",      4),
+    Column("on_times",     5),
+    Column("room",         6),
+    Column("capacity",     7, integer),
+    Column("max_capacity", 8, integer),
+)
 class GradeUpdateSerializer(serializers.Serializer):
     record_id = serializers.CharField(max_length=36)
     pcid      = serializers.CharField(max_length=36)
@@ -519,43 +699,160 @@ class GradeUpdateSerializer(serializers.Serializer):
     def save(self, professor_id):
         vals = self.validated_data
         try:
-            call_procedure(
+            changes = call_procedure(
                 "set_student_grade_tx",
                 (
                     professor_id,
                     vals["record_id"],
                     vals["pcid"],
                     vals["grade"],
+                    audit.in_transaction(),
                 ),
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("taken_courses", "std_records")
+        audit.record(professor_id, changes)
         return vals
 
-class RecordCourseItemSerializer(serializers.Serializer):
-    pcid         = serializers.CharField()
-    course_code  = serializers.CharField()
-    course_name  = serializers.CharField()
-    status       = serializers.CharField()
-    grade        = serializers.DecimalField(max_digits=3, decimal_places=1,
-                                            allow_null=True)
-    professor    = serializers.CharField()
-    on_days      = serializers.CharField()
-    on_times     = serializers.CharField()
-    room         = serializers.CharField()
 
 
+class SectionGradeItemSerializer(serializers.Serializer):
+    record_id = serializers.CharField(max_length=36)
+    grade     = serializers.DecimalField(max_digits=3, decimal_places=1,
+                                         min_value=0, max_value=20)
+
+
+class SectionGradesSerializer(serializers.Serializer):
+    """
+    Many grades for ONE section in a single set_section_grades_tx call.
+
+    Rows are validated one by one: a bad row (or a student not enrolled
+    in the section) is reported back instead of failing the upload.
+    """
+    MAX_ROWS = 2000
+
+    grades = serializers.ListField(child=serializers.DictField(),
+                                   allow_empty=False, max_length=MAX_ROWS)
+
+    @staticmethod
+    def rows_from_csv(text):
+        """CSV with a  record_id,grade  header → list of dicts."""
+        lines = text.lstrip("\ufeff").splitlines()
+        return [
+            {k.strip(): (v or "").strip() for k, v in row.items() if k}
+            for row in csv.DictReader(lines)
+        ]
+
+    def validate_grades(self, items):
+        self.failures = []
+        valid, seen   = [], set()
+        for n, item in enumerate(items, start=1):
+            ser = SectionGradeItemSerializer(data=item)
+            if not ser.is_valid():
+                self.failures.append({"row": n, "record_id": item.get("record_id"),
+                                      "errors": ser.errors})
+                continue
+            record_id = ser.validated_data["record_id"]
+            if record_id in seen:
+                self.failures.append({"row": n, "record_id": record_id,
+                                      "errors": {"record_id": ["duplicate row"]}})
+                continue
+            seen.add(record_id)
+            valid.append((n, ser.validated_data))
+        return valid
+
+    def save(self, pcid, prof_id, actor_id):
+        """
+        prof_id=None skips the "teaches this section" check (admins).
+        Returns {"pcid", "applied", "failed": [...]}.
+        """
+        valid    = self.validated_data["grades"]
+        failures = list(self.failures)
+        applied  = 0
+        if valid:
+            payload = json.dumps([
+                {"record_id": v["record_id"], "grade": float(v["grade"])}
+                for _, v in valid
+            ])
+            try:
+                rows, changes = call_procedure_sets(
+                    "set_section_grades_tx",
+                    (prof_id, actor_id, pcid, payload, audit.in_transaction()))
+            except DBError as e:
+                raise serializers.ValidationError({"detail": e.msg})
+            finally:
+                bump_version("taken_courses", "std_records", "presented_courses")
+            audit.record(actor_id, changes)
+
+            ok = {r[0].lower() for r in rows if r[1]}
+            for n, v in valid:
+                if v["record_id"].lower() in ok:
+                    applied += 1
+                else:
+                    failures.append({"row": n, "record_id": v["record_id"],
+                                     "errors": {"detail": ["student not enrolled in this section"]}})
+            failures.sort(key=lambda f: f["row"])
+        return {"pcid": pcid, "applied": applied, "failed": failures}
+
+RECORD_COURSE_ROWS = RowSpec(            # list_record_courses
+    Column("pcid",        0),
+    Column("course_code", 1),
+    Column("course_name", 2),
+    Column("status",      3),
+    Column("grade",       4, decimal(3, 1)),
+    Column("professor",   5),
+    Column("on_days",     6),
+    Column("on_times",    7),
+    Column("room",        8),
+)
+
+
+def compute_semester_gpa(sid, chunk=None):
+    """
+    Fill student_semesters.sem_gpa for semester *sid*, chunk records per
+    transaction.  Returns the number of rows visited.
+    """
+    try:
+        rows = call_procedure("compute_semester_gpa",
+                              (sid, chunk or settings.SEMESTER_GPA_CHUNK))
+    except DBError as e:
+        raise serializers.ValidationError({"detail": e.msg})
+    finally:
+        bump_version("student_semesters")
+    return rows[0][0]
+
+class SemesterGPASerializer(serializers.Serializer):
+    sid   = serializers.CharField(max_length=36)
+    chunk = serializers.IntegerField(min_value=1, max_value=10000, required=False)
+
+    def save(self):
+        v = self.validated_data
+        return compute_semester_gpa(v["sid"], v.get("chunk"))
+
+CLOSEOUT_ROWS = RowSpec(                 # get_semester_closeout
+    Column("sid",            0),
+    Column("state",          1),
+    Column("total_sections", 2, integer),
+    Column("done_sections",  3, integer),
+    Column("end_date",       4, date_iso),
+    Column("error",          5),
+    Column("started_at",     6, datetime_iso),
+    Column("updated_at",     7, datetime_iso),
+    Column("finished_at",    8, datetime_iso),
+)
+
 class SemesterDeactivateSerializer(serializers.Serializer):
     sid = serializers.CharField(max_length=36)
 
     def save(self):
+        """Starts (or resumes) the chunked close-out; returns its status row."""
         sid = self.validated_data["sid"]
         try:
-            call_procedure("deactivate_semester", (sid,))
+            return closeout.start(sid)
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
-
-        return sid
     
 class StatusUpdateSerializer(serializers.Serializer):
     record_id = serializers.CharField(max_length=36)
@@ -576,12 +873,16 @@ class StatusUpdateSerializer(serializers.Serializer):
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("taken_courses")
         return vals
     
-class RoomItemSerializer(serializers.Serializer):
-    rid         = serializers.CharField()
-    room_label  = serializers.CharField()
-    capacity    = serializers.IntegerField()
+
+ROOM_ROWS = RowSpec(                     # list_rooms / list_rooms_page
+    Column("rid",        0),
+    Column("room_label", 1),
+    Column("capacity",   2, integer),
+)
 
 
 ROLE_CHOICES = ["INSTRUCTOR","CLERK","CHAIR","ADMIN","PROF","HEAD"]
@@ -613,6 +914,8 @@ class StaffRoleUpdateSerializer(serializers.Serializer):
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("workers")
 
         return {
             "staff_id":      rows[0][0],
@@ -632,32 +935,77 @@ class MyProfileSerializer(serializers.Serializer):
     username     = serializers.CharField(allow_null=True)
     last_login   = serializers.DateTimeField(allow_null=True)
 
+    @classmethod
+    def from_row(cls, row):
+        """Over a get_member_profile row."""
+        return cls({
+            "mid":         row[0],
+            "fname":       row[1],
+            "lname":       row[2],
+            "national_id": row[3],
+            "birthday":    row[4],
+            "is_admin":    bool(row[5]),
+            "username":    row[6],
+            "last_login":  row[7],
+        })
+
+
 
-class StudentSemesterItemSerializer(serializers.Serializer):
-    semester_id = serializers.CharField()
-    sem_status  = serializers.CharField()
-    sem_gpa     = serializers.FloatField(allow_null=True)
+STUDENT_SEMESTER_ROWS = RowSpec(         # list_student_semesters
+    Column("semester_id", 0),
+    Column("sem_status",  1),
+    Column("sem_gpa",     2, floating),
+)
+
+
+TERM_GPA_ROWS = RowSpec(                 # list_term_gpa
+    Column("semester_id", 0),
+    Column("sem_title",   1),
+    Column("start_date",  2, date_iso),
+    Column("end_date",    3, date_iso),
+    Column("sem_status",  4),
+    Column("sem_gpa",     5, floating),
+)
+
+
+class EnrollmentTicketQuerySerializer(serializers.Serializer):
+    """?wait= of GET /api/enrollment-tickets/<ticket>, in seconds."""
+    wait = serializers.FloatField(required=False, default=0, min_value=0)
+
+    def validate_wait(self, value):
+        # NaN passes min_value / max_value and would never reach a deadline
+        if not math.isfinite(value):
+            raise serializers.ValidationError("wait must be a finite number")
+        return min(value, settings.ENROLLMENT_QUEUE["MAX_WAIT"])
 
 
 class TakenCourseQuerySerializer(serializers.Serializer):
     semester_id = serializers.CharField(max_length=36, required=False)
     member_mid  = serializers.CharField(max_length=36, required=False)
 
-class TakenCourseItemSerializer(serializers.Serializer):
-    record_id    = serializers.CharField()
-    semester_id  = serializers.CharField()
-    pcid         = serializers.CharField()
-    course_code  = serializers.CharField()
-    course_name  = serializers.CharField()
-    status       = serializers.CharField()
-    grade        = serializers.FloatField(allow_null=True)
 
-    professor    = serializers.CharField()
-    on_days      = serializers.CharField()
-    on_times     = serializers.CharField()
-    room         = serializers.CharField()
+TAKEN_COURSE_ROWS = RowSpec(             # list_taken_courses
+    Column("record_id",   0),
+    Column("semester_id", 1),
+    Column("pcid",        2),
+    Column("course_code", 3),
+    Column("course_name", 4),
+    Column("status",      5),
+    Column("grade",       6, floating),
+    Column("professor",   7),
+    Column("on_days",     8),
+    Column("on_times",    9),
+    Column("room",        10),
+)
 
     
+class ExportQuerySerializer(serializers.Serializer):
+    # "format" is DRF's renderer override, hence "fmt"
+    fmt = serializers.ChoiceField(choices=["csv", "ndjson"], default="csv")
+
+class TranscriptExportQuerySerializer(ExportQuerySerializer, TakenCourseQuerySerializer):
+    pass
+
 class RecordGPAQuerySerializer(serializers.Serializer):
     record_id = serializers.CharField(max_length=36)
 
@@ -686,6 +1034,7 @@ class ProfileUpdateSerializer(serializers.Serializer):
 
     def save(self, member_mid):
         row = self._call_proc(member_mid)
+        invalidate_member(member_mid)     # fname/lname are cached identity
         return {
             "mid":      row[0],
             "fname":    row[1],
@@ -710,27 +1059,35 @@ class ProfileUpdateSerializer(serializers.Serializer):
             )
         except DBError as e:
             raise serializers.ValidationError({"detail": e.msg})
+        finally:
+            bump_version("members", "credentials")
         return rows[0]
     
-class ProfessorLoadItemSerializer(serializers.Serializer):
-    prof_mid     = serializers.CharField()
-    fname        = serializers.CharField()
-    lname        = serializers.CharField()
-    department   = serializers.CharField()
-    course_load  = serializers.IntegerField()
+
+PROFESSOR_LOAD_ROWS = RowSpec(           # list_professor_course_load
+    Column("prof_mid",    0),
+    Column("fname",       1),
+    Column("lname",       2),
+    Column("department",  3),
+    Column("course_load", 4, integer),
+)
 
 class LowEnrollQuerySerializer(serializers.Serializer):
     threshold = serializers.IntegerField(min_value=0, required=False)
 
-class LowEnrollItemSerializer(serializers.Serializer):
-    pcid          = serializers.CharField()
-    course_code   = serializers.CharField()
-    course_name   = serializers.CharField()
-    semester      = serializers.CharField()
-    max_capacity  = serializers.IntegerField()
-    enrolled_cnt  = serializers.IntegerField()
-
-class MajorGPAItemSerializer(serializers.Serializer):
-    major_id   = serializers.CharField()
-    major_name = serializers.CharField()
-    avg_gpa    = serializers.FloatField(allow_null=True)
\ No newline at end of file
+
+LOW_ENROLL_ROWS = RowSpec(               # list_low_enrolment_courses
+    Column("pcid",         0),
+    Column("course_code",  1),
+    Column("course_name",  2),
+    Column("semester",     3),
+    Column("max_capacity", 4, integer),
+    Column("enrolled_cnt", 5, integer),
+)
+
+
+MAJOR_GPA_ROWS = RowSpec(                # vw_major_avg_gpa
+    Column("major_id",   0),
+    Column("major_name", 1),
+    Column("avg_gpa",    2, floating),
+)
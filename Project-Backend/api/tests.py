@@ -1,3 +1,347 @@
-from django.test import TestCase
+# api/tests.py
+"""
+Unit tests for the pure-Python parts of the API – no MySQL needed:
 
-# Create your tests here.
+    python manage.py test api
+"""
+import base64
+import datetime
+import decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from . import cache as api_cache, schedule
+from .catalog import SemesterCatalog
+from .conditional import _matches
+from .pagination import decode_cursor, encode_cursor, page_request, DEFAULT_LIMIT
+from .serializers import (MEMBER_ROWS, ROOM_ROWS, SECTION_STUDENT_ROWS, SEMESTER_ROWS,
+                          STUDENT_SEMESTER_ROWS, TAKEN_COURSE_ROWS)
+from .tokens import issue_token, read_token, revoke_token
+
+
+# ---- api/cache.py ---------------------------------------------------
+class LocalCacheTests(SimpleTestCase):
+    def test_lru_eviction(self):
+        lc = api_cache.LocalCache(maxsize=2, ttl=60)
+        lc.set("a", 1)
+        lc.set("b", 2)
+        lc.get("a")                    # "b" is now the least recently used
+        lc.set("c", 3)
+        self.assertEqual((lc.get("a"), lc.get("b"), lc.get("c")), (1, None, 3))
+
+    def test_ttl(self):
+        lc = api_cache.LocalCache(maxsize=2, ttl=5)
+        with mock.patch.object(api_cache.time, "monotonic", return_value=100.0):
+            lc.set("a", 1)
+        with mock.patch.object(api_cache.time, "monotonic", return_value=104.0):
+            self.assertEqual(lc.get("a"), 1)
+        with mock.patch.object(api_cache.time, "monotonic", return_value=106.0):
+            self.assertIsNone(lc.get("a"))
+            self.assertEqual(lc.get("a", "gone"), "gone")
+
+    def test_delete_and_clear(self):
+        lc = api_cache.LocalCache()
+        lc.set("a", 1)
+        lc.set("b", 2)
+        lc.delete("a")
+        self.assertIsNone(lc.get("a"))
+        lc.clear()
+        self.assertIsNone(lc.get("b"))
+
+
+# ---- api/tokens.py --------------------------------------------------
+class TokenTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_issue_and_read(self):
+        claims = read_token(issue_token("m1", True))
+        self.assertEqual((claims["mid"], claims["adm"]), ("m1", True))
+
+    def test_rejects_tampered_and_empty(self):
+        token = issue_token("m1", False)
+        self.assertIsNone(read_token(token[:-2] + "xx"))
+        self.assertIsNone(read_token(""))
+        self.assertIsNone(read_token(None))
+
+    def test_expired(self):
+        token = issue_token("m1", False)
+        with override_settings(SIGNED_SESSION_MAX_AGE=-1):
+            self.assertIsNone(read_token(token))
+
+    def test_revoked(self):
+        token  = issue_token("m1", False)
+        claims = read_token(token)
+        revoke_token(claims)
+        self.assertIsNone(read_token(token))
+        self.assertIsNotNone(read_token(issue_token("m1", False)))
+
+
+# ---- api/conditional.py ---------------------------------------------
+class IfNoneMatchTests(SimpleTestCase):
+    etag = '"abc"'
+
+    def test_matches(self):
+        for header in ('"abc"', 'W/"abc"', '"x", "abc"', ' "x" ,W/"abc" ', "*"):
+            with self.subTest(header=header):
+                self.assertTrue(_matches(header, self.etag))
+
+    def test_no_match(self):
+        for header in (None, "", '"abd"', '"x", "y"', "abc"):
+            with self.subTest(header=header):
+                self.assertFalse(_matches(header, self.etag))
+
+
+# ---- api/pagination.py ----------------------------------------------
+def _raw_cursor(text):
+    return base64.urlsafe_b64encode(text.encode()).rstrip(b"=").decode()
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        key = ("Smith", "Ann", "0b7c6c1e-0000-4000-8000-000000000001")
+        self.assertEqual(decode_cursor(encode_cursor(key), 3), key)
+
+    def test_round_trip_int_and_null(self):
+        self.assertEqual(decode_cursor(encode_cursor((7, None)), 2), (7, None))
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(("??>>", "ü"))
+        self.assertNotIn("=", cursor)
+        self.assertNotIn("+", cursor)
+        self.assertNotIn("/", cursor)
+
+    def test_rejects_bad_cursors(self):
+        bad = [
+            "not base64!",
+            _raw_cursor("not json"),
+            _raw_cursor('{"a": 1}'),          # not a list
+            _raw_cursor('["a", "b"]'),        # wrong size
+            _raw_cursor('[{"a": 1}]'),        # would reach PyMySQL as a dict
+            _raw_cursor("[[1]]"),
+            _raw_cursor("[true]"),
+            _raw_cursor("[1.5]"),
+        ]
+        for cursor in bad:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(serializers.ValidationError):
+                    decode_cursor(cursor, 1)
+
+    def _page(self, query):
+        return page_request(Request(APIRequestFactory().get("/api/rooms", query)), 1)
+
+    def test_page_request(self):
+        self.assertIsNone(self._page({}))
+        self.assertEqual(self._page({"limit": "10"}), ((None,), 10))
+        self.assertEqual(self._page({"cursor": encode_cursor(("A-101",))}),
+                         (("A-101",), DEFAULT_LIMIT))
+
+    def test_page_request_rejects_bad_input(self):
+        for query in ({"limit": "0"}, {"limit": "501"}, {"cursor": _raw_cursor("[1, 2]")}):
+            with self.subTest(query=query):
+                with self.assertRaises(serializers.ValidationError):
+                    self._page(query)
+
+
+# ---- api/rows.py: the bytes the replaced serializers produced -------
+# the item serializers as they were before the row specs
+class MemberItemSerializer(serializers.Serializer):
+    mid          = serializers.CharField()
+    is_admin     = serializers.BooleanField()
+    fname        = serializers.CharField()
+    lname        = serializers.CharField()
+    national_id  = serializers.CharField()
+    birthday     = serializers.DateField()
+    username     = serializers.CharField(allow_null=True)
+    last_login   = serializers.DateTimeField(allow_null=True)
+
+
+class SectionStudentItemSerializer(serializers.Serializer):
+    student_number = serializers.CharField()
+    record_id      = serializers.CharField()
+    fname          = serializers.CharField()
+    lname          = serializers.CharField()
+    status         = serializers.CharField()
+    grade          = serializers.DecimalField(max_digits=3, decimal_places=1, allow_null=True)
+
+
+class RoomItemSerializer(serializers.Serializer):
+    rid         = serializers.CharField()
+    room_label  = serializers.CharField()
+    capacity    = serializers.IntegerField()
+
+
+class StudentSemesterItemSerializer(serializers.Serializer):
+    semester_id = serializers.CharField()
+    sem_status  = serializers.CharField()
+    sem_gpa     = serializers.FloatField(allow_null=True)
+
+
+class TakenCourseItemSerializer(serializers.Serializer):
+    record_id    = serializers.CharField()
+    semester_id  = serializers.CharField()
+    pcid         = serializers.CharField()
+    course_code  = serializers.CharField()
+    course_name  = serializers.CharField()
+    status       = serializers.CharField()
+    grade        = serializers.FloatField(allow_null=True)
+    professor    = serializers.CharField()
+    on_days      = serializers.CharField()
+    on_times     = serializers.CharField()
+    room         = serializers.CharField()
+
+
+def _old_body(serializer, rows):
+    """Response(Serializer(dicts, many=True).data) as the views rendered it."""
+    names = list(serializer().fields)
+    dicts = [dict(zip(names, r)) for r in rows]
+    return JSONRenderer().render(serializer(dicts, many=True).data)
+
+
+class RowSpecTests(SimpleTestCase):
+    def test_members(self):
+        rows = [
+            ("m1", 1, "Ann", "Smith", "X1", datetime.date(2001, 2, 3), "ann",
+             datetime.datetime(2025, 1, 2, 3, 4, 5, 678000)),
+            ("m2", 0, "Zoë", "Jones", "X2", datetime.date(1999, 12, 31), None, None),
+        ]
+        # the old view coerced is_admin with bool() before the serializer
+        old = JSONRenderer().render(MemberItemSerializer(
+            [dict(zip(MemberItemSerializer().fields, r), is_admin=bool(r[1])) for r in rows],
+            many=True).data)
+        self.assertEqual(MEMBER_ROWS.json(rows), old)
+
+    def test_section_students(self):
+        rows = [
+            ("S1", "r1", "Ann", "Smith", "PASSED", decimal.Decimal("17.5")),
+            ("S2", "r2", "Bob", "Jones", "PASSED", decimal.Decimal("9")),
+            ("S3", "r3", "Cy",  "Lee",   "TAKING", None),
+        ]
+        self.assertEqual(SECTION_STUDENT_ROWS.json(rows),
+                         _old_body(SectionStudentItemSerializer, rows))
+
+    def test_rooms(self):
+        rows = [("r1", "A-101", 30), ("r2", "Hörsaal 1", 250)]
+        self.assertEqual(ROOM_ROWS.json(rows), _old_body(RoomItemSerializer, rows))
+
+    def test_student_semesters(self):
+        rows = [("s1", "PASSED", decimal.Decimal("16.25")), ("s2", "ACTIVE", None)]
+        self.assertEqual(STUDENT_SEMESTER_ROWS.json(rows),
+                         _old_body(StudentSemesterItemSerializer, rows))
+
+    def test_taken_courses(self):
+        rows = [("r1", "s1", "p1", "CS101", "Data Structures", "PASSED",
+                 decimal.Decimal("18.5"), "Ann Smith", "MW", "10-12", "A-101"),
+                ("r1", "s1", "p2", "CS201", "Algorithms", "TAKING",
+                 None, "Bob Jones", "TR", "8-9:15", "B-2")]
+        self.assertEqual(TAKEN_COURSE_ROWS.json(rows),
+                         _old_body(TakenCourseItemSerializer, rows))
+
+    def test_semesters(self):
+        # formerly SemesterListSerializer: raw dates through DRF's encoder
+        rows = [("s1", datetime.date(2025, 9, 1), datetime.date(2026, 1, 31), "2025-Fall", 1)]
+        old = JSONRenderer().render([
+            {"sid": r[0], "start_date": r[1], "end_date": r[2],
+             "sem_title": r[3], "is_active": bool(r[4])}
+            for r in rows
+        ])
+        self.assertEqual(SEMESTER_ROWS.json(rows), old)
+
+    def test_paged_response(self):
+        rows = [("r1", "A-101", 30)]
+        old  = JSONRenderer().render({
+            "results": RoomItemSerializer(
+                [dict(zip(RoomItemSerializer().fields, r)) for r in rows], many=True).data,
+            "next_cursor": "abc",
+        })
+        self.assertEqual(ROOM_ROWS.response(rows, next_cursor="abc").content, old)
+
+
+# ---- api/schedule.py ------------------------------------------------
+class ScheduleParseTests(SimpleTestCase):
+    def test_parse(self):
+        self.assertEqual(schedule.parse("MW", "10-12"), (5, 600, 720))
+        self.assertEqual(schedule.parse("tr", "8:30-9:45"), (10, 510, 585))
+        self.assertEqual(schedule.parse("M W F", "10:00 – 11:15"), (21, 600, 675))
+        self.assertEqual(schedule.parse("U", "22-24"), (64, 1320, 1440))
+
+    def test_rejects(self):
+        bad = [
+            ("MX", "10-12"),            # unknown day
+            ("", "10-12"),              # no days
+            ("MW", "10"),               # not a range
+            ("MW", "12-10"),            # ends before it starts
+            ("MW", "10:60-11"),
+            ("MW", "23-24:30"),
+        ]
+        for on_days, on_times in bad:
+            with self.subTest(on_days=on_days, on_times=on_times):
+                with self.assertRaises(ValueError):
+                    schedule.parse(on_days, on_times)
+
+
+# ---- api/catalog.py -------------------------------------------------
+def _section(pcid, code, name, prof_id, professor, on_days, on_times, seats_used,
+             max_capacity=30):
+    mask, start, end = schedule.parse(on_days, on_times)
+    return (pcid, code, name, prof_id, professor, on_days, on_times, mask,
+            start, end, "A-101", 25, max_capacity, seats_used)
+
+
+class CatalogSearchTests(SimpleTestCase):
+    def setUp(self):
+        sections = [
+            _section("p1", "CS101", "Data Structures", "prof-a", "Ann Smith",   "MW", "10-12", 30),
+            _section("p2", "CS201", "Algorithms",      "prof-b", "Bob Jones",   "TR", "8-9:15", 3),
+            _section("p3", "MA101", "Calculus",        "prof-a", "Ann Smith",   "M",  "14-16", 0),
+            _section("p4", "CS301", "Data Mining",     "prof-c", "Cy Smithers", "F",  "9-11", 10),
+        ]
+        departments = [("p1", "cs"), ("p2", "cs"), ("p3", "math"), ("p4", "cs")]
+        majors      = [("major-cs", "cs"), ("major-math", "math")]
+        self.catalog = SemesterCatalog(sections, departments, majors, (1,), (1,))
+
+    def pcids(self, **filters):
+        return [s["pcid"] for s in self.catalog.search(**filters)]
+
+    def test_no_filter(self):
+        self.assertEqual(self.pcids(), ["p1", "p2", "p3", "p4"])
+
+    def test_days_only_within(self):
+        mw = schedule.parse_days("MW")
+        self.assertEqual(self.pcids(days=mw), ["p1", "p3"])
+
+    def test_time_window(self):
+        self.assertEqual(self.pcids(after=9 * 60, before=12 * 60), ["p1", "p4"])
+
+    def test_name_prefixes(self):
+        self.assertEqual(self.pcids(q="data"), ["p1", "p4"])
+        self.assertEqual(self.pcids(q="data str"), ["p1"])
+        self.assertEqual(self.pcids(q="cs2"), ["p2"])
+        self.assertEqual(self.pcids(q="physics"), [])
+
+    def test_professor(self):
+        self.assertEqual(self.pcids(prof_id="prof-a"), ["p1", "p3"])
+        self.assertEqual(self.pcids(professor="smith"), ["p1", "p3", "p4"])
+        self.assertEqual(self.pcids(professor="smithe"), ["p4"])
+
+    def test_major_and_open(self):
+        self.assertEqual(self.pcids(major_id="major-cs"), ["p1", "p2", "p4"])
+        self.assertEqual(self.pcids(major_id="major-cs", open_only=True), ["p2", "p4"])
+        self.assertEqual(self.pcids(major_id="unknown"), [])
+
+    def test_limit(self):
+        self.assertEqual(self.pcids(limit=2), ["p1", "p2"])
+
+    def test_result_shape(self):
+        self.assertEqual(self.catalog.search(q="calc"), [{
+            "pcid": "p3", "course_code": "MA101", "course_name": "Calculus",
+            "prof_id": "prof-a", "professor": "Ann Smith", "on_days": "M",
+            "on_times": "14-16", "room": "A-101", "capacity": 25,
+            "max_capacity": 30, "seats_used": 0,
+        }])
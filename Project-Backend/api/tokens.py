@@ -0,0 +1,70 @@
+# api/tokens.py
+"""
+Stateless signed session tokens (SESSION_MODE = "signed").
+
+The token carries what SignInSerializer.validate returns – member_id and
+is_admin – plus an id (jti) and an issue time, signed with SECRET_KEY.
+Reading it needs no session-table I/O; sign-out puts the jti on a
+revocation list in the shared cache until the token would expire anyway.
+That cache has to be Redis (settings.py refuses the mode otherwise): a
+per-process list would leave the token valid on every other worker.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+
+_SALT = "api.session-token"
+
+
+def token_max_age():
+    return getattr(settings, "SIGNED_SESSION_MAX_AGE", 60 * 60 * 24 * 7)
+
+
+def issue_token(member_id, is_admin):
+    claims = {
+        "mid": str(member_id),
+        "adm": bool(is_admin),
+        "jti": uuid.uuid4().hex,
+        "iat": int(time.time()),
+    }
+    return signing.dumps(claims, salt=_SALT, compress=True)
+
+
+def read_token(token):
+    """
+    Return the claims of a valid, unexpired, unrevoked token, else None.
+    """
+    if not token:
+        return None
+    try:
+        claims = signing.loads(token, salt=_SALT, max_age=token_max_age())
+    except signing.BadSignature:          # also covers SignatureExpired
+        return None
+    if cache.get(_revoked_key(claims["jti"])):
+        return None
+    return claims
+
+
+def revoke_token(claims):
+    """Put the token's jti on the revocation list until it expires."""
+    remaining = claims["iat"] + token_max_age() - int(time.time())
+    if remaining > 0:
+        cache.set(_revoked_key(claims["jti"]), True, remaining)
+
+
+def token_from_request(request):
+    """
+    Bearer header first, then the cookie.  Returns (token, via) where via
+    is "bearer" or "cookie".
+    """
+    auth = request.META.get("HTTP_AUTHORIZATION", "")
+    if auth.startswith("Bearer "):
+        return auth[7:].strip(), "bearer"
+    return request.COOKIES.get(settings.SIGNED_SESSION_COOKIE), "cookie"
+
+
+def _revoked_key(jti):
+    return f"revoked-token:{jti}"
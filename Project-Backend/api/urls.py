@@ -1,5 +1,6 @@
 from django.urls import path
 from .views import *
+from .async_views import read_view
 
 urlpatterns = [
     path("ping", ping),
@@ -21,15 +22,24 @@ urlpatterns = [
 
     path("courses", CourseView.as_view(), name="courses"),
     path("presented-courses/create", PresentedCourseCreateView.as_view(), name="presented-course-create"),
-    path("presented-courses", PresentedCourseListView.as_view(), name="presented-course-list"),
+    path("presented-courses", read_view(PresentedCourseListView), name="presented-course-list"),
+    path("presented-courses/search", PresentedCourseSearchView.as_view(),
+         name="presented-course-search"),
     path("student-semesters", StudentSemesterCreateView.as_view(), name="student-semester-create"),
     path("taken-courses", TakenCourseView.as_view(), name="taken-course"),
+    path("taken-courses/batch", TakenCourseBatchView.as_view(), name="taken-course-batch"),
+    path("enrollment-tickets/<str:ticket>", EnrollmentTicketView.as_view(), name="enrollment-ticket"),
 
     path(
             "presented-courses/<uuid:pcid>/students",
             SectionStudentListView.as_view(),
             name="section-student-list",
         ),
+    path(
+            "presented-courses/<uuid:pcid>/grades",
+            SectionGradesView.as_view(),
+            name="section-grades",
+        ),
 
     path("rooms", RoomView.as_view(), name="room-create"),
 
@@ -48,24 +58,28 @@ urlpatterns = [
      ),
     path("grades", GradeUpdateView.as_view(), name="grade-update"),
 
-    path("my-courses", RecordCourseListView.as_view(), name="record-course-list"),
+    path("my-courses", read_view(RecordCourseListView), name="record-course-list"),
 
     path(
         "semesters/<uuid:sid>/deactivate",
         SemesterDeactivateView.as_view(),
         name="semester-deactivate",
     ),
+    path("semesters/<uuid:sid>/closeout", SemesterCloseoutView.as_view(),
+         name="semester-closeout"),
+    path("semesters/<uuid:sid>/gpa", SemesterGPAView.as_view(), name="semester-gpa"),
     path("taken-courses/status", StatusUpdateView.as_view(), name="course-status-update"),
     path("staff-roles", StaffRoleView.as_view(), name="staff-roles"),
-    path("me", MyProfileView.as_view(), name="my-profile"),
+    path("me", read_view(MyProfileView), name="my-profile"),
 
-    path("my-student-records", StudentRecordListView.as_view(),
+    path("my-student-records", read_view(StudentRecordListView),
          name="student-record-list"),
 
-    path("my-taken-courses", TakenCourseListView.as_view(),
+    path("my-taken-courses", read_view(TakenCourseListView),
          name="taken-course-list"),
 
     path("student-record-gpa", RecordGPAVew.as_view(), name="record-gpa"),
+    path("term-gpa", TermGPAView.as_view(), name="term-gpa"),
     path("profile", ProfileUpdateView.as_view(), name="profile-update"),
     path("professor-course-load", ProfessorCourseLoadView.as_view(),
          name="professor-course-load"),
@@ -73,6 +87,13 @@ urlpatterns = [
          LowEnrolmentCourseView.as_view(),
          name="low-enrolment-courses"),
     path("major-gpa", MajorGPAView.as_view(), name="major-gpa"),
+    path("exports/members", MemberExportView.as_view(), name="export-members"),
+    path("exports/presented-courses/<uuid:pcid>/students",
+         SectionRosterExportView.as_view(), name="export-roster"),
+    path("exports/taken-courses", TranscriptExportView.as_view(), name="export-transcript"),
+    path("db-pool", PoolStatsView.as_view(), name="db-pool"),
+    path("enrollment-queue", EnrollmentQueueStatsView.as_view(), name="enrollment-queue"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 
 
 ]
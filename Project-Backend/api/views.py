@@ -1,11 +1,27 @@
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from rest_framework.parsers import BaseParser, JSONParser, MultiPartParser
 from rest_framework import status, permissions
 from .serializers import *
 from django.middleware import csrf
+from django.http import HttpResponse
 from rest_framework.permissions import IsAdminUser
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ParseError
+from .cache import invalidate_member, bump_deleted, reference_rows
+from .conditional import conditional_list
+from .pagination import page_request, split_page
+from .tokens import issue_token, revoke_token, token_max_age
+from .pool import get_pool
+from .enrollment_queue import get_queue, get_ticket, QueueFull
+from .db import query, query_one, stream_procedure
+from .export import export_response
+from .rows import json_response
+from . import catalog, closeout
+from . import metrics
+from django.conf import settings
+import time
+from datetime import date
 
 @api_view(["GET"])
 def ping(request):
@@ -61,17 +77,26 @@ class SignInView(APIView):
 
         member_id = ser.validated_data["member_id"]
         is_admin  = ser.validated_data["is_admin"]
+        payload   = {"signed_in": True, "is_admin": is_admin}  # ← include flag
 
-        # mark session
-        request.session["member_id"] = member_id
-        request.session.set_expiry(60 * 60 * 24 * 7)   # 7 days
+        if settings.SESSION_MODE == "signed":
+            # no session row: the signed token is the session
+            session_token = issue_token(member_id, is_admin)
+            payload["token"] = session_token
+        else:
+            # mark session
+            request.session["member_id"] = member_id
+            request.session.set_expiry(60 * 60 * 24 * 7)   # 7 days
 
         # set CSRF token cookie
         token = csrf.get_token(request)
-        resp = Response(
-            {"signed_in": True, "is_admin": is_admin},  # ← include flag
-            status=status.HTTP_200_OK
-        )
+        resp = Response(payload, status=status.HTTP_200_OK)
+        if settings.SESSION_MODE == "signed":
+            resp.set_cookie(
+                settings.SIGNED_SESSION_COOKIE, session_token,
+                max_age=token_max_age(),
+                httponly=True, secure=False, samesite="Lax"
+            )
         resp.set_cookie(
             "csrftoken", token,
             max_age=60 * 60 * 24 * 7,
@@ -91,26 +116,23 @@ class MyProfileView(APIView):
             return Response({"detail": "Profile not found"},
                             status=status.HTTP_404_NOT_FOUND)
 
-        data = MyProfileSerializer({
-            "mid":         rows[0][0],
-            "fname":       rows[0][1],
-            "lname":       rows[0][2],
-            "national_id": rows[0][3],
-            "birthday":    rows[0][4],
-            "is_admin":    bool(rows[0][5]),
-            "username":    rows[0][6],
-            "last_login":  rows[0][7],
-        }).data
+        data = MyProfileSerializer.from_row(rows[0]).data
 
         return Response(data, status=status.HTTP_200_OK)
 
 class SignOutView(APIView):
     """
-    POST /signout  → deletes session
+    POST /signout  → deletes session (or revokes the signed token)
     """
     permission_classes = [permissions.IsAuthenticated]  # see custom backend below
 
     def post(self, request):
+        if settings.SESSION_MODE == "signed":
+            revoke_token(request._request.member_token)
+            resp = Response(status=status.HTTP_204_NO_CONTENT)
+            resp.delete_cookie(settings.SIGNED_SESSION_COOKIE, samesite="Lax")
+            return resp
+
         request.session.flush()
         return Response(status=status.HTTP_204_NO_CONTENT)
     
@@ -130,11 +152,10 @@ class SemesterView(APIView):
         return super().get_permissions()
 
     # --------------------- GET ----------------------------------
+    @conditional_list("semesters")
     def get(self, request):
-        rows = call_procedure("list_semesters", ())
-        serializer = SemesterListSerializer(child=serializers.DictField())  # ← child
-        data = serializer.to_representation(rows)
-        return Response(data, status=status.HTTP_200_OK)
+        rows = reference_rows("list_semesters")
+        return SEMESTER_ROWS.response(rows)
 
     def post(self, request):
         ser = SemesterCreateSerializer(data=request.data)
@@ -157,11 +178,11 @@ class DepartmentView(APIView):
         result = ser.save()
         return Response(result, status=status.HTTP_201_CREATED)
     
+    @conditional_list("departments", "workers", "members")
     def get(self, request):
-        rows = call_procedure("list_departments", ())
-        serializer = DepartmentListSerializer(child=serializers.DictField())  # ← child
-        data = serializer.to_representation(rows)
-        return Response(data, status=status.HTTP_200_OK)
+        # head rows are "active" relative to CURDATE()
+        rows = reference_rows("list_departments", extra=date.today().isoformat())
+        return DEPARTMENT_ROWS.response(rows)
     
 
 class MajorView(APIView):
@@ -181,11 +202,10 @@ class MajorView(APIView):
         result = ser.save()                   # {"major_id": "..."}
         return Response(result, status=status.HTTP_201_CREATED)
     
+    @conditional_list("majors", "departments")
     def get(self, request):
-        rows = call_procedure("list_majors", ())
-        serializer = MajorListSerializer(child=serializers.DictField())  # ← child
-        data = serializer.to_representation(rows)
-        return Response(data, status=status.HTTP_200_OK)
+        rows = reference_rows("list_majors")
+        return MAJOR_ROWS.response(rows)
     
 
     
@@ -214,11 +234,10 @@ class SemesterListView(APIView):
     """
     permission_classes = [permissions.AllowAny]  # or IsAuthenticated
 
+    @conditional_list("semesters")
     def get(self, request):
-        rows = call_procedure("list_semesters", ())
-        serializer = SemesterListSerializer()
-        data = serializer.to_representation(rows)
-        return Response(data, status=status.HTTP_200_OK)
+        rows = reference_rows("list_semesters")
+        return SEMESTER_ROWS.response(rows)
     
 class StaffRoleView(APIView):
     """
@@ -257,7 +276,7 @@ class StaffRoleView(APIView):
     
 class CourseView(APIView):
     """
-    GET  /api/courses  → list
+    GET  /api/courses  → list  ([?limit=<n>][&cursor=<c>] → keyset page)
     POST /api/courses  → create (admin)
     """
     permission_classes = [permissions.IsAuthenticated]
@@ -268,16 +287,20 @@ class CourseView(APIView):
         return super().get_permissions()
 
     # ---------- GET list --------------------------------------
+    @conditional_list("courses")
     def get(self, request):
-        rows = call_procedure("list_courses", ())
-        data = CourseItemSerializer(
-            [
-                {"cid": r[0],"course_code":r[1], "course_name": r[2]}
-                for r in rows
-            ],
-            many=True
-        ).data
-        return Response(data, status=status.HTTP_200_OK)
+        page = page_request(request, 1)
+        if page is None:
+            rows = reference_rows("list_courses")
+        else:
+            after, limit = page
+            rows, next_cursor = split_page(
+                call_procedure("list_courses_page", (*after, limit + 1)),
+                limit, key=lambda r: (r[2],),                # course_name
+            )
+        if page is None:
+            return COURSE_ROWS.response(rows)
+        return COURSE_ROWS.response(rows, next_cursor=next_cursor)
 
     # ---------- POST create (you already have this) -----------
     def post(self, request):
@@ -311,7 +334,7 @@ class PresentedCourseCreateView(APIView):
 class RoomView(APIView):
 
     """
-    GET  /api/rooms   → list (any authenticated user)
+    GET  /api/rooms   → list (any authenticated user; limit/cursor → keyset page)
     POST /api/rooms   → create (admin)
     """
     permission_classes = [permissions.IsAuthenticated]  # default; we’ll override
@@ -322,16 +345,20 @@ class RoomView(APIView):
         return super().get_permissions()
 
     # ---------- GET (list) ----------
+    @conditional_list("rooms")
     def get(self, request):
-        rows = call_procedure("list_rooms", ())
-        data = RoomItemSerializer(
-            [
-                {"rid": r[0], "room_label": r[1], "capacity": r[2]}
-                for r in rows
-            ],
-            many=True
-        ).data
-        return Response(data, status=status.HTTP_200_OK)
+        page = page_request(request, 1)
+        if page is None:
+            rows = reference_rows("list_rooms")
+        else:
+            after, limit = page
+            rows, next_cursor = split_page(
+                call_procedure("list_rooms_page", (*after, limit + 1)),
+                limit, key=lambda r: (r[1],),                # room_label
+            )
+        if page is None:
+            return ROOM_ROWS.response(rows)
+        return ROOM_ROWS.response(rows, next_cursor=next_cursor)
     
     def post(self, request):
         ser = RoomCreateSerializer(data=request.data)
@@ -350,14 +377,14 @@ class StudentSemesterCreateView(APIView):
 
     # ---------- helper: ownership check ----------------------------
     def _owns_record(self, record_id, user_id):
-        with connection.cursor() as cur:
-            cur.execute(
-                "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
-                (record_id, user_id),
-            )
-            return cur.fetchone() is not None
+        return query_one(
+            "owns_record",
+            "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
+            (record_id, user_id),
+        ) is not None
 
     # ---------- GET – list semesters -------------------------------
+    @conditional_list("student_semesters")
     def get(self, request):
         record_id = request.query_params.get("record_id")
         if not record_id:
@@ -372,14 +399,7 @@ class StudentSemesterCreateView(APIView):
         # either call the stored procedure…
         rows = call_procedure("list_student_semesters", (record_id,))
 
-        data = StudentSemesterItemSerializer(
-            [
-                {"semester_id": r[0], "sem_status": r[1], "sem_gpa": r[2]}
-                for r in rows
-            ],
-            many=True,
-        ).data
-        return Response(data, status=status.HTTP_200_OK)
+        return STUDENT_SEMESTER_ROWS.response(rows)
 
     # ---------- POST – create row (unchanged) ----------------------
     def post(self, request):
@@ -407,11 +427,11 @@ class StaffView(APIView):
         return super().get_permissions()
 
     # ---------- GET staff list by role -------------------------
+    @conditional_list("workers", "members", "departments")
     def get(self, request):
         ser = StaffByRoleQuerySerializer(data=request.query_params)
         ser.is_valid(raise_exception=True)
-        data = ser.fetch()            # list[dict]
-        return Response(data, status=status.HTTP_200_OK)
+        return json_response(ser.fetch())
 
     # ---------- POST promote member to staff -------------------
     def post(self, request):
@@ -431,11 +451,30 @@ class PresentedCourseListView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_list("presented_courses", "majors", "courses", "members", "workers", "rooms")
     def get(self, request):
         ser = PresentedCourseListQuerySerializer(data=request.query_params)
         ser.is_valid(raise_exception=True)
-        data = ser.fetch()
-        return Response(data, status=status.HTTP_200_OK)
+        return json_response(ser.fetch())
+
+class PresentedCourseSearchView(APIView):
+    """
+    GET /api/presented-courses/search?semester_id=<sid>
+        [&days=MW][&after=9][&before=14:30][&prof_id=<mid>][&professor=smi]
+        [&q=data str][&major_id=<mid>][&open=1][&limit=50]
+
+    • Any authenticated user can call.
+    • Served from the per-semester catalog index (api/catalog.py) –
+      no query runs unless the semester's sections changed.
+    • Rows are list_presented_courses' plus prof_id and seats_used.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @conditional_list(*catalog.STRUCTURE_TABLES, *catalog.SEAT_TABLES)
+    def get(self, request):
+        ser = PresentedCourseSearchSerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+        return json_response(ser.fetch())
 
 class TakenCourseView(APIView):
     """
@@ -448,22 +487,40 @@ class TakenCourseView(APIView):
     def _verify_ownership(self, record_id, user):
         if user.is_staff:
             return  # admins skip
-        with connection.cursor() as cur:
-            cur.execute(
-                "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
-                (record_id, user.id),
-            )
-            if cur.fetchone() is None:
-                raise PermissionDenied("You do not own this student record")
+        if query_one(
+            "owns_record",
+            "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
+            (record_id, user.id),
+        ) is None:
+            raise PermissionDenied("You do not own this student record")
 
     # ---------- create ----------------------------------------
     def post(self, request):
         self._verify_ownership(request.data.get("record_id"), request.user)
         ser = TakenCourseCreateSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
+
+        queue = get_queue()
+        if queue is not None:
+            return self._enqueue(queue, request, ser.validated_data)
+
         ser.save()
         return Response({"enrolled": True}, status=status.HTTP_201_CREATED)
 
+    def _enqueue(self, queue, request, v):
+        try:
+            ticket = queue.submit(request.user.id, v["record_id"],
+                                  v["semester_id"], v["pcid"], v["status"])
+        except QueueFull as e:
+            resp = Response({"detail": str(e)},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            resp["Retry-After"] = str(settings.ENROLLMENT_QUEUE["RETRY_AFTER"])
+            return resp
+        resp = Response({"ticket": ticket, "state": "queued"},
+                        status=status.HTTP_202_ACCEPTED)
+        resp["Location"] = f"/api/enrollment-tickets/{ticket}"
+        return resp
+
     # ---------- delete RESERVED -------------------------------
     def delete(self, request):
         self._verify_ownership(request.data.get("record_id"), request.user)
@@ -472,6 +529,81 @@ class TakenCourseView(APIView):
         ser.delete(ser.validated_data)
         return Response({"removed": True}, status=status.HTTP_200_OK)
     
+class TakenCourseBatchView(TakenCourseView):
+    """
+    POST /api/taken-courses/batch
+    {
+      "record_id": "...", "semester_id": "...",
+      "add":  ["<pcid>", ...],
+      "drop": ["<pcid>", ...],
+      "status": "RESERVED",                     # for the adds
+      "mode": "all_or_nothing" | "best_effort"
+    }
+
+    One ownership check and one transaction for the whole batch; the
+    response lists every item with ok / status / detail.
+    """
+    http_method_names = ["post", "options"]
+
+    def post(self, request):
+        self._verify_ownership(request.data.get("record_id"), request.user)
+        ser = TakenCourseBatchSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        try:
+            committed, results, error = ser.save()
+        except DBError as e:
+            return Response({"detail": e.msg}, status=e.status)
+
+        if not committed:
+            return Response(
+                {"committed": False, "detail": error.msg, "results": results},
+                status=error.status,
+            )
+        return Response({"committed": True, "results": results},
+                        status=status.HTTP_200_OK)
+
+class EnrollmentTicketView(APIView):
+    """
+    GET /api/enrollment-tickets/<ticket>[?wait=<seconds>]
+
+    Result of a queued enrolment.  wait long-polls until the ticket leaves
+    the "queued" state, capped at ENROLLMENT_QUEUE["MAX_WAIT"] – the poll
+    holds a server thread all along.  Owner or admin only.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    POLL_INTERVAL = 0.25
+
+    def get(self, request, ticket):
+        q = EnrollmentTicketQuerySerializer(data=request.query_params)
+        q.is_valid(raise_exception=True)
+        wait = q.validated_data["wait"]
+
+        data = get_ticket(ticket)
+        if data is None:
+            return Response({"detail": "ticket does not exist"},
+                            status=status.HTTP_404_NOT_FOUND)
+        if not request.user.is_staff and data["owner"] != str(request.user.id):
+            raise PermissionDenied("Not your ticket")
+
+        deadline = time.monotonic() + wait
+        queue = get_queue()
+        while data is not None and data["state"] == "queued":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if queue is not None:
+                # wakes immediately if this process runs the job
+                queue.wait(ticket, min(remaining, self.POLL_INTERVAL))
+            else:
+                time.sleep(min(remaining, self.POLL_INTERVAL))
+            data = get_ticket(ticket)
+
+        if data is None:
+            return Response({"detail": "ticket does not exist"},
+                            status=status.HTTP_404_NOT_FOUND)
+        data = {k: v for k, v in data.items() if k != "owner"}
+        return Response(data, status=status.HTTP_200_OK)
+
 class TakenCourseListView(APIView):
     """
     GET /api/taken-courses[?semester_id=<sid>][&member_mid=<mid>]
@@ -481,6 +613,7 @@ class TakenCourseListView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_list("taken_courses", "std_records", "presented_courses", "courses", "members", "rooms")
     def get(self, request):
         q = TakenCourseQuerySerializer(data=request.query_params)
         q.is_valid(raise_exception=True)
@@ -495,61 +628,38 @@ class TakenCourseListView(APIView):
 
         try:
             rows = call_procedure("list_taken_courses",
-                                  (member_mid, semester_id or ""))
+                                  (member_mid, semester_id or None))
         except DBError as e:
             return Response({"detail": e.msg},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        data = TakenCourseItemSerializer(
-            [
-                {
-                    "record_id":    r[0],
-                    "semester_id":  r[1],
-                    "pcid":         r[2],
-                    "course_code":  r[3],
-                    "course_name":  r[4],
-                    "status":       r[5],
-                    "grade":        r[6],
-                    "professor":    r[7],
-                    "on_days":      r[8],
-                    "on_times":     r[9],
-                    "room":         r[10],
-                }
-                for r in rows
-            ],
-            many=True,
-        ).data
-
-        return Response(data, status=status.HTTP_200_OK)
+        return TAKEN_COURSE_ROWS.response(rows)
 
 class MemberListView(APIView):
     """
-    GET /api/members   (admin only)
+    GET /api/members[?limit=<n>][&cursor=<next_cursor>]   (admin only)
+
+    limit/cursor → keyset page {"results": [...], "next_cursor": ...}
     """
     permission_classes = [permissions.IsAdminUser]
 
+    @conditional_list("members", "credentials")
     def get(self, request):
-        # 1. run stored procedure
-        rows = call_procedure("list_members", ())
-
-        # 2. map tuple→dict once, coercing is_admin to bool
-        members = [
-            {
-                "mid":          r[0],
-                "is_admin":     bool(r[1]),
-                "fname":        r[2],
-                "lname":        r[3],
-                "national_id":  r[4],
-                "birthday":     r[5],
-                "username":     r[6],
-                "last_login":   r[7],
-            }
-            for r in rows
-        ]
+        # 1. run stored procedure (one keyset page when limit/cursor given)
+        page = page_request(request, 3)
+        if page is None:
+            rows = call_procedure("list_members", ())
+        else:
+            after, limit = page
+            rows, next_cursor = split_page(
+                call_procedure("list_members_page", (*after, limit + 1)),
+                limit, key=lambda r: (r[3], r[2], r[0]),     # lname, fname, mid
+            )
 
-        # 3. let DRF serializer handle final JSON output
-        data = MemberItemSerializer(members, many=True).data
-        return Response(data, status=status.HTTP_200_OK)
+        # 2. tuples → JSON straight from the column spec
+        if page is None:
+            return MEMBER_ROWS.response(rows)
+        return MEMBER_ROWS.response(rows, next_cursor=next_cursor)
     
 
 class GenericAdminDeleteView(APIView):
@@ -574,25 +684,29 @@ class GenericAdminDeleteView(APIView):
         except DBError as e:
             return Response({"detail": e.msg}, status=status.HTTP_400_BAD_REQUEST)
 
+        bump_deleted(resource)           # resource names are table names
+        if resource == "members":
+            invalidate_member(pk)        # deleted members must not stay signed in
+
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 class SectionStudentListView(APIView):
     """
-    GET /api/presented-courses/<pcid>/students
+    GET /api/presented-courses/<pcid>/students[?limit=<n>][&cursor=<c>]
     """
     permission_classes = [permissions.IsAuthenticated]
 
     def _prof_owns_section(self, pcid, user_id):
-        with connection.cursor() as cur:
-            cur.execute(
-                "SELECT prof_id FROM presented_courses WHERE pcid=%s",
-                (pcid,)
-            )
-            row = cur.fetchone()
+        row = query_one(
+            "section_prof",
+            "SELECT prof_id FROM presented_courses WHERE pcid=%s",
+            (pcid,)
+        )
         if row is None:
             return None          # section not found
         return row[0] == user_id
 
+    @conditional_list("taken_courses", "std_records", "student_semesters", "members")
     def get(self, request, pcid):
         # 1. auth check
         if not request.user.is_staff:          # non-admin professor
@@ -603,24 +717,20 @@ class SectionStudentListView(APIView):
             if not owns:
                 raise PermissionDenied("You do not teach this section")
 
-        # 2. fetch roster
-        rows = call_procedure("list_students_in_section", (pcid,))
-        data = SectionStudentItemSerializer(
-            [
-                {
-                    "student_number": r[0],
-                    "record_id":      r[1],
-                    "fname":          r[2],
-                    "lname":          r[3],
-                    "status":         r[4],
-                    "grade":          r[5],
-                }
-                for r in rows
-            ],
-            many=True
-        ).data
-
-        return Response(data, status=status.HTTP_200_OK)
+        # 2. fetch roster (one keyset page when limit/cursor given)
+        page = page_request(request, 3)
+        if page is None:
+            rows = call_procedure("list_students_in_section", (pcid,))
+        else:
+            after, limit = page
+            rows, next_cursor = split_page(
+                call_procedure("list_students_in_section_page",
+                               (pcid, *after, limit + 1)),
+                limit, key=lambda r: (r[3], r[2], r[1]),     # lname, fname, record_id
+            )
+        if page is None:
+            return SECTION_STUDENT_ROWS.response(rows)
+        return SECTION_STUDENT_ROWS.response(rows, next_cursor=next_cursor)
     
 
 class MyPresentedCourseListView(APIView):
@@ -631,6 +741,7 @@ class MyPresentedCourseListView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_list("presented_courses", "courses", "semesters", "rooms")
     def get(self, request):
         # choose prof_id
         prof_id = request.query_params.get("prof_id")
@@ -641,35 +752,17 @@ class MyPresentedCourseListView(APIView):
             prof_id = request.user.id       # the logged-in professor / staff
 
         rows = call_procedure("list_sections_by_prof", (prof_id,))
-        data = MySectionItemSerializer(
-            [
-                {
-                    "pcid":         r[0],
-                    "course_code":  r[1],
-                    "course_name":  r[2],
-                    "sem_title":    r[3],
-                    "on_days":      r[4],
-                    "on_times":     r[5],
-                    "room":         r[6],
-                    "capacity":     r[7],
-                    "max_capacity": r[8],
-                }
-                for r in rows
-            ],
-            many=True
-        ).data
-        return Response(data, status=status.HTTP_200_OK)
+        return MY_SECTION_ROWS.response(rows)
     
 class GradeUpdateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def _prof_teaches(self, pcid, user_id):
-        with connection.cursor() as cur:
-            cur.execute(
-                "SELECT 1 FROM presented_courses WHERE pcid=%s AND prof_id=%s",
-                (pcid, user_id)
-            )
-            return cur.fetchone() is not None
+        return query_one(
+            "prof_teaches",
+            "SELECT 1 FROM presented_courses WHERE pcid=%s AND prof_id=%s",
+            (pcid, user_id)
+        ) is not None
 
     def post(self, request):
         if not request.user.is_staff:
@@ -686,6 +779,66 @@ class GradeUpdateView(APIView):
         )
     
 
+class CSVTextParser(BaseParser):
+    """text/csv request body → str."""
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return _decode_csv(stream.read())
+
+
+def _decode_csv(raw):
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ParseError("CSV must be UTF-8")
+
+
+class SectionGradesView(APIView):
+    """
+    POST /api/presented-courses/<pcid>/grades
+    Body: { "grades": [ {"record_id": "...", "grade": 17.5}, … ] }
+       or text/csv with a  record_id,grade  header
+       or multipart/form-data with that CSV as "file"
+
+    • Professor: only for a section they teach (checked once).
+    • Admin   : any section.
+    Applies every valid row in one transaction; bad rows and students not
+    enrolled in the section come back in "failed" with their row number.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes     = [JSONParser, CSVTextParser, MultiPartParser]
+
+    def _prof_teaches(self, pcid, user_id):
+        return query_one(
+            "prof_teaches",
+            "SELECT 1 FROM presented_courses WHERE pcid=%s AND prof_id=%s",
+            (pcid, user_id),
+        ) is not None
+
+    def _rows(self, request):
+        if isinstance(request.data, str):
+            return SectionGradesSerializer.rows_from_csv(request.data)
+        upload = request.FILES.get("file")
+        if upload is not None:
+            return SectionGradesSerializer.rows_from_csv(_decode_csv(upload.read()))
+        return request.data.get("grades")
+
+    def post(self, request, pcid):
+        pcid = str(pcid)
+        if request.user.is_staff:
+            prof_id = None
+        else:
+            prof_id = request.user.id
+            if not self._prof_teaches(pcid, prof_id):
+                raise PermissionDenied("You do not teach this section")
+
+        ser = SectionGradesSerializer(data={"grades": self._rows(request)})
+        ser.is_valid(raise_exception=True)
+        return Response(ser.save(pcid, prof_id, request.user.id),
+                        status=status.HTTP_200_OK)
+
+
 class RecordCourseListView(APIView):
     """
     GET /api/my-courses?record_id=<record>&semester_id=<sid>
@@ -696,13 +849,13 @@ class RecordCourseListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def _owns_record(self, record_id, user_id):
-        with connection.cursor() as cur:
-            cur.execute(
-                "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
-                (record_id, user_id),
-            )
-            return cur.fetchone() is not None
+        return query_one(
+            "owns_record",
+            "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
+            (record_id, user_id),
+        ) is not None
 
+    @conditional_list("taken_courses", "presented_courses", "courses", "rooms", "staffs", "members")
     def get(self, request):
         record_id   = request.query_params.get("record_id")
         semester_id = request.query_params.get("semester_id")
@@ -723,50 +876,68 @@ class RecordCourseListView(APIView):
         except DBError as e:
             return Response({"detail": e.msg}, status=status.HTTP_400_BAD_REQUEST)
 
-        data = RecordCourseItemSerializer(
-            [
-                {
-                    "pcid":        r[0],
-                    "course_code": r[1],
-                    "course_name": r[2],
-                    "status":      r[3],
-                    "grade":       r[4],
-                    "professor":   r[5],
-                    "on_days":     r[6],
-                    "on_times":    r[7],
-                    "room":        r[8],
-                }
-                for r in rows
-            ],
-            many=True
-        ).data
-
-        return Response(data, status=status.HTTP_200_OK)
+        return RECORD_COURSE_ROWS.response(rows)
 
 
 class SemesterDeactivateView(APIView):
     """
     POST /api/semesters/<sid>/deactivate   (admin only)
+
+    Flips the semester inactive at once; a separate process then closes
+    its enrolment rows, a few sections per transaction (api/closeout.py).
+    → 202 + close-out status as soon as it started (Location: …/closeout,
+      poll it), 200 if it was already DONE.  POSTing again resumes a
+      FAILED close-out.
     """
     permission_classes = [permissions.IsAdminUser]
 
     def post(self, request, sid):
         ser = SemesterDeactivateSerializer(data={"sid": str(sid)})  # cast here
         ser.is_valid(raise_exception=True)
-        ser.save()
+        row = ser.save()
 
-        # fetch the fresh end_date to return
-        with connection.cursor() as cur:
-            cur.execute(
-                "SELECT end_date FROM semesters WHERE sid=%s",
-                (sid,)
-            )
-            row = cur.fetchone()
+        data = {"deactivated": True, **CLOSEOUT_ROWS.dicts([row])[0]}
+        if data["state"] == "DONE":
+            return json_response(data)
+        resp = json_response(data, status=status.HTTP_202_ACCEPTED)
+        resp["Location"] = f"/api/semesters/{sid}/closeout"
+        return resp
 
-        return Response(
-            {"deactivated": True, "sid": sid, "end_date": row[0]},
-            status=status.HTTP_200_OK,
-        )
+class SemesterCloseoutView(APIView):
+    """
+    GET /api/semesters/<sid>/closeout   (admin only) – close-out progress
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, sid):
+        row = closeout.status(str(sid))
+        if row is None:
+            return Response({"detail": "semester close-out does not exist"},
+                            status=status.HTTP_404_NOT_FOUND)
+        return json_response(CLOSEOUT_ROWS.dicts([row])[0])
+
+class SemesterGPAView(APIView):
+    """
+    POST /api/semesters/<sid>/gpa   (admin only)
+    Body (optional): { "chunk": 500 }   – records per transaction
+
+    Recomputes sem_gpa for every student in that semester; deactivation
+    already does this, use it after late grade changes.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, sid):
+        if not isinstance(request.data, dict):        # QueryDict is one too
+            raise ParseError("Body must be an object")
+        data  = {"sid": str(sid)}
+        chunk = request.data.get("chunk")             # a form's last value, not a list
+        if chunk is not None:
+            data["chunk"] = chunk
+        ser = SemesterGPASerializer(data=data)
+        ser.is_valid(raise_exception=True)
+        records = ser.save()
+        return Response({"sid": sid, "records": records},
+                        status=status.HTTP_200_OK)
 
 class StatusUpdateView(APIView):
     """
@@ -776,12 +947,11 @@ class StatusUpdateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def _prof_teaches(self, pcid, user_id):
-        with connection.cursor() as cur:
-            cur.execute(
-                "SELECT 1 FROM presented_courses WHERE pcid=%s AND prof_id=%s",
-                (pcid, user_id),
-            )
-            return cur.fetchone() is not None
+        return query_one(
+            "prof_teaches",
+            "SELECT 1 FROM presented_courses WHERE pcid=%s AND prof_id=%s",
+            (pcid, user_id),
+        ) is not None
 
     def post(self, request):
         if not request.user.is_staff:
@@ -809,6 +979,7 @@ class StudentRecordListView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_list("std_records", "majors")
     def get(self, request):
         member_mid = request.query_params.get("member_mid")
 
@@ -823,21 +994,7 @@ class StudentRecordListView(APIView):
         except DBError as e:
             return Response({"detail": e.msg}, status=status.HTTP_400_BAD_REQUEST)
 
-        data = StudentRecordItemSerializer(
-            [
-                {
-                    "record_id":    r[0],
-                    "entrance_sem": r[1],
-                    "gpa":          r[2],
-                    "major_id":     r[3],
-                    "major_name":   r[4],
-                }
-                for r in rows
-            ],
-            many=True
-        ).data
-
-        return Response(data, status=status.HTTP_200_OK)
+        return STUDENT_RECORD_ROWS.response(rows)
     
 
 class RecordGPAVew(APIView):
@@ -856,13 +1013,12 @@ class RecordGPAVew(APIView):
 
         # --- ownership check (unless admin) --------------------
         if not request.user.is_staff:
-            with connection.cursor() as cur:
-                cur.execute(
-                    "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
-                    (record_id, request.user.id),
-                )
-                if cur.fetchone() is None:
-                    raise PermissionDenied("You do not own this student record")
+            if query_one(
+                "owns_record",
+                "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
+                (record_id, request.user.id),
+            ) is None:
+                raise PermissionDenied("You do not own this student record")
 
         # --- call stored procedure -----------------------------
         try:
@@ -875,6 +1031,32 @@ class RecordGPAVew(APIView):
         data = RecordGPAResultSerializer.from_row(record_id, gpa)
         return Response(data, status=status.HTTP_200_OK)
     
+class TermGPAView(APIView):
+    """
+    GET /api/term-gpa?record_id=<uuid>
+
+    • Owner or admin only.
+    • Term-by-term GPA history (stored sem_gpa), oldest term first.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @conditional_list("student_semesters", "semesters")
+    def get(self, request):
+        q = RecordGPAQuerySerializer(data=request.query_params)
+        q.is_valid(raise_exception=True)
+        record_id = q.validated_data["record_id"]
+
+        if not request.user.is_staff:
+            if query_one(
+                "owns_record",
+                "SELECT 1 FROM std_records WHERE record_id=%s AND mid=%s",
+                (record_id, request.user.id),
+            ) is None:
+                raise PermissionDenied("You do not own this student record")
+
+        rows = call_procedure("list_term_gpa", (record_id,))
+        return TERM_GPA_ROWS.response(rows)
+
 class ProfileUpdateView(APIView):
     """
     PUT /api/profile                → update your own profile
@@ -900,6 +1082,7 @@ class ProfessorCourseLoadView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]   # ← change to IsAdminUser if desired
 
+    @conditional_list("presented_courses", "semesters", "departments", "workers", "members")
     def get(self, request):
         try:
             rows = call_procedure("list_professor_course_load", ())
@@ -907,20 +1090,7 @@ class ProfessorCourseLoadView(APIView):
             return Response({"detail": e.msg},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        data = ProfessorLoadItemSerializer(
-            [
-                {
-                    "prof_mid":    r[0],
-                    "fname":       r[1],
-                    "lname":       r[2],
-                    "department":  r[3],
-                    "course_load": int(r[4]),
-                }
-                for r in rows
-            ],
-            many=True,
-        ).data
-        return Response(data, status=status.HTTP_200_OK)
+        return PROFESSOR_LOAD_ROWS.response(rows)
     
 class LowEnrolmentCourseView(APIView):
     """
@@ -930,6 +1100,7 @@ class LowEnrolmentCourseView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_list("presented_courses", "courses", "semesters", "taken_courses")
     def get(self, request):
         q = LowEnrollQuerySerializer(data=request.query_params)
         q.is_valid(raise_exception=True)
@@ -941,21 +1112,7 @@ class LowEnrolmentCourseView(APIView):
             return Response({"detail": e.msg},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        data = LowEnrollItemSerializer(
-            [
-                {
-                    "pcid":         r[0],
-                    "course_code":  r[1],
-                    "course_name":  r[2],
-                    "semester":     r[3],
-                    "max_capacity": int(r[4]),
-                    "enrolled_cnt": int(r[5]),
-                }
-                for r in rows
-            ],
-            many=True,
-        ).data
-        return Response(data, status=status.HTTP_200_OK)
+        return LOW_ENROLL_ROWS.response(rows)
     
 class MajorGPAView(APIView):
     """
@@ -963,20 +1120,162 @@ class MajorGPAView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]   # change to IsAdminUser if needed
 
+    @conditional_list("majors", "std_records")
     def get(self, request):
-        with connection.cursor() as cur:
-            cur.execute("SELECT major_id, major_name, avg_gpa FROM vw_major_avg_gpa")
-            rows = cur.fetchall()
-
-        data = MajorGPAItemSerializer(
-            [
-                {
-                    "major_id":   r[0],
-                    "major_name": r[1],
-                    "avg_gpa":    r[2],
-                }
-                for r in rows
-            ],
-            many=True,
-        ).data
-        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
+        rows = query("major_avg_gpa",
+                     "SELECT major_id, major_name, avg_gpa FROM vw_major_avg_gpa")
+
+        return MAJOR_GPA_ROWS.response(rows)
+
+
+class MemberExportView(APIView):
+    """
+    GET /api/exports/members[?fmt=csv|ndjson]   (admin only)
+
+    Streams every member straight off a server-side cursor.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    FIELDS = ("mid", "is_admin", "fname", "lname", "national_id",
+              "birthday", "username", "last_login")
+
+    def get(self, request):
+        q = ExportQuerySerializer(data=request.query_params)
+        q.is_valid(raise_exception=True)
+        try:
+            stream = stream_procedure("list_members", ())
+        except DBError as e:
+            return Response({"detail": e.msg}, status=e.status)
+
+        items = (
+            {
+                "mid":          r[0],
+                "is_admin":     bool(r[1]),
+                "fname":        r[2],
+                "lname":        r[3],
+                "national_id":  r[4],
+                "birthday":     r[5],
+                "username":     r[6],
+                "last_login":   r[7],
+            }
+            for r in stream
+        )
+        return export_response(q.validated_data["fmt"], "members",
+                               self.FIELDS, items, stream)
+
+
+class SectionRosterExportView(SectionStudentListView):
+    """
+    GET /api/exports/presented-courses/<pcid>/students[?fmt=csv|ndjson]
+
+    Same access rule as the roster: the section's professor or an admin.
+    """
+    FIELDS = ("student_number", "record_id", "fname", "lname", "status", "grade")
+
+    def get(self, request, pcid):
+        q = ExportQuerySerializer(data=request.query_params)
+        q.is_valid(raise_exception=True)
+
+        if not request.user.is_staff:
+            owns = self._prof_owns_section(pcid, request.user.id)
+            if owns is None:
+                return Response({"detail": "Section not found"},
+                                status=status.HTTP_404_NOT_FOUND)
+            if not owns:
+                raise PermissionDenied("You do not teach this section")
+
+        try:
+            stream = stream_procedure("list_students_in_section", (str(pcid),))
+        except DBError as e:
+            return Response({"detail": e.msg}, status=e.status)
+
+        items = (
+            {
+                "student_number": r[0],
+                "record_id":      r[1],
+                "fname":          r[2],
+                "lname":          r[3],
+                "status":         r[4],
+                "grade":          r[5],
+            }
+            for r in stream
+        )
+        return export_response(q.validated_data["fmt"], f"roster-{pcid}",
+                               self.FIELDS, items, stream)
+
+
+class TranscriptExportView(APIView):
+    """
+    GET /api/exports/taken-courses[?semester_id=<sid>][&member_mid=<mid>][&fmt=csv|ndjson]
+
+    • Students → their own history.
+    • Admin    → may specify member_mid to export another student.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    FIELDS = ("record_id", "semester_id", "pcid", "course_code", "course_name",
+              "status", "grade", "professor", "on_days", "on_times", "room")
+
+    def get(self, request):
+        q = TranscriptExportQuerySerializer(data=request.query_params)
+        q.is_valid(raise_exception=True)
+        semester_id = q.validated_data.get("semester_id", "")
+        member_mid  = q.validated_data.get("member_mid")
+
+        if member_mid:
+            if not request.user.is_staff:
+                raise PermissionDenied("Only admins may specify member_mid")
+        else:
+            member_mid = request.user.id
+
+        try:
+            stream = stream_procedure("list_taken_courses",
+                                      (member_mid, semester_id or None))
+        except DBError as e:
+            return Response({"detail": e.msg}, status=e.status)
+
+        items = (dict(zip(self.FIELDS, r)) for r in stream)
+        return export_response(q.validated_data["fmt"], f"transcript-{member_mid}",
+                               self.FIELDS, items, stream)
+
+
+class PoolStatsView(APIView):
+    """
+    GET /api/db-pool   – procedure connection-pool gauges (admin only)
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        pool = get_pool()
+        if pool is None:
+            return Response({"enabled": False}, status=status.HTTP_200_OK)
+        return Response({"enabled": True, **pool.stats()},
+                        status=status.HTTP_200_OK)
+
+
+class EnrollmentQueueStatsView(APIView):
+    """
+    GET /api/enrollment-queue   – queued-enrolment gauges (admin only)
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        queue = get_queue()
+        if queue is None:
+            return Response({"enabled": False}, status=status.HTTP_200_OK)
+        return Response({"enabled": True, **queue.stats()},
+                        status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    """
+    GET /api/metrics   – Prometheus text exposition (admin only); every
+                         process's numbers when METRICS_DIR is set
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        if not metrics.enabled():
+            return Response({"detail": "Metrics are disabled"},
+                            status=status.HTTP_404_NOT_FOUND)
+        pool = get_pool()
+        body = metrics.render_prometheus(pool.stats() if pool else None)
+        return HttpResponse(body, content_type="text/plain; version=0.0.4")
@@ -0,0 +1,511 @@
+"""
+End-to-end latency / throughput of the API's hot endpoints.
+
+    cd Project-Backend
+    python manage.py seed_synthetic --students 20000 --sections 1000   # once
+    python manage.py runserver 8000          # or the app container / gunicorn
+    python benchmarks/bench_api.py [--base-url http://127.0.0.1:8000]
+           [--requests 500] [--concurrency 8] [--users 200]
+           [--rush-students 200] [--rush-sections 3] [--only me,grades]
+    python benchmarks/compare.py benchmarks/results/OLD.json benchmarks/results/NEW.json
+
+Talks HTTP only (stdlib http.client, one keep-alive connection per
+thread), so it measures whatever serves --base-url: runserver, gunicorn,
+the docker-compose app.  Logins are the ones seed_synthetic creates
+(admin, prof<N>, student<N> / --password); every id it needs is read
+through the API itself.
+
+Scenarios – each --requests calls spread over --concurrency threads,
+after --warmup unmeasured ones:
+
+  signin                POST /api/signin            (password hashing included)
+  me                    GET  /api/me
+  presented_courses     GET  /api/presented-courses?semester_id&major_id
+  taken_courses_post    POST   /api/taken-courses   a free, clash-free section…
+  taken_courses_delete  DELETE /api/taken-courses   …and dropping it again
+  grades                POST /api/grades            professor grading own section
+                                                    (marks rows COMPLETED – reseed
+                                                    for a pristine database)
+  my_taken_courses      GET  /api/my-taken-courses?semester_id
+  major_gpa             GET  /api/major-gpa
+  low_enrolment         GET  /api/low-enrolment-courses
+  registration_rush     --rush-students students at once on the same
+                        --rush-sections sections (seats run out: 409s are
+                        expected and counted); their seats are dropped after
+
+With ENROLLMENT_QUEUE on, a 202 is followed to its ticket (?wait=) and
+the latency covers the whole enrolment.  Every non-2xx status is
+counted per scenario, so a run that "got faster" by failing shows it.
+
+Results (p50/p95/p99/mean/max ms, throughput, status counts, plus the
+git commit and the options) are written as JSON to --out, by default
+benchmarks/results/api-<commit>.json.
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = (
+    "signin", "me", "presented_courses", "taken_courses_post",
+    "taken_courses_delete", "grades", "my_taken_courses", "major_gpa",
+    "low_enrolment", "registration_rush",
+)
+
+
+# ---- HTTP ------------------------------------------------------------
+class Client:
+    """One keep-alive connection; auth from a sign-in (bearer or session)."""
+
+    def __init__(self, base_url, timeout=60):
+        url = urlsplit(base_url)
+        self._conn_args = (url.hostname, url.port or 80)
+        self._timeout   = timeout
+        self._conn      = None
+        self.headers    = {}
+
+    def _connection(self):
+        if self._conn is None:
+            conn = http.client.HTTPConnection(*self._conn_args, timeout=self._timeout)
+            conn.connect()
+            # small request/response pairs: don't let Nagle hold them back
+            conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._conn = conn
+        return self._conn
+
+    def request(self, method, path, body=None, params=None):
+        """(status, parsed JSON or None, seconds)."""
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        headers = dict(self.headers)
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        while True:
+            reused  = self._conn is not None
+            started = time.perf_counter()
+            try:
+                conn = self._connection()
+                conn.request(method, path, body=data, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+                elapsed = time.perf_counter() - started
+                break
+            except (http.client.HTTPException, OSError):
+                self._conn = None
+                if not reused:
+                    raise
+                # the server closed an idle keep-alive connection: retry
+                # once on a fresh one
+        if resp.getheader("Connection", "").lower() == "close":
+            self._conn = None
+        try:
+            payload = json.loads(raw) if raw else None
+        except ValueError:
+            payload = None
+        self._remember_cookies(resp)
+        return resp.status, payload, elapsed
+
+    def _remember_cookies(self, resp):
+        jar = dict(c.split("=", 1) for c in self.headers.get("Cookie", "").split("; ") if "=" in c)
+        for header in resp.msg.get_all("Set-Cookie") or ():
+            name, _, rest = header.partition("=")
+            jar[name.strip()] = rest.split(";", 1)[0]
+        if jar:
+            self.headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in jar.items())
+            if "csrftoken" in jar:
+                self.headers["X-CSRFToken"] = jar["csrftoken"]
+
+    def signin(self, username, password, required=True):
+        status, payload, _ = self.request(
+            "POST", "/api/signin", {"username": username, "password": password})
+        if status != 200:
+            if required:
+                raise SystemExit(f"sign-in as {username} failed: {status} {payload}")
+            return False
+        if payload.get("token"):             # SESSION_MODE=signed: no CSRF needed
+            self.headers = {"Authorization": f"Bearer {payload['token']}"}
+        return True
+
+
+def enrol(client, body):
+    """POST /api/taken-courses, following a queued (202) ticket to its end."""
+    status, payload, elapsed = client.request("POST", "/api/taken-courses", body)
+    if status == 202:
+        ticket = payload["ticket"]
+        t, p, e = client.request("GET", f"/api/enrollment-tickets/{ticket}",
+                                 params={"wait": 30})
+        elapsed += e
+        # {"state": "done"|"failed", "status": …}; still queued → 504
+        status = (p or {}).get("status") or (504 if t == 200 else t)
+    return status, elapsed
+
+
+# ---- measurement -----------------------------------------------------
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    k = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(k, len(sorted_values) - 1))]
+
+
+def summarize(latencies, statuses, concurrency, wall):
+    lat = sorted(latencies)
+    ms = lambda v: None if v is None else round(v * 1000, 3)
+    counts = {}
+    for s in statuses:
+        counts[str(s)] = counts.get(str(s), 0) + 1
+    return {
+        "requests":       len(statuses),
+        "concurrency":    concurrency,
+        "errors":         sum(n for s, n in counts.items() if not s.startswith("2")),
+        "status":         dict(sorted(counts.items())),
+        "seconds":        round(wall, 3),
+        "throughput_rps": round(len(lat) / wall, 2) if wall else None,
+        "p50_ms":         ms(percentile(lat, 50)),
+        "p95_ms":         ms(percentile(lat, 95)),
+        "p99_ms":         ms(percentile(lat, 99)),
+        "mean_ms":        ms(sum(lat) / len(lat)) if lat else None,
+        "max_ms":         ms(lat[-1]) if lat else None,
+    }
+
+
+def run(make_call, total, concurrency, warmup=0):
+    """
+    Call make_call(i, client_index) → (status, seconds) *total* times on
+    *concurrency* threads; calls below *warmup* are not recorded.
+    """
+    latencies, statuses = [], []
+    lock    = threading.Lock()
+    counter = iter(range(warmup + total))
+    ready   = threading.Barrier(concurrency + 1)
+
+    def worker(slot):
+        ready.wait()
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            try:
+                status, elapsed = make_call(i, slot)
+            except (http.client.HTTPException, OSError):
+                status, elapsed = "connection_error", None
+            if i >= warmup:
+                with lock:
+                    if elapsed is not None:
+                        latencies.append(elapsed)
+                    statuses.append(status)
+
+    threads = [threading.Thread(target=worker, args=(s,), daemon=True)
+               for s in range(concurrency)]
+    for t in threads:
+        t.start()
+    ready.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    return summarize(latencies, statuses, concurrency, time.perf_counter() - started)
+
+
+# ---- fixture discovery (through the API) -----------------------------
+class Fixture:
+    def __init__(self, args):
+        self.args = args
+        admin = Client(args.base_url)
+        admin.signin("admin", args.password)
+        _, semesters, _ = admin.request("GET", "/api/semesters")
+        active = [s for s in semesters or () if s["is_active"]]
+        if not active:
+            raise SystemExit("no active semester – run manage.py seed_synthetic first")
+        self.semester_id = active[0]["sid"]
+        self.sem_title   = active[0]["sem_title"]
+
+        self.students = [self._student(n) for n in range(1, args.users + 1)]
+        self.students = [s for s in self.students if s is not None]
+        if not self.students:
+            raise SystemExit("none of the student logins has an active-semester record")
+        self.professors = [p for p in (self._professor(n) for n in range(1, args.users + 1))
+                           if p is not None]
+
+    def _student(self, n):
+        client = Client(self.args.base_url)
+        client.signin(f"student{n}", self.args.password)
+        _, records, _ = client.request("GET", "/api/my-student-records")
+        if not records:
+            return None
+        record = records[0]
+        _, sections, _ = client.request(
+            "GET", "/api/presented-courses",
+            {"semester_id": self.semester_id, "major_id": record["major_id"]})
+        _, taken, _ = client.request(
+            "GET", "/api/my-taken-courses", {"semester_id": self.semester_id})
+        busy  = {(t["on_days"], t["on_times"]) for t in taken or ()}
+        mine  = {t["pcid"] for t in taken or ()}
+        free  = [s["pcid"] for s in sections or ()
+                 if s["pcid"] not in mine and (s["on_days"], s["on_times"]) not in busy]
+        return {"username": f"student{n}", "client": client, "major_id": record["major_id"],
+                "record_id": record["record_id"], "sections": [s["pcid"] for s in sections or ()],
+                "free": free, "busy": busy}
+
+    def _professor(self, n):
+        client = Client(self.args.base_url)
+        if not client.signin(f"prof{n}", self.args.password, required=False):
+            return None
+        _, sections, _ = client.request("GET", "/api/my-presented-courses")
+        for s in sections or ():
+            if s["sem_title"] != self.sem_title:
+                continue
+            _, roster, _ = client.request("GET", f"/api/presented-courses/{s['pcid']}/students")
+            if isinstance(roster, dict):
+                roster = roster.get("results")
+            if roster:
+                return {"client": client, "pcid": s["pcid"],
+                        "records": [r["record_id"] for r in roster]}
+        return None
+
+
+# ---- scenarios -------------------------------------------------------
+def scenario_calls(fx, args):
+    """name → make_call(i, slot) for the plain request/response scenarios."""
+    st, pr = fx.students, fx.professors
+    # one client per (thread, student) would not reuse connections; the
+    # students are shared round-robin, so give each thread its own copies
+    per_thread = [[_clone(s["client"], args.base_url) for s in st]
+                  for _ in range(args.concurrency)]
+
+    def who(i, slot):
+        k = i % len(st)
+        return st[k], per_thread[slot][k]
+
+    anonymous = [Client(args.base_url) for _ in range(args.concurrency)]
+
+    def signin(i, slot):
+        c = anonymous[slot]
+        c.headers = {}                       # sign in afresh every time
+        status, _, elapsed = c.request(
+            "POST", "/api/signin",
+            {"username": st[i % len(st)]["username"], "password": args.password})
+        return status, elapsed
+
+    def get(path, params=None):
+        def call(i, slot):
+            s, c = who(i, slot)
+            status, _, elapsed = c.request("GET", path, params=params(s) if params else None)
+            return status, elapsed
+        return call
+
+    calls = {
+        "signin":  signin,
+        "me":      get("/api/me"),
+        "presented_courses": get("/api/presented-courses",
+                                 lambda s: {"semester_id": fx.semester_id,
+                                            "major_id": s["major_id"]}),
+        "my_taken_courses":  get("/api/my-taken-courses",
+                                 lambda s: {"semester_id": fx.semester_id}),
+        "major_gpa":     get("/api/major-gpa"),
+        "low_enrolment": get("/api/low-enrolment-courses"),
+    }
+    if pr:
+        prof_clients = [[_clone(p["client"], args.base_url) for p in pr]
+                        for _ in range(args.concurrency)]
+
+        def grades(i, slot):
+            k = i % len(pr)
+            p = pr[k]
+            body = {"record_id": p["records"][(i // len(pr)) % len(p["records"])],
+                    "pcid": p["pcid"], "grade": f"{random.randint(20, 40) / 2:.1f}"}
+            status, _, elapsed = prof_clients[slot][k].request("POST", "/api/grades", body)
+            return status, elapsed
+        calls["grades"] = grades
+    return calls
+
+
+def _clone(client, base_url):
+    c = Client(base_url)
+    c.headers = dict(client.headers)
+    return c
+
+
+def enrol_cycle(fx, args):
+    """POST then DELETE the same seat; the two latencies are kept apart."""
+    st = [s for s in fx.students if s["free"]]
+    if not st:
+        return {}
+    clients = [[_clone(s["client"], args.base_url) for s in st]
+               for _ in range(args.concurrency)]
+    owned   = threading.Lock()
+    taken   = set()                          # (record, pcid) in flight
+    post_l, post_s, del_l, del_s = [], [], [], []
+
+    def call(i, slot):
+        k = i % len(st)
+        s, c = st[k], clients[slot][k]
+        pcid = None
+        with owned:
+            for cand in random.sample(s["free"], len(s["free"])):
+                if (s["record_id"], cand) not in taken:
+                    pcid = cand
+                    taken.add((s["record_id"], cand))
+                    break
+        if pcid is None:
+            return None, 0
+        body = {"record_id": s["record_id"], "semester_id": fx.semester_id,
+                "pcid": pcid, "status": "RESERVED"}
+        statuses = post_s
+        try:
+            status, elapsed = enrol(c, body)
+            post_l.append(elapsed)
+            post_s.append(status)
+            if status in (200, 201):
+                statuses = del_s
+                status, _, elapsed = c.request("DELETE", "/api/taken-courses", body)
+                del_l.append(elapsed)
+                del_s.append(status)
+        except (http.client.HTTPException, OSError):
+            statuses.append("connection_error")
+        finally:
+            with owned:
+                taken.discard((s["record_id"], pcid))
+        return status, 0
+
+    started = time.perf_counter()
+    run(call, args.requests, args.concurrency)
+    wall = time.perf_counter() - started
+    return {
+        "taken_courses_post":   summarize(post_l, post_s, args.concurrency, wall),
+        "taken_courses_delete": summarize(del_l, del_s, args.concurrency, wall),
+    }
+
+
+def registration_rush(fx, args):
+    """Many students hit the same few sections at the same instant."""
+    candidates = [s for s in fx.students if s["free"]]
+    if not candidates:
+        return None
+    hot = {}
+    for s in candidates:
+        for pcid in s["free"]:
+            hot[pcid] = hot.get(pcid, 0) + 1
+    hot = sorted(hot, key=hot.get, reverse=True)[:args.rush_sections]
+    crowd = [s for s in candidates if set(s["free"]) & set(hot)]
+    crowd = (crowd * (args.rush_students // max(len(crowd), 1) + 1))[:args.rush_students]
+    jobs = []
+    seen = set()
+    for s in crowd:
+        for pcid in hot:
+            if pcid in s["free"] and (s["record_id"], pcid) not in seen:
+                seen.add((s["record_id"], pcid))
+                jobs.append((s, pcid))
+                break
+    if not jobs:
+        return None
+
+    clients = [_clone(s["client"], args.base_url) for s, _ in jobs]
+    won = []
+    lock = threading.Lock()
+
+    def call(i, slot):
+        s, pcid = jobs[i]
+        body = {"record_id": s["record_id"], "semester_id": fx.semester_id,
+                "pcid": pcid, "status": "RESERVED"}
+        status, elapsed = enrol(clients[i], body)
+        if status in (200, 201):
+            with lock:
+                won.append((clients[i], body))
+        return status, elapsed
+
+    result = run(call, len(jobs), len(jobs))
+    for client, body in won:                 # give the seats back
+        client.request("DELETE", "/api/taken-courses", body)
+    result["sections"] = len(hot)
+    result["seats_won"] = len(won)
+    return result
+
+
+# ---- main ------------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000")
+    ap.add_argument("--password", default="synthetic-pass")
+    ap.add_argument("--requests", type=int, default=500, help="measured calls per scenario")
+    ap.add_argument("--warmup", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--users", type=int, default=200,
+                    help="student<N> / prof<N> logins to spread the load over")
+    ap.add_argument("--rush-students", type=int, default=200)
+    ap.add_argument("--rush-sections", type=int, default=3)
+    ap.add_argument("--only", help="comma-separated scenario names")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="JSON file (default benchmarks/results/api-<commit>.json)")
+    args = ap.parse_args()
+
+    only = set(args.only.split(",")) if args.only else set(SCENARIOS)
+    unknown = only - set(SCENARIOS)
+    if unknown:
+        ap.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    random.seed(args.seed)
+
+    print(f"discovering fixtures at {args.base_url} …", file=sys.stderr)
+    fx = Fixture(args)
+    print(f"  {len(fx.students)} students, {len(fx.professors)} professors with a "
+          f"roster, semester {fx.sem_title}", file=sys.stderr)
+
+    results = {}
+    calls = scenario_calls(fx, args)
+    for name in SCENARIOS:
+        if name not in only:
+            continue
+        if name in calls:
+            results[name] = run(calls[name], args.requests, args.concurrency, args.warmup)
+        elif name == "taken_courses_post" or (name == "taken_courses_delete"
+                                              and "taken_courses_post" not in only):
+            results.update(enrol_cycle(fx, args))
+        elif name == "registration_rush":
+            rush = registration_rush(fx, args)
+            if rush is not None:
+                results[name] = rush
+        if name in results:
+            r = results[name]
+            print(f"  {name:22} p50 {r['p50_ms']:>8} ms  p95 {r['p95_ms']:>8} ms  "
+                  f"p99 {r['p99_ms']:>8} ms  {r['throughput_rps']:>8} req/s  "
+                  f"errors {r['errors']}", file=sys.stderr)
+
+    commit = git_commit()
+    report = {
+        "commit":    commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "options":   {k: v for k, v in vars(args).items() if k != "password"},
+        "scenarios": results,
+    }
+    out = args.out or os.path.join(HERE, "results", f"api-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
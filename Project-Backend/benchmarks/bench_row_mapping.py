@@ -0,0 +1,103 @@
+"""
+Per-row cost of turning list_members rows into a JSON body.
+
+    cd Project-Backend
+    python benchmarks/bench_row_mapping.py [--rows 5000] [--repeat 5]
+
+before – dict per row → MemberItemSerializer(many=True).data → JSONRenderer
+after  – MEMBER_ROWS.json(rows)  (api/rows.py)
+
+No database needed: the rows are synthetic tuples shaped like the
+procedure's result set.  Both outputs are checked to be byte-identical.
+"""
+import argparse
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "university.settings")
+
+import django
+
+django.setup()
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from api import rows as row_mapping
+from api.serializers import MEMBER_ROWS
+
+
+class MemberItemSerializer(serializers.Serializer):
+    """The serializer MemberListView used before the row specs."""
+    mid          = serializers.CharField()
+    is_admin     = serializers.BooleanField()
+    fname        = serializers.CharField()
+    lname        = serializers.CharField()
+    national_id  = serializers.CharField()
+    birthday     = serializers.DateField()
+    username     = serializers.CharField(allow_null=True)
+    last_login   = serializers.DateTimeField(allow_null=True)
+
+
+def make_rows(n):
+    base = datetime.datetime(2024, 9, 1, 8, 30)
+    return [
+        (
+            f"{i:08d}-0000-4000-8000-000000000000",
+            i % 50 == 0,
+            f"First{i}",
+            f"Last{i % 997}",
+            f"N{i:09d}",
+            datetime.date(1990 + i % 15, 1 + i % 12, 1 + i % 28),
+            f"user{i}" if i % 7 else None,
+            base + datetime.timedelta(minutes=i) if i % 3 else None,
+        )
+        for i in range(n)
+    ]
+
+
+def before(rows):
+    members = [
+        {
+            "mid":          r[0],
+            "is_admin":     bool(r[1]),
+            "fname":        r[2],
+            "lname":        r[3],
+            "national_id":  r[4],
+            "birthday":     r[5],
+            "username":     r[6],
+            "last_login":   r[7],
+        }
+        for r in rows
+    ]
+    return JSONRenderer().render(MemberItemSerializer(members, many=True).data)
+
+
+def after(rows):
+    return MEMBER_ROWS.json(rows)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows",   type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    rows = make_rows(args.rows)
+    assert before(rows) == after(rows), "outputs differ"
+
+    print(f"{args.rows} rows, best of {args.repeat}, "
+          f"encoder={'orjson' if row_mapping.orjson else 'json'}")
+    results = {}
+    for name, fn in (("before", before), ("after", after)):
+        best = min(timeit.repeat(lambda: fn(rows), number=1, repeat=args.repeat))
+        results[name] = best
+        print(f"  {name:<7}{best * 1e3:9.2f} ms  {best / args.rows * 1e6:7.2f} µs/row")
+    print(f"  speed-up {results['before'] / results['after']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
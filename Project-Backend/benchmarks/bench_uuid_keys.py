@@ -0,0 +1,141 @@
+"""
+Insert rate and on-disk / buffer-pool footprint: CHAR(36) vs BINARY(16) keys.
+
+    cd Project-Backend
+    python benchmarks/bench_uuid_keys.py [--rows 200000] [--batch 1000] [--buffer-pool]
+
+Needs the MySQL server from DATABASES["default"].  Creates two scratch
+tables shaped like presented_courses (fresh UUID() primary key per row,
+three UUID foreign-key columns, the two secondary indexes of 0005) –
+
+char   – CHAR(36) utf8mb4 keys, as db/0*.sql
+binary – BINARY(16) UUID_TO_BIN(uuid, 1) keys, as db/binary_uuid/
+
+– fills both with the same version-1 UUIDs in the same order and drops
+them again (unless --keep).  --buffer-pool also counts the tables'
+pages in the InnoDB buffer pool (scans INNODB_BUFFER_PAGE: slow on a
+big pool, don't run it against production).
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "university.settings")
+
+import django
+
+django.setup()
+
+import pymysql
+
+from api.db import uuid_to_bin
+from api.pool import connect_kwargs
+
+TABLES = {
+    "char":   ("bench_keys_char",
+               "CHAR(36) CHARACTER SET utf8mb4", str),
+    "binary": ("bench_keys_binary",
+               "BINARY(16)", uuid_to_bin),
+}
+
+DDL = """
+CREATE TABLE {name} (
+    pcid        {key} PRIMARY KEY,
+    prof_id     {key} NOT NULL,
+    semester_id {key} NOT NULL,
+    room_id     {key},
+    capacity    INT   NOT NULL,
+    KEY idx_semester_room (semester_id, room_id),
+    KEY idx_prof_semester (prof_id, semester_id)
+) ENGINE = InnoDB
+"""
+
+
+def make_rows(n):
+    """Same shape as live data: few semesters/rooms, more professors."""
+    semesters = [uuid.uuid1() for _ in range(8)]
+    rooms     = [uuid.uuid1() for _ in range(60)]
+    profs     = [uuid.uuid1() for _ in range(400)]
+    return [
+        (uuid.uuid1(), profs[i % 400], semesters[i * 8 // n],
+         rooms[i % 60] if i % 10 else None, 30 + i % 50)
+        for i in range(n)
+    ]
+
+
+def fill(cur, name, convert, rows, batch):
+    sql = (f"INSERT INTO {name} (pcid, prof_id, semester_id, room_id, capacity)"
+           " VALUES (%s, %s, %s, %s, %s)")
+    data = [
+        (convert(r[0]), convert(r[1]), convert(r[2]),
+         None if r[3] is None else convert(r[3]), r[4])
+        for r in rows
+    ]
+    started = time.perf_counter()
+    for i in range(0, len(data), batch):
+        cur.executemany(sql, data[i:i + batch])
+        cur.connection.commit()
+    return time.perf_counter() - started
+
+
+def footprint(cur, schema, name, buffer_pool):
+    cur.execute(f"ANALYZE TABLE {name}")
+    cur.fetchall()
+    cur.execute(
+        "SELECT data_length, index_length FROM information_schema.tables"
+        " WHERE table_schema = %s AND table_name = %s", (schema, name))
+    data, index = cur.fetchone()
+    pages = None
+    if buffer_pool:
+        cur.execute(
+            "SELECT COUNT(*) FROM information_schema.innodb_buffer_page"
+            " WHERE table_name = %s", (f"`{schema}`.`{name}`",))
+        pages = cur.fetchone()[0]
+    return data, index, pages
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows",  type=int, default=200_000)
+    ap.add_argument("--batch", type=int, default=1000)
+    ap.add_argument("--buffer-pool", action="store_true")
+    ap.add_argument("--keep", action="store_true", help="leave the tables behind")
+    args = ap.parse_args()
+
+    kwargs = dict(connect_kwargs(), autocommit=False)
+    conn = pymysql.connect(**kwargs)
+    schema = kwargs["database"]
+    rows = make_rows(args.rows)
+
+    print(f"{args.rows} rows, batches of {args.batch}, schema {schema}")
+    print(f"  {'keys':<7}{'rows/s':>10}{'data MiB':>10}{'index MiB':>11}"
+          + (f"{'pool pages':>12}" if args.buffer_pool else ""))
+    results = {}
+    try:
+        with conn.cursor() as cur:
+            for label, (name, key, convert) in TABLES.items():
+                cur.execute(f"DROP TABLE IF EXISTS {name}")
+                cur.execute(DDL.format(name=name, key=key))
+                elapsed = fill(cur, name, convert, rows, args.batch)
+                data, index, pages = footprint(cur, schema, name, args.buffer_pool)
+                results[label] = (args.rows / elapsed, data + index)
+                print(f"  {label:<7}{args.rows / elapsed:10.0f}"
+                      f"{data / 2**20:10.1f}{index / 2**20:11.1f}"
+                      + (f"{pages:12d}" if args.buffer_pool else ""))
+    finally:
+        if not args.keep:
+            with conn.cursor() as cur:
+                for name, _, _ in TABLES.values():
+                    cur.execute(f"DROP TABLE IF EXISTS {name}")
+        conn.close()
+
+    if len(results) == 2:
+        print(f"  binary: {results['binary'][0] / results['char'][0]:.2f}x insert rate, "
+              f"{results['binary'][1] / results['char'][1]:.2f}x size")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Diff two bench_api.py result files.
+
+    python benchmarks/compare.py benchmarks/results/api-OLD.json \\
+                                 benchmarks/results/api-NEW.json [--threshold 10]
+
+One line per scenario and metric (p50 / p95 / p99 latency, throughput,
+error count) with the relative change.  A latency up, or a throughput
+down, by more than --threshold percent is a regression; so is any new
+error.  Exits 1 if there is one, so CI can gate on it.
+"""
+import argparse
+import json
+import sys
+
+# metric → True when bigger is better
+METRICS = (
+    ("p50_ms", False),
+    ("p95_ms", False),
+    ("p99_ms", False),
+    ("throughput_rps", True),
+)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def change(old, new):
+    if old in (None, 0) or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("old")
+    ap.add_argument("new")
+    ap.add_argument("--threshold", type=float, default=10.0,
+                    help="percent change that counts as a regression (default 10)")
+    args = ap.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    print(f"{old.get('commit', '?')} → {new.get('commit', '?')}")
+    print(f"  {'scenario':22} {'metric':15} {'old':>10} {'new':>10} {'change':>8}")
+
+    regressions = []
+    for name in sorted(set(old["scenarios"]) | set(new["scenarios"])):
+        a, b = old["scenarios"].get(name), new["scenarios"].get(name)
+        if a is None or b is None:
+            print(f"  {name:22} only in {'new' if a is None else 'old'}")
+            continue
+        for metric, higher_is_better in METRICS:
+            pct = change(a.get(metric), b.get(metric))
+            worse = pct is not None and (-pct if higher_is_better else pct) > args.threshold
+            flag = "  REGRESSION" if worse else ""
+            if worse:
+                regressions.append(f"{name}.{metric}")
+            shown = "" if pct is None else f"{pct:+7.1f}%"
+            print(f"  {name:22} {metric:15} {a.get(metric)!s:>10} {b.get(metric)!s:>10}"
+                  f" {shown:>8}{flag}")
+        if b.get("errors", 0) > a.get("errors", 0):
+            regressions.append(f"{name}.errors")
+            print(f"  {name:22} {'errors':15} {a.get('errors', 0):>10} {b['errors']:>10}"
+                  f" {'':>8}  REGRESSION")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:g}%: "
+              + ", ".join(regressions))
+        sys.exit(1)
+    print(f"No regression over {args.threshold:g}%.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,11 @@ DROP TABLE IF EXISTS prerequisites;
 DROP TABLE IF EXISTS presented_courses;
 DROP TABLE IF EXISTS workers;
 DROP TABLE IF EXISTS staffs;
+DROP TABLE IF EXISTS major_gpa_stats;
 DROP TABLE IF EXISTS std_records;
 DROP TABLE IF EXISTS majors;
 DROP TABLE IF EXISTS departments;
+DROP TABLE IF EXISTS semester_closeouts;
 DROP TABLE IF EXISTS semesters;
 DROP TABLE IF EXISTS rooms;
 DROP TABLE IF EXISTS courses;
@@ -33,7 +35,8 @@ CREATE TABLE members (
     fname       VARCHAR(100) NOT NULL,
     lname       VARCHAR(100) NOT NULL,
     national_id CHAR(20)     NOT NULL UNIQUE,
-    birthday    DATE         NOT NULL
+    birthday    DATE         NOT NULL,
+    KEY idx_members_name (lname, fname, mid)     -- keyset order of list_members_page
 ) ENGINE = InnoDB;
 
 CREATE TABLE credentials (
@@ -66,14 +69,35 @@ CREATE TABLE semesters (
     end_date   DATE NOT NULL,
     sem_title  VARCHAR(30) NOT NULL,
     is_active BOOLEAN NOT NULL DEFAULT FALSE,
-    CONSTRAINT uq_one_active CHECK (is_active IN (0,1))
+    CONSTRAINT uq_one_active CHECK (is_active IN (0,1)),
+    KEY idx_semesters_active (is_active, start_date),  -- "the active semester"
+    KEY idx_semesters_title  (sem_title)               -- add_presented_course
+) ENGINE = InnoDB;
+
+-- ── chunked close-out progress (begin/closeout_next_chunk/finish) ──
+CREATE TABLE semester_closeouts (
+    sid            CHAR(36) PRIMARY KEY,
+    state          ENUM('RUNNING','DONE','FAILED') NOT NULL DEFAULT 'RUNNING',
+    total_sections INT      NOT NULL,
+    done_sections  INT      NOT NULL DEFAULT 0,
+    after_pcid     CHAR(36) NOT NULL DEFAULT '',   -- last section closed (pcid order)
+    error          VARCHAR(255),
+    started_at     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                             ON UPDATE CURRENT_TIMESTAMP,
+    finished_at    TIMESTAMP NULL,
+    FOREIGN KEY (sid) REFERENCES semesters(sid)
+        ON DELETE CASCADE
 ) ENGINE = InnoDB;
 
 -- ── student “file” per degree/major ──────────────────────────
 CREATE TABLE std_records (
     record_id CHAR(36) PRIMARY KEY DEFAULT (UUID()),
     mid       CHAR(36) NOT NULL,   -- FK → member
-    gpa       DECIMAL(4,2),
+    gpa       DECIMAL(4,2),        -- derived from the two below (trigger)
+    grade_sum  DECIMAL(10,2) NOT NULL DEFAULT 0,   -- Σ grade of COMPLETED rows,
+    graded_cnt INT           NOT NULL DEFAULT 0,   -- and their count; kept by the
+                                                   -- grading procs
     major_id  CHAR(36) NOT NULL,   -- FK → majors
     entrance_sem CHAR(36) NOT NULL,
     student_number CHAR(10) NOT NULL UNIQUE,
@@ -84,6 +108,15 @@ CREATE TABLE std_records (
         ON DELETE CASCADE
 ) ENGINE = InnoDB;
 
+-- ── running GPA average per major (kept by std_records triggers) ──
+CREATE TABLE major_gpa_stats (
+    major_id CHAR(36)      PRIMARY KEY,
+    gpa_sum  DECIMAL(12,2) NOT NULL DEFAULT 0,   -- Σ std_records.gpa (non-NULL)
+    gpa_cnt  INT           NOT NULL DEFAULT 0,   -- records with a GPA
+    FOREIGN KEY (major_id) REFERENCES majors(major_id)
+        ON DELETE CASCADE
+) ENGINE = InnoDB;
+
 -- ── staff & worker roles (subset of member) ──────────────────
 CREATE TABLE staffs (
     member_id CHAR(36) PRIMARY KEY,
@@ -98,6 +131,8 @@ CREATE TABLE workers (
     start_date DATE  NOT NULL,
     end_date   DATE,
     PRIMARY KEY (member_id, did, start_date),
+    KEY idx_workers_did_role (did, staff_role, end_date),  -- department heads
+    KEY idx_workers_role     (staff_role, member_id),      -- list_staff_by_role, course load
     FOREIGN KEY (member_id) REFERENCES staffs(member_id)
         ON DELETE CASCADE,
     FOREIGN KEY (did)       REFERENCES departments(did)
@@ -132,11 +167,18 @@ CREATE TABLE presented_courses (
     prof_id     CHAR(36) NOT NULL,                  -- FK → staffs
     capacity    INT      NOT NULL CHECK (capacity > 0),
     max_capacity    INT      NOT NULL CHECK (max_capacity > 0),
+    seats_used  INT      NOT NULL DEFAULT 0         -- RESERVED + TAKING rows,
+                CHECK (seats_used >= 0),            -- kept by the enrol procs
     semester_id CHAR(36) NOT NULL,                  -- FK → semesters
     on_days     VARCHAR(15) NOT NULL,               -- e.g. "MWF"
     on_times    VARCHAR(20) NOT NULL,               -- "10:00‑11:15"
+    day_mask    TINYINT UNSIGNED NOT NULL DEFAULT 0, -- on_days as bits, M=1 … U=64
+    start_min   SMALLINT UNSIGNED,                  -- on_times as minutes after
+    end_min     SMALLINT UNSIGNED,                  -- midnight (api/schedule.py)
     room_id     CHAR(36),                           -- FK → rooms
     course_id   CHAR(36) NOT NULL,                  -- FK → courses
+    KEY idx_pc_room_slot (semester_id, room_id, start_min), -- room conflicts, per-semester lists
+    KEY idx_pc_prof_slot (prof_id, semester_id, start_min), -- double-booking, list_sections_by_prof
     FOREIGN KEY (prof_id)     REFERENCES staffs(member_id),
     FOREIGN KEY (semester_id) REFERENCES semesters(sid),
     FOREIGN KEY (room_id)     REFERENCES rooms(rid),
@@ -164,6 +206,8 @@ CREATE TABLE taken_courses (
                 NOT NULL DEFAULT 'RESERVED',
     grade       DECIMAL(4,2) NOT NULL DEFAULT 0,   -- never NULL
     PRIMARY KEY (record_id, semester_id, pcid),
+    KEY idx_tc_pcid_status     (pcid, status),               -- rosters, seat counts
+    KEY idx_tc_semester_pcid   (semester_id, pcid, status),  -- close-out, section grading
 
     FOREIGN KEY (record_id, semester_id)
         REFERENCES student_semesters(record_id, semester_id)
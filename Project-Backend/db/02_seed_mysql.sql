@@ -1,3 +1,6 @@
+-- Demo and load-test data: python manage.py seed_synthetic --help
+-- (deterministic generator, api/management/commands/seed_synthetic.py).
+-- The statements below predate the current schema and stay disabled.
 -- -- 02_seed_mysql.sql
 -- INSERT IGNORE INTO student(first_name,last_name,email)
 -- VALUES ('Jane','Doe','j.doe@demo.edu');
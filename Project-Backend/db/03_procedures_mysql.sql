@@ -459,6 +459,9 @@ CREATE PROCEDURE add_presented_course (
     IN p_max_capacity     INT,
     IN p_on_days          VARCHAR(15),
     IN p_on_times         VARCHAR(20),
+    IN p_day_mask         TINYINT UNSIGNED,   -- on_days / on_times parsed
+    IN p_start_min        SMALLINT UNSIGNED,  -- by api/schedule.py
+    IN p_end_min          SMALLINT UNSIGNED,
     IN p_room_label       VARCHAR(50)  -- NULLABLE
 )
 BEGIN
@@ -513,41 +516,50 @@ BEGIN
         END IF;
     END IF;
 
-    /* ───── conflict check (room & time overlap) ────────────── */
-    IF v_room_id IS NOT NULL THEN
-        /*
+    /* ───── conflict checks over the parsed schedule ─────────
             Overlap logic:
-            • same semester AND same room
-            • day sets share at least one letter
-            • time ranges overlap   (startA < endB  AND  endA > startB)
-        */
-        IF EXISTS (
-            SELECT 1
-              FROM presented_courses pc
-             WHERE pc.semester_id = v_sem_id
-               AND pc.room_id     = v_room_id
-               AND pc.on_days REGEXP CONCAT('[', p_on_days ,']')   -- day overlap
-               AND (
-                     TIME(SUBSTRING_INDEX(pc.on_times,'-',1))
-                         < TIME(SUBSTRING_INDEX(p_on_times,'-',-1))
-                     AND
-                     TIME(SUBSTRING_INDEX(pc.on_times,'-',-1))
-                         > TIME(SUBSTRING_INDEX(p_on_times,'-',1))
-                   )
-        ) THEN
-            SIGNAL SQLSTATE '45000'
-                SET MESSAGE_TEXT = 'Room/time conflict with another section';
-        END IF;
+            • day sets share a bit       (maskA & maskB) <> 0
+            • time ranges overlap        startA < endB AND endA > startB
+            a range seek on start_min < p_end_min in
+            idx_pc_room_slot / idx_pc_prof_slot, no string parsing   */
+    IF v_room_id IS NOT NULL AND EXISTS (
+        SELECT 1
+          FROM presented_courses pc
+         WHERE pc.semester_id = v_sem_id
+           AND pc.room_id     = v_room_id
+           AND pc.start_min   < p_end_min
+           AND pc.end_min     > p_start_min
+           AND (pc.day_mask & p_day_mask) <> 0
+    ) THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Room/time conflict with another section';
+    END IF;
+
+    IF EXISTS (
+        SELECT 1
+          FROM presented_courses pc
+         WHERE pc.prof_id     = v_prof_id
+           AND pc.semester_id = v_sem_id
+           AND pc.start_min   < p_end_min
+           AND pc.end_min     > p_start_min
+           AND (pc.day_mask & p_day_mask) <> 0
+    ) THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Professor already teaches another section at that time';
     END IF;
 
     /* ───── insert section ──────────────────────────────────── */
     INSERT INTO presented_courses (
         pcid, prof_id, capacity, max_capacity,
-        semester_id, on_days, on_times, room_id, course_id
+        semester_id, on_days, on_times,
+        day_mask, start_min, end_min,
+        room_id, course_id
     )
     VALUES (
         v_pcid, v_prof_id, p_capacity, p_max_capacity,
-        v_sem_id, p_on_days, p_on_times, v_room_id, v_course_id
+        v_sem_id, p_on_days, p_on_times,
+        p_day_mask, p_start_min, p_end_min,
+        v_room_id, v_course_id
     );
 
     /* return new pcid */
@@ -701,36 +713,81 @@ BEGIN
 END//
 
 
-DROP PROCEDURE IF EXISTS add_taken_course_tx//
-CREATE PROCEDURE add_taken_course_tx (
+/*───────────────────────────────────────────────────────────────
+  list_semester_catalog – everything api/catalog.py indexes for one
+  semester, in three result sets:
+    1. sections (course_code order) with parsed schedule and seats
+    2. (pcid, did) for every department the professor works in
+    3. (major_id, did) so a major filter resolves in memory
+  list_semester_seats – just the seat counters, re-read when only
+  taken_courses changed.
+───────────────────────────────────────────────────────────────*/
+DROP PROCEDURE IF EXISTS list_semester_catalog//
+CREATE PROCEDURE list_semester_catalog (
+    IN p_semester_id CHAR(36)
+)
+BEGIN
+    SELECT pc.pcid,
+           c.course_code,
+           c.course_name,
+           pc.prof_id,
+           CONCAT(m.fname,' ',m.lname) AS professor,
+           pc.on_days,
+           pc.on_times,
+           pc.day_mask,
+           pc.start_min,
+           pc.end_min,
+           COALESCE(r.room_label,'TBA') AS room,
+           pc.capacity,
+           pc.max_capacity,
+           pc.seats_used
+    FROM   presented_courses pc
+    JOIN   courses      c  ON c.cid = pc.course_id
+    JOIN   members      m  ON m.mid = pc.prof_id
+    LEFT   JOIN rooms   r  ON r.rid = pc.room_id
+    WHERE  pc.semester_id = p_semester_id
+    ORDER  BY c.course_code, pc.pcid;
+
+    SELECT DISTINCT pc.pcid, w.did
+    FROM   presented_courses pc
+    JOIN   workers      w  ON w.member_id = pc.prof_id
+    WHERE  pc.semester_id = p_semester_id;
+
+    SELECT major_id, did FROM majors;
+END//
+
+DROP PROCEDURE IF EXISTS list_semester_seats//
+CREATE PROCEDURE list_semester_seats (
+    IN p_semester_id CHAR(36)
+)
+BEGIN
+    SELECT pcid, seats_used
+    FROM   presented_courses
+    WHERE  semester_id = p_semester_id;
+END//
+
+
+/*───────────────────────────────────────────────────────────────
+  take_seat / drop_reserved_seat – enrolment bodies WITHOUT
+  transaction control.  Callers own the transaction:
+  add_taken_course_tx / remove_reserved_course_tx for one seat, the
+  batch endpoint (one transaction, a SAVEPOINT per item) for many.
+───────────────────────────────────────────────────────────────*/
+DROP PROCEDURE IF EXISTS take_seat//
+CREATE PROCEDURE take_seat (
     IN p_record_id   CHAR(36),
     IN p_semester_id CHAR(36),
     IN p_pcid        CHAR(36),
     IN p_status      ENUM('RESERVED','TAKING','COMPLETED')
 )
 BEGIN
-    DECLARE v_max      INT;
-    DECLARE v_taken    INT;
     DECLARE v_pc_sem   CHAR(36);
+    DECLARE v_claimed  INT;
+    DECLARE v_day_mask TINYINT UNSIGNED;
+    DECLARE v_start    SMALLINT UNSIGNED;
+    DECLARE v_end      SMALLINT UNSIGNED;
 
-    /* 0. start transaction */
-    START TRANSACTION;
-
-    /* 1. lock the section row */
-    SELECT semester_id, max_capacity
-      INTO v_pc_sem, v_max
-      FROM presented_courses
-     WHERE pcid = p_pcid
-       FOR UPDATE;
-
-    IF v_pc_sem IS NULL THEN
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'presented_course not found';
-    END IF;
-    IF v_pc_sem <> p_semester_id THEN
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Course not offered that semester';
-    END IF;
-
-    /* 2. verify student_semester row exists */
+    /* 1. cheap guards, no locks taken --------------------------- */
     IF NOT EXISTS (
         SELECT 1 FROM student_semesters
          WHERE record_id = p_record_id AND semester_id = p_semester_id
@@ -738,7 +795,6 @@ BEGIN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'student_semester not found';
     END IF;
 
-    /* 3. duplicate enrolment check */
     IF EXISTS (
         SELECT 1 FROM taken_courses
          WHERE record_id = p_record_id
@@ -748,26 +804,77 @@ BEGIN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Already recorded for this section';
     END IF;
 
-    /* 4. capacity check (count only RESERVED + TAKING) */
-    SELECT COUNT(*) INTO v_taken
-      FROM taken_courses
-     WHERE pcid = p_pcid
-       AND status IN ('RESERVED','TAKING')
-       FOR UPDATE;
+    /* timetable clash with the student's live sections that semester
+       (same overlap rule as add_presented_course; a historical
+       COMPLETED row is never in the timetable) */
+    IF p_status <> 'COMPLETED' THEN
+        SELECT day_mask, start_min, end_min
+          INTO v_day_mask, v_start, v_end
+          FROM presented_courses
+         WHERE pcid = p_pcid;
 
-    IF v_taken >= v_max THEN
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Section is full';
+        IF EXISTS (
+            SELECT 1
+              FROM taken_courses     tc
+              JOIN presented_courses pc ON pc.pcid = tc.pcid
+             WHERE tc.record_id   = p_record_id
+               AND tc.semester_id = p_semester_id
+               AND tc.status     IN ('RESERVED','TAKING')
+               AND pc.start_min   < v_end
+               AND pc.end_min     > v_start
+               AND (pc.day_mask & v_day_mask) <> 0
+        ) THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Timetable clash with another enrolled section';
+        END IF;
+    END IF;
+
+    /* 2. claim a seat with one conditional single-row UPDATE --------
+          (replaces FOR UPDATE on the section + COUNT(*) FOR UPDATE
+           over taken_courses; the row lock is all we hold)          */
+    IF p_status = 'COMPLETED' THEN
+        /* historical row: needs a live section but holds no seat */
+        SELECT COUNT(*) INTO v_claimed
+          FROM presented_courses
+         WHERE pcid = p_pcid
+           AND semester_id = p_semester_id
+           AND seats_used < max_capacity;
+    ELSE
+        UPDATE presented_courses
+           SET seats_used = seats_used + 1
+         WHERE pcid = p_pcid
+           AND semester_id = p_semester_id
+           AND seats_used < max_capacity;
+        SET v_claimed = ROW_COUNT();
+    END IF;
+
+    IF v_claimed = 0 THEN
+        /* work out which guard failed, for the error message */
+        SELECT semester_id INTO v_pc_sem
+          FROM presented_courses WHERE pcid = p_pcid;
+
+        IF v_pc_sem IS NULL THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'presented_course not found';
+        ELSEIF v_pc_sem <> p_semester_id THEN
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Course not offered that semester';
+        ELSE
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Section is full';
+        END IF;
     END IF;
 
-    /* 5. insert */
+    /* 3. insert (PK still rejects a concurrent duplicate) ---------- */
     INSERT INTO taken_courses (record_id, semester_id, pcid, status)
     VALUES (p_record_id, p_semester_id, p_pcid, p_status);
 
-    COMMIT;
+    /* 4. a historical row is graded (0) – count it in the running GPA */
+    IF p_status = 'COMPLETED' THEN
+        UPDATE std_records
+           SET graded_cnt = graded_cnt + 1
+         WHERE record_id = p_record_id;
+    END IF;
 END//
 
-DROP PROCEDURE IF EXISTS remove_reserved_course_tx//
-CREATE PROCEDURE remove_reserved_course_tx (
+DROP PROCEDURE IF EXISTS drop_reserved_seat//
+CREATE PROCEDURE drop_reserved_seat (
     IN p_record_id   CHAR(36),
     IN p_semester_id CHAR(36),
     IN p_pcid        CHAR(36)
@@ -775,8 +882,6 @@ CREATE PROCEDURE remove_reserved_course_tx (
 BEGIN
     DECLARE v_status ENUM('RESERVED','TAKING','COMPLETED');
 
-    START TRANSACTION;
-
     /* lock the target row */
     SELECT status
       INTO v_status
@@ -802,9 +907,92 @@ BEGIN
        AND semester_id = p_semester_id
        AND pcid        = p_pcid;
 
+    /* give it back to the section counter */
+    UPDATE presented_courses
+       SET seats_used = seats_used - 1
+     WHERE pcid = p_pcid;
+END//
+
+DROP PROCEDURE IF EXISTS add_taken_course_tx//
+CREATE PROCEDURE add_taken_course_tx (
+    IN p_record_id   CHAR(36),
+    IN p_semester_id CHAR(36),
+    IN p_pcid        CHAR(36),
+    IN p_status      ENUM('RESERVED','TAKING','COMPLETED')
+)
+BEGIN
+    /* any error → undo the seat claim together with the insert */
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+    CALL take_seat(p_record_id, p_semester_id, p_pcid, p_status);
     COMMIT;
 END//
 
+DROP PROCEDURE IF EXISTS remove_reserved_course_tx//
+CREATE PROCEDURE remove_reserved_course_tx (
+    IN p_record_id   CHAR(36),
+    IN p_semester_id CHAR(36),
+    IN p_pcid        CHAR(36)
+)
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+    CALL drop_reserved_seat(p_record_id, p_semester_id, p_pcid);
+    COMMIT;
+END//
+
+/*───────────────────────────────────────────────────────────────
+  reconcile_seat_counters – recompute presented_courses.seats_used
+  from taken_courses, report every drifted section, optionally fix.
+  Run off-peak: enrolments racing the fix can still skew a counter.
+───────────────────────────────────────────────────────────────*/
+DROP PROCEDURE IF EXISTS reconcile_seat_counters//
+CREATE PROCEDURE reconcile_seat_counters (IN p_fix BOOLEAN)
+BEGIN
+    DROP TEMPORARY TABLE IF EXISTS tmp_seat_drift;
+
+    CREATE TEMPORARY TABLE tmp_seat_drift AS
+    SELECT pc.pcid,
+           pc.seats_used          AS counter,
+           COALESCE(t.actual, 0)  AS actual
+      FROM presented_courses pc
+      LEFT JOIN (
+            SELECT pcid, COUNT(*) AS actual
+              FROM taken_courses
+             WHERE status IN ('RESERVED','TAKING')
+             GROUP BY pcid
+           ) t ON t.pcid = pc.pcid
+     WHERE pc.seats_used <> COALESCE(t.actual, 0);
+
+    IF p_fix THEN
+        /* recount under the row lock rather than trusting the snapshot */
+        UPDATE presented_courses pc
+          JOIN tmp_seat_drift d ON d.pcid = pc.pcid
+           SET pc.seats_used = (
+                 SELECT COUNT(*)
+                   FROM taken_courses tc
+                  WHERE tc.pcid = pc.pcid
+                    AND tc.status IN ('RESERVED','TAKING')
+               );
+    END IF;
+
+    SELECT pcid, counter, actual, actual - counter AS drift
+      FROM tmp_seat_drift
+     ORDER BY pcid;
+
+    DROP TEMPORARY TABLE tmp_seat_drift;
+END//
+
 
 DROP PROCEDURE IF EXISTS list_members//
 CREATE PROCEDURE list_members ()
@@ -856,10 +1044,48 @@ BEGIN
     DELETE FROM departments WHERE sid = did;
 END//
 
+/*───────────────────────────────────────────────────────────────
+  delete_major – the FK cascade majors → std_records →
+  student_semesters → taken_courses fires no trigger, so the seats
+  those rows held are given back here: the sections they were in are
+  recounted in the same transaction (as reconcile_seat_counters does).
+───────────────────────────────────────────────────────────────*/
 DROP PROCEDURE IF EXISTS delete_major//
 CREATE PROCEDURE delete_major (IN p_major_id CHAR(36))
 BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        DROP TEMPORARY TABLE IF EXISTS tmp_major_sections;
+        RESIGNAL;
+    END;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_major_sections;
+
+    START TRANSACTION;
+
+    /* sections holding a seat for a student of this major */
+    CREATE TEMPORARY TABLE tmp_major_sections AS
+    SELECT DISTINCT tc.pcid
+      FROM taken_courses tc
+      JOIN std_records   sr ON sr.record_id = tc.record_id
+     WHERE sr.major_id = p_major_id
+       AND tc.status IN ('RESERVED','TAKING');
+
     DELETE FROM majors WHERE major_id = p_major_id;
+
+    UPDATE presented_courses pc
+      JOIN tmp_major_sections s ON s.pcid = pc.pcid
+       SET pc.seats_used = (
+             SELECT COUNT(*)
+               FROM taken_courses tc
+              WHERE tc.pcid = pc.pcid
+                AND tc.status IN ('RESERVED','TAKING')
+           );
+
+    COMMIT;
+
+    DROP TEMPORARY TABLE tmp_major_sections;
 END//
 
 
@@ -886,6 +1112,110 @@ BEGIN
     ORDER  BY m.lname, m.fname;
 END//
 
+/*───────────────────────────────────────────────────────────────
+  Keyset pages – list_members / list_courses / list_rooms /
+  list_students_in_section one page at a time.
+
+  p_after_* is the sort key of the last row of the previous page
+  (all NULL → first page).  The seek predicate is written out as
+  OR-ed comparisons so the optimizer can turn it into a range scan
+  on the matching index; callers pass p_limit = page size + 1 to
+  learn whether another page follows.
+───────────────────────────────────────────────────────────────*/
+DROP PROCEDURE IF EXISTS list_members_page//
+CREATE PROCEDURE list_members_page (
+    IN p_after_lname VARCHAR(100),
+    IN p_after_fname VARCHAR(100),
+    IN p_after_mid   CHAR(36),
+    IN p_limit       INT
+)
+BEGIN
+    SELECT
+        m.mid,
+        m.is_admin,
+        m.fname,
+        m.lname,
+        m.national_id,
+        m.birthday,
+        c.username,
+        c.last_login
+    FROM   members      AS m                 /* idx_members_name */
+    LEFT   JOIN credentials AS c ON c.member_id = m.mid
+    WHERE  p_after_mid IS NULL
+       OR  m.lname > p_after_lname
+       OR (m.lname = p_after_lname
+           AND (m.fname > p_after_fname
+                OR (m.fname = p_after_fname AND m.mid > p_after_mid)))
+    ORDER  BY m.lname, m.fname, m.mid
+    LIMIT  p_limit;
+END//
+
+DROP PROCEDURE IF EXISTS list_courses_page//
+CREATE PROCEDURE list_courses_page (
+    IN p_after_name VARCHAR(200),
+    IN p_limit      INT
+)
+BEGIN
+    /* course_name is UNIQUE → it is the whole key */
+    SELECT
+        cid,
+        course_code,
+        course_name
+    FROM   courses
+    WHERE  p_after_name IS NULL OR course_name > p_after_name
+    ORDER  BY course_name ASC
+    LIMIT  p_limit;
+END//
+
+DROP PROCEDURE IF EXISTS list_rooms_page//
+CREATE PROCEDURE list_rooms_page (
+    IN p_after_label VARCHAR(50),
+    IN p_limit       INT
+)
+BEGIN
+    /* room_label is UNIQUE → it is the whole key */
+    SELECT
+        rid,
+        room_label,
+        capacity
+    FROM   rooms
+    WHERE  p_after_label IS NULL OR room_label > p_after_label
+    ORDER  BY room_label
+    LIMIT  p_limit;
+END//
+
+DROP PROCEDURE IF EXISTS list_students_in_section_page//
+CREATE PROCEDURE list_students_in_section_page (
+    IN p_pcid         CHAR(36),
+    IN p_after_lname  VARCHAR(100),
+    IN p_after_fname  VARCHAR(100),
+    IN p_after_record CHAR(36),
+    IN p_limit        INT
+)
+BEGIN
+    /* a roster is at most max_capacity rows, reached through the
+       taken_courses(pcid) index; the seek only bounds the page */
+    SELECT
+        sr.student_number,
+        sr.record_id,
+        m.fname,
+        m.lname,
+        tc.status,
+        tc.grade
+    FROM   taken_courses      tc
+    JOIN   student_semesters  ss ON ss.record_id = tc.record_id and ss.semester_id = tc.semester_id
+    JOIN   std_records        sr ON sr.record_id = ss.record_id
+    JOIN   members            m  ON m.mid        = sr.mid
+    WHERE  tc.pcid = p_pcid
+      AND (p_after_record IS NULL
+           OR  m.lname > p_after_lname
+           OR (m.lname = p_after_lname
+               AND (m.fname > p_after_fname
+                    OR (m.fname = p_after_fname AND sr.record_id > p_after_record))))
+    ORDER  BY m.lname, m.fname, sr.record_id
+    LIMIT  p_limit;
+END//
+
 
 DROP PROCEDURE IF EXISTS list_sections_by_prof//
 CREATE PROCEDURE list_sections_by_prof (
@@ -916,11 +1246,20 @@ CREATE PROCEDURE set_student_grade_tx (
     IN p_prof_id   CHAR(36),        -- professor / admin doing the update
     IN p_record_id CHAR(36),        -- student’s record (degree file)
     IN p_pcid      CHAR(36),        -- presented_courses id
-    IN p_grade     DECIMAL(3,1)     -- 0-20 (adjust scale as needed)
+    IN p_grade     DECIMAL(3,1),    -- 0-20 (adjust scale as needed)
+    IN p_log_audit BOOLEAN          -- write grade_audit in this transaction
 )
 BEGIN
     DECLARE v_prof_id     CHAR(36);
     DECLARE v_semester_id CHAR(36);
+    DECLARE v_old_status  ENUM('RESERVED','TAKING','COMPLETED');
+    DECLARE v_old_grade   DECIMAL(4,2);
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
 
     /*── validate grade range (example 0-20) ───────────────────*/
     IF p_grade < 0 OR p_grade > 20 THEN
@@ -930,12 +1269,13 @@ BEGIN
 
     START TRANSACTION;
 
-    /*── 1. lock the section; retrieve prof_id + semester_id ───*/
+    /*── 1. lock the section; retrieve prof_id + semester_id ───
+           (exclusive: grading a live row releases its seat below) */
     SELECT prof_id, semester_id
       INTO v_prof_id, v_semester_id
       FROM presented_courses
      WHERE pcid = p_pcid
-       FOR SHARE;
+       FOR UPDATE;
 
     IF v_prof_id IS NULL THEN
         SIGNAL SQLSTATE '45000'
@@ -948,6 +1288,18 @@ BEGIN
     END IF;
 
     /*── 2. update the grade ----------------------------------*/
+    SELECT status, grade INTO v_old_status, v_old_grade
+      FROM taken_courses
+     WHERE record_id   = p_record_id
+       AND semester_id = v_semester_id
+       AND pcid        = p_pcid
+       FOR UPDATE;
+
+    IF v_old_status IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+          SET MESSAGE_TEXT = 'student not enrolled in this section';
+    END IF;
+
     UPDATE taken_courses
        SET grade  = p_grade,
            status = 'COMPLETED'
@@ -955,12 +1307,190 @@ BEGIN
        AND semester_id = v_semester_id
        AND pcid        = p_pcid;
 
-    IF ROW_COUNT() = 0 THEN
+    /*── 3. a COMPLETED row no longer holds a seat ──────────────*/
+    IF v_old_status <> 'COMPLETED' THEN
+        UPDATE presented_courses
+           SET seats_used = seats_used - 1
+         WHERE pcid = p_pcid;
+    END IF;
+
+    /*── 4. running GPA: regrade swaps the grade, first grade adds
+           one (trg_std_records_gpa derives gpa + the major row) ──*/
+    IF v_old_status = 'COMPLETED' THEN
+        UPDATE std_records
+           SET grade_sum = grade_sum - v_old_grade + p_grade
+         WHERE record_id = p_record_id;
+    ELSE
+        UPDATE std_records
+           SET grade_sum  = grade_sum + p_grade,
+               graded_cnt = graded_cnt + 1
+         WHERE record_id = p_record_id;
+    END IF;
+
+    /*── 5. audit entry, actor = the caller ────────────────────*/
+    IF p_log_audit AND NOT (v_old_grade <=> p_grade) THEN
+        INSERT INTO grade_audit (
+            record_id, semester_id, pcid,
+            old_grade, new_grade,
+            actor_mid
+        )
+        VALUES (p_record_id, v_semester_id, p_pcid,
+                v_old_grade, p_grade,
+                p_prof_id);
+    END IF;
+
+    COMMIT;
+
+    /* the change for an out-of-band audit sink (none if unchanged) */
+    SELECT p_record_id AS record_id, v_semester_id AS semester_id,
+           p_pcid AS pcid, v_old_grade AS old_grade, p_grade AS new_grade
+      FROM DUAL
+     WHERE NOT (v_old_grade <=> p_grade);
+END//
+
+/*───────────────────────────────────────────────────────────────
+  set_section_grades_tx – grade many students of ONE section
+  • p_grades: JSON array [{"record_id": "...", "grade": 17.5}, …]
+    (validated and de-duplicated by the caller)
+  • one lock on the section, one multi-row UPDATE, and (p_log_audit)
+    the grade_audit rows in a single INSERT … SELECT
+  • students not enrolled in the section are skipped, not fatal
+  • two result sets: one row per input (record_id, applied), then
+    the changed grades (record_id, semester_id, pcid, old, new)
+───────────────────────────────────────────────────────────────*/
+DROP PROCEDURE IF EXISTS set_section_grades_tx//
+CREATE PROCEDURE set_section_grades_tx (
+    IN p_prof_id   CHAR(36),        -- professor teaching it, NULL = admin
+    IN p_actor     CHAR(36),        -- member logged as actor_mid
+    IN p_pcid      CHAR(36),
+    IN p_grades    JSON,
+    IN p_log_audit BOOLEAN          -- write grade_audit in this transaction
+)
+BEGIN
+    DECLARE v_prof_id     CHAR(36);
+    DECLARE v_semester_id CHAR(36);
+    DECLARE v_rows        INT;
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        DROP TEMPORARY TABLE IF EXISTS tmp_section_grades;
+        RESIGNAL;
+    END;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_section_grades;
+    CREATE TEMPORARY TABLE tmp_section_grades (
+        record_id  CHAR(36) PRIMARY KEY,
+        grade      DECIMAL(3,1) NOT NULL,
+        enrolled   BOOLEAN NOT NULL DEFAULT FALSE,
+        old_status ENUM('RESERVED','TAKING','COMPLETED'),
+        old_grade  DECIMAL(4,2)
+    ) ENGINE = InnoDB;
+
+    INSERT INTO tmp_section_grades (record_id, grade)
+    SELECT j.record_id, j.grade
+      FROM JSON_TABLE(p_grades, '$[*]' COLUMNS (
+               record_id CHAR(36)     PATH '$.record_id',
+               grade     DECIMAL(3,1) PATH '$.grade'
+           )) j;
+
+    IF EXISTS (SELECT 1 FROM tmp_section_grades
+                WHERE grade < 0 OR grade > 20) THEN
         SIGNAL SQLSTATE '45000'
-          SET MESSAGE_TEXT = 'student not enrolled in this section';
+          SET MESSAGE_TEXT = 'grade must be between 0 and 20';
+    END IF;
+
+    START TRANSACTION;
+
+    /*── 1. lock the section once (same order as set_student_grade_tx) */
+    SELECT prof_id, semester_id
+      INTO v_prof_id, v_semester_id
+      FROM presented_courses
+     WHERE pcid = p_pcid
+       FOR UPDATE;
+
+    IF v_semester_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+          SET MESSAGE_TEXT = 'presented_course not found';
+    END IF;
+
+    IF p_prof_id IS NOT NULL AND NOT (v_prof_id <=> p_prof_id) THEN
+        SIGNAL SQLSTATE '45000'
+          SET MESSAGE_TEXT = 'You do not teach this section';
     END IF;
 
+    /*── 2. lock the section's rows, remember what they held ────*/
+    SELECT COUNT(*) INTO v_rows
+      FROM taken_courses
+     WHERE semester_id = v_semester_id
+       AND pcid        = p_pcid
+       FOR UPDATE;
+
+    UPDATE tmp_section_grades g
+      JOIN taken_courses tc
+        ON tc.record_id   = g.record_id
+       AND tc.semester_id = v_semester_id
+       AND tc.pcid        = p_pcid
+       SET g.enrolled   = TRUE,
+           g.old_status = tc.status,
+           g.old_grade  = tc.grade;
+
+    /*── 3. every grade in one statement ───────────────────────*/
+    UPDATE taken_courses tc
+      JOIN tmp_section_grades g
+        ON g.record_id    = tc.record_id
+       AND tc.semester_id = v_semester_id
+       AND tc.pcid        = p_pcid
+       SET tc.grade  = g.grade,
+           tc.status = 'COMPLETED';
+
+    IF p_log_audit THEN
+        INSERT INTO grade_audit (
+            record_id, semester_id, pcid,
+            old_grade, new_grade,
+            actor_mid
+        )
+        SELECT g.record_id, v_semester_id, p_pcid,
+               g.old_grade, g.grade,
+               p_actor
+          FROM tmp_section_grades g
+         WHERE g.enrolled
+           AND NOT (g.old_grade <=> g.grade);
+    END IF;
+
+    /*── 4. rows graded for the first time release their seat ───*/
+    UPDATE presented_courses
+       SET seats_used = seats_used - (
+               SELECT COUNT(*)
+                 FROM tmp_section_grades
+                WHERE enrolled
+                  AND old_status <> 'COMPLETED')
+     WHERE pcid = p_pcid;
+
+    /*── 5. running GPA, one row per student (see set_student_grade_tx) */
+    UPDATE std_records sr
+      JOIN tmp_section_grades g
+        ON g.record_id = sr.record_id
+       AND g.enrolled
+       SET sr.grade_sum  = sr.grade_sum + g.grade
+                         - IF(g.old_status = 'COMPLETED', COALESCE(g.old_grade, 0), 0),
+           sr.graded_cnt = sr.graded_cnt
+                         + IF(g.old_status = 'COMPLETED', 0, 1);
+
     COMMIT;
+
+    SELECT record_id, enrolled AS applied
+      FROM tmp_section_grades
+     ORDER BY record_id;
+
+    SELECT record_id, v_semester_id AS semester_id, p_pcid AS pcid,
+           old_grade, grade AS new_grade
+      FROM tmp_section_grades
+     WHERE enrolled
+       AND NOT (old_grade <=> grade)
+     ORDER BY record_id;
+
+    DROP TEMPORARY TABLE tmp_section_grades;
 END//
 
 DROP PROCEDURE IF EXISTS list_record_courses//
@@ -994,34 +1524,209 @@ BEGIN
 END//
 
 
+/*───────────────────────────────────────────────────────────────
+  Semester close-out, in chunks (driven by api/closeout.py)
+
+  begin_semester_closeout   flip is_active / end_date, create the
+                            progress row (or resume a FAILED one)
+  closeout_next_chunk       close the next p_chunk sections in pcid
+                            order: their rows → COMPLETED, running GPA
+                            updated, seats released, cursor advanced –
+                            all in one short transaction
+  finish_semester_closeout  mark DONE (after compute_semester_gpa)
+  fail_semester_closeout    mark FAILED with the error text
+
+  Replaces deactivate_semester, which did all of it in one statement
+  holding every enrolment row of the term.
+───────────────────────────────────────────────────────────────*/
 DROP PROCEDURE IF EXISTS deactivate_semester//
-CREATE PROCEDURE deactivate_semester (IN p_sid CHAR(36))
+
+DROP PROCEDURE IF EXISTS get_semester_closeout//
+CREATE PROCEDURE get_semester_closeout (IN p_sid CHAR(36))
+BEGIN
+    SELECT c.sid,
+           c.state,
+           c.total_sections,
+           c.done_sections,
+           s.end_date,
+           c.error,
+           c.started_at,
+           c.updated_at,
+           c.finished_at
+      FROM semester_closeouts c
+      JOIN semesters          s ON s.sid = c.sid
+     WHERE c.sid = p_sid;
+END//
+
+DROP PROCEDURE IF EXISTS begin_semester_closeout//
+CREATE PROCEDURE begin_semester_closeout (IN p_sid CHAR(36))
 BEGIN
-    DECLARE v_was_active BOOLEAN;
+    DECLARE v_active BOOLEAN;
+    DECLARE v_state  ENUM('RUNNING','DONE','FAILED');
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
 
     START TRANSACTION;
 
-    /* 1. flip the flag & set end_date = today ---------------------- */
-    UPDATE semesters
-       SET is_active = FALSE,
-           end_date  = CURDATE()
-     WHERE sid = p_sid;
+    SELECT is_active INTO v_active
+      FROM semesters
+     WHERE sid = p_sid
+       FOR UPDATE;
 
-    /*  did we actually change anything?  */
-    SET v_was_active = (ROW_COUNT() > 0);
+    IF v_active IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+          SET MESSAGE_TEXT = 'semester not found';
+    END IF;
+
+    SELECT state INTO v_state
+      FROM semester_closeouts
+     WHERE sid = p_sid
+       FOR UPDATE;
+
+    /* new close-out, or a finished one of a since re-activated term */
+    IF v_state IS NULL OR (v_state = 'DONE' AND v_active) THEN
+        UPDATE semesters
+           SET is_active = FALSE,
+               end_date  = CURDATE()
+         WHERE sid = p_sid;
+
+        REPLACE INTO semester_closeouts (sid, total_sections)
+        SELECT p_sid, COUNT(*)
+          FROM presented_courses
+         WHERE semester_id = p_sid;
+
+    ELSEIF v_state = 'FAILED' THEN
+        UPDATE semester_closeouts
+           SET state = 'RUNNING',
+               error = NULL
+         WHERE sid = p_sid;
+    END IF;
+    /* RUNNING / DONE: report as is */
+
+    COMMIT;
+
+    CALL get_semester_closeout(p_sid);
+END//
+
+DROP PROCEDURE IF EXISTS closeout_next_chunk//
+CREATE PROCEDURE closeout_next_chunk (
+    IN p_sid   CHAR(36),
+    IN p_chunk INT                  -- sections per transaction
+)
+BEGIN
+    DECLARE v_state ENUM('RUNNING','DONE','FAILED');
+    DECLARE v_after CHAR(36);
+    DECLARE v_last  CHAR(36);
+    DECLARE v_n     INT DEFAULT 0;
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    IF p_chunk IS NULL OR p_chunk < 1 THEN
+        SET p_chunk = 50;
+    END IF;
+
+    START TRANSACTION;
+
+    /* the progress row serialises concurrent drivers */
+    SELECT state, after_pcid INTO v_state, v_after
+      FROM semester_closeouts
+     WHERE sid = p_sid
+       FOR UPDATE;
+
+    IF v_state IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+          SET MESSAGE_TEXT = 'semester close-out does not exist';
+    END IF;
+
+    IF v_state = 'RUNNING' THEN
+        SELECT MAX(pcid), COUNT(*)
+          INTO v_last, v_n
+          FROM (
+                SELECT pcid
+                  FROM presented_courses
+                 WHERE semester_id = p_sid
+                   AND pcid        > v_after
+                 ORDER BY pcid
+                 LIMIT p_chunk
+               ) c;
+    END IF;
+
+    IF v_n > 0 THEN
+        /* 1. sections first – same lock order as set_student_grade_tx;
+              every row is COMPLETED below → no section holds a seat */
+        UPDATE presented_courses
+           SET seats_used = 0
+         WHERE semester_id = p_sid
+           AND pcid        > v_after
+           AND pcid       <= v_last;
+
+        /* 2. rows about to turn COMPLETED count toward the running GPA
+              with the grade they hold now */
+        UPDATE std_records sr
+          JOIN (
+                SELECT record_id,
+                       SUM(grade) AS add_sum,
+                       COUNT(*)   AS add_cnt
+                  FROM taken_courses
+                 WHERE semester_id = p_sid
+                   AND pcid        > v_after
+                   AND pcid       <= v_last
+                   AND status     <> 'COMPLETED'
+                 GROUP BY record_id
+               ) t ON t.record_id = sr.record_id
+           SET sr.grade_sum  = sr.grade_sum  + t.add_sum,
+               sr.graded_cnt = sr.graded_cnt + t.add_cnt;
 
-    /* 2. if the semester existed, mark course rows ---------------- */
-    IF v_was_active THEN
         UPDATE taken_courses
            SET status = 'COMPLETED'
          WHERE semester_id = p_sid
-           AND status <> 'COMPLETED';
-    ELSE
-        SIGNAL SQLSTATE '45000'
-          SET MESSAGE_TEXT = 'semester not found';
+           AND pcid        > v_after
+           AND pcid       <= v_last
+           AND status     <> 'COMPLETED';
+
+        /* 3. progress commits with the work */
+        UPDATE semester_closeouts
+           SET after_pcid    = v_last,
+               done_sections = done_sections + v_n
+         WHERE sid = p_sid;
     END IF;
 
     COMMIT;
+
+    SELECT v_n AS sections;         -- 0 → nothing left (or not RUNNING)
+END//
+
+DROP PROCEDURE IF EXISTS finish_semester_closeout//
+CREATE PROCEDURE finish_semester_closeout (IN p_sid CHAR(36))
+BEGIN
+    UPDATE semester_closeouts
+       SET state       = 'DONE',
+           finished_at = CURRENT_TIMESTAMP
+     WHERE sid   = p_sid
+       AND state = 'RUNNING';
+
+    CALL get_semester_closeout(p_sid);
+END//
+
+DROP PROCEDURE IF EXISTS fail_semester_closeout//
+CREATE PROCEDURE fail_semester_closeout (
+    IN p_sid   CHAR(36),
+    IN p_error VARCHAR(1000)
+)
+BEGIN
+    UPDATE semester_closeouts
+       SET state = 'FAILED',
+           error = LEFT(p_error, 255)
+     WHERE sid   = p_sid
+       AND state = 'RUNNING';
 END//
 
 
@@ -1167,24 +1872,8 @@ END//
 DROP PROCEDURE IF EXISTS list_student_semesters//
 CREATE PROCEDURE list_student_semesters (IN p_record_id CHAR(36))
 BEGIN
-    /*------------------------------------------------------------
-      1. Recalculate GPA for *each* semester of this student record
-         ▸ AVG ignores NULL grades
-         ▸ Only rows with at least one non-NULL grade are updated
-    ------------------------------------------------------------*/
-    UPDATE student_semesters AS ss
-    SET ss.sem_gpa = (
-        SELECT AVG(tc.grade)                       -- NULL-safe average
-          FROM taken_courses tc
-         WHERE tc.record_id   = ss.record_id
-           AND tc.semester_id = ss.semester_id
-           AND tc.grade IS NOT NULL
-    )
-    WHERE ss.record_id = p_record_id;
-
-    /*------------------------------------------------------------
-      2. Return all semesters for that record, newest first
-    ------------------------------------------------------------*/
+    /* sem_gpa is filled by compute_semester_gpa (semester close-out
+       or on demand) – this is a plain read */
     SELECT
         ss.semester_id,
         ss.sem_status,
@@ -1195,6 +1884,102 @@ BEGIN
 END//
 
 
+/*───────────────────────────────────────────────────────────────
+  compute_semester_gpa – set student_semesters.sem_gpa for every
+  record of one semester: AVG grade of its COMPLETED courses, NULL
+  when none.  One set-based UPDATE per chunk of p_chunk records (in
+  record_id order), each chunk its own short transaction, so grading
+  and enrolment are never blocked behind the whole semester.
+  Returns the number of student_semesters rows visited.
+───────────────────────────────────────────────────────────────*/
+DROP PROCEDURE IF EXISTS compute_semester_gpa//
+CREATE PROCEDURE compute_semester_gpa (
+    IN p_sid   CHAR(36),
+    IN p_chunk INT                  -- records per transaction
+)
+BEGIN
+    DECLARE v_after CHAR(36) DEFAULT '';
+    DECLARE v_last  CHAR(36);
+    DECLARE v_rows  INT;
+    DECLARE v_total INT DEFAULT 0;
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    IF NOT EXISTS (SELECT 1 FROM semesters WHERE sid = p_sid) THEN
+        SIGNAL SQLSTATE '45000'
+          SET MESSAGE_TEXT = 'semester not found';
+    END IF;
+
+    IF p_chunk IS NULL OR p_chunk < 1 THEN
+        SET p_chunk = 500;
+    END IF;
+
+    chunk_loop: LOOP
+        /* upper bound of the next chunk (FK index: semester_id, record_id) */
+        SELECT MAX(record_id), COUNT(*)
+          INTO v_last, v_rows
+          FROM (
+                SELECT record_id
+                  FROM student_semesters
+                 WHERE semester_id = p_sid
+                   AND record_id   > v_after
+                 ORDER BY record_id
+                 LIMIT p_chunk
+               ) c;
+
+        IF v_rows = 0 THEN
+            LEAVE chunk_loop;
+        END IF;
+
+        START TRANSACTION;
+
+        UPDATE student_semesters ss
+          LEFT JOIN (
+                SELECT record_id, AVG(grade) AS gpa
+                  FROM taken_courses
+                 WHERE semester_id = p_sid
+                   AND record_id   > v_after
+                   AND record_id  <= v_last
+                   AND status      = 'COMPLETED'
+                 GROUP BY record_id
+               ) t ON t.record_id = ss.record_id
+           SET ss.sem_gpa = t.gpa
+         WHERE ss.semester_id = p_sid
+           AND ss.record_id   > v_after
+           AND ss.record_id  <= v_last;
+
+        COMMIT;
+
+        SET v_total = v_total + v_rows;
+        SET v_after = v_last;
+    END LOOP;
+
+    SELECT v_total AS records;
+END//
+
+
+DROP PROCEDURE IF EXISTS list_term_gpa//
+CREATE PROCEDURE list_term_gpa (IN p_record_id CHAR(36))
+BEGIN
+    /* term-by-term history from the stored sem_gpa, oldest first */
+    SELECT
+        ss.semester_id,
+        s.sem_title,
+        s.start_date,
+        s.end_date,
+        ss.sem_status,
+        ss.sem_gpa
+    FROM   student_semesters ss
+    JOIN   semesters         s ON s.sid = ss.semester_id
+    WHERE  ss.record_id = p_record_id
+    ORDER  BY s.start_date, s.sid;
+END//
+
+
 
 DROP PROCEDURE IF EXISTS list_student_records//
 CREATE PROCEDURE list_student_records (IN p_mid CHAR(36))
@@ -1214,7 +1999,7 @@ END//
 DROP PROCEDURE IF EXISTS list_taken_courses//
 CREATE PROCEDURE list_taken_courses (
     IN p_mid         CHAR(36),      -- whose member
-    IN p_semester_id CHAR(36)       -- optional filter, '' = all
+    IN p_semester_id CHAR(36)       -- optional filter, NULL (or '') = all
 )
 BEGIN
     /* 1. iterate over that member's records */
@@ -1237,7 +2022,8 @@ BEGIN
     JOIN   members            mp ON mp.mid         = pc.prof_id
     LEFT   JOIN rooms         r  ON r.rid          = pc.room_id
     WHERE  sr.mid = p_mid
-      AND (p_semester_id = '' OR tc.semester_id = p_semester_id)
+      AND (p_semester_id IS NULL OR p_semester_id = ''
+           OR tc.semester_id = p_semester_id)
     ORDER  BY tc.semester_id, c.course_code;
 END//
 
@@ -1245,23 +2031,94 @@ END//
 DROP PROCEDURE IF EXISTS calc_record_gpa//
 CREATE PROCEDURE calc_record_gpa (IN p_record_id CHAR(36))
 BEGIN
-    DECLARE v_gpa DECIMAL(4,2);
+    /* std_records.gpa is kept current by the grading procedures;
+       always one row, NULL for an ungraded / unknown record */
+    SELECT (
+        SELECT gpa
+          FROM std_records
+         WHERE record_id = p_record_id
+    ) AS gpa;
+END//
 
-    /* Average of COMPLETED courses with a non-NULL grade (0–20 scale) */
-    SELECT AVG(grade)
-      INTO v_gpa
-      FROM taken_courses
-     WHERE record_id = p_record_id
-       AND status     = 'COMPLETED'
-       AND grade IS NOT NULL;
 
-    /* Persist the result in std_records.gpa (optional but useful) */
-    UPDATE std_records
-       SET gpa = v_gpa
-     WHERE record_id = p_record_id;
+/*───────────────────────────────────────────────────────────────
+  reconcile_gpa_stats – recompute std_records.grade_sum/graded_cnt
+  from COMPLETED taken_courses and major_gpa_stats from std_records,
+  report every drifted row, optionally fix.
+  kind = 'record' → id is a record_id, 'major' → a major_id.
+───────────────────────────────────────────────────────────────*/
+DROP PROCEDURE IF EXISTS reconcile_gpa_stats//
+CREATE PROCEDURE reconcile_gpa_stats (IN p_fix BOOLEAN)
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        DROP TEMPORARY TABLE IF EXISTS tmp_gpa_drift;
+        RESIGNAL;
+    END;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_gpa_drift;
+
+    CREATE TEMPORARY TABLE tmp_gpa_drift AS
+    SELECT 'record'                   AS kind,
+           sr.record_id               AS id,
+           sr.grade_sum               AS counter_sum,
+           sr.graded_cnt              AS counter_cnt,
+           COALESCE(t.actual_sum, 0)  AS actual_sum,
+           COALESCE(t.actual_cnt, 0)  AS actual_cnt
+      FROM std_records sr
+      LEFT JOIN (
+            SELECT record_id, SUM(grade) AS actual_sum, COUNT(*) AS actual_cnt
+              FROM taken_courses
+             WHERE status = 'COMPLETED'
+             GROUP BY record_id
+           ) t ON t.record_id = sr.record_id
+     WHERE sr.grade_sum  <> COALESCE(t.actual_sum, 0)
+        OR sr.graded_cnt <> COALESCE(t.actual_cnt, 0)
+        OR NOT (sr.gpa <=> IF(COALESCE(t.actual_cnt, 0) > 0,
+                              ROUND(t.actual_sum / t.actual_cnt, 2), NULL));
+
+    INSERT INTO tmp_gpa_drift
+    SELECT 'major', m.major_id,
+           COALESCE(s.gpa_sum, 0), COALESCE(s.gpa_cnt, 0),
+           COALESCE(a.actual_sum, 0), COALESCE(a.actual_cnt, 0)
+      FROM majors m
+      LEFT JOIN major_gpa_stats s ON s.major_id = m.major_id
+      LEFT JOIN (
+            SELECT major_id, SUM(gpa) AS actual_sum, COUNT(gpa) AS actual_cnt
+              FROM std_records
+             GROUP BY major_id
+           ) a ON a.major_id = m.major_id
+     WHERE COALESCE(s.gpa_sum, 0) <> COALESCE(a.actual_sum, 0)
+        OR COALESCE(s.gpa_cnt, 0) <> COALESCE(a.actual_cnt, 0);
+
+    IF p_fix THEN
+        START TRANSACTION;
+
+        /* records first – the triggers move their major rows along */
+        UPDATE std_records sr
+          JOIN tmp_gpa_drift d ON d.kind = 'record' AND d.id = sr.record_id
+           SET sr.grade_sum  = d.actual_sum,
+               sr.graded_cnt = d.actual_cnt,
+               sr.gpa        = IF(d.actual_cnt > 0,
+                                  ROUND(d.actual_sum / d.actual_cnt, 2), NULL);
+
+        /* …then rebuild the per-major rows outright */
+        DELETE FROM major_gpa_stats;
+        INSERT INTO major_gpa_stats (major_id, gpa_sum, gpa_cnt)
+        SELECT major_id, SUM(gpa), COUNT(gpa)
+          FROM std_records
+         WHERE gpa IS NOT NULL
+         GROUP BY major_id;
+
+        COMMIT;
+    END IF;
+
+    SELECT kind, id, counter_sum, counter_cnt, actual_sum, actual_cnt
+      FROM tmp_gpa_drift
+     ORDER BY kind DESC, id;
 
-    /* Return to caller */
-    SELECT v_gpa AS gpa;
+    DROP TEMPORARY TABLE tmp_gpa_drift;
 END//
 
 
@@ -1440,27 +2297,58 @@ BEGIN
 END//
 
 
+/* grade_audit is written by the grade procedures themselves, one
+   INSERT per transaction (or by api/audit.py) – no per-row trigger */
 DROP TRIGGER IF EXISTS trg_taken_courses_grade_log//
-CREATE TRIGGER trg_taken_courses_grade_log
-BEFORE UPDATE ON taken_courses
+
+/*───────────────────────────────────────────────────────────────
+  std_records running GPA
+  • gpa is derived from grade_sum / graded_cnt on every change,
+  • major_gpa_stats follows each record's gpa (and major).
+  FK cascades don't fire triggers – reconcile_gpa_stats covers them.
+───────────────────────────────────────────────────────────────*/
+DROP TRIGGER IF EXISTS trg_std_records_gpa//
+CREATE TRIGGER trg_std_records_gpa
+BEFORE UPDATE ON std_records
 FOR EACH ROW
 BEGIN
-    /* fire *only* if the grade is different (NULL-safe) */
-    IF NOT (NEW.grade <=> OLD.grade) THEN
-        INSERT INTO grade_audit (
-            record_id, semester_id, pcid,
-            old_grade, new_grade,
-            actor_mid
-        )
-        VALUES (
-            OLD.record_id,
-            OLD.semester_id,
-            OLD.pcid,
-            OLD.grade,
-            NEW.grade,
-            COALESCE(@current_mid,
-                     '00000000-0000-0000-0000-000000000000')
-        );
+    IF NEW.grade_sum <> OLD.grade_sum OR NEW.graded_cnt <> OLD.graded_cnt THEN
+        SET NEW.gpa = IF(NEW.graded_cnt > 0,
+                         ROUND(NEW.grade_sum / NEW.graded_cnt, 2), NULL);
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_std_records_major_gpa//
+CREATE TRIGGER trg_std_records_major_gpa
+AFTER UPDATE ON std_records
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.gpa <=> OLD.gpa) OR NEW.major_id <> OLD.major_id THEN
+        IF OLD.gpa IS NOT NULL THEN
+            UPDATE major_gpa_stats
+               SET gpa_sum = gpa_sum - OLD.gpa,
+                   gpa_cnt = gpa_cnt - 1
+             WHERE major_id = OLD.major_id;
+        END IF;
+        IF NEW.gpa IS NOT NULL THEN
+            INSERT INTO major_gpa_stats (major_id, gpa_sum, gpa_cnt)
+            VALUES (NEW.major_id, NEW.gpa, 1)
+            ON DUPLICATE KEY UPDATE gpa_sum = gpa_sum + NEW.gpa,
+                                    gpa_cnt = gpa_cnt + 1;
+        END IF;
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_std_records_major_gpa_del//
+CREATE TRIGGER trg_std_records_major_gpa_del
+AFTER DELETE ON std_records
+FOR EACH ROW
+BEGIN
+    IF OLD.gpa IS NOT NULL THEN
+        UPDATE major_gpa_stats
+           SET gpa_sum = gpa_sum - OLD.gpa,
+               gpa_cnt = gpa_cnt - 1
+         WHERE major_id = OLD.major_id;
     END IF;
 END//
 DELIMITER ;
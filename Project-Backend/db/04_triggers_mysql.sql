@@ -40,26 +40,57 @@ BEGIN
 END//
 
 
+/* grade_audit is written by the grade procedures themselves, one
+   INSERT per transaction (or by api/audit.py) – no per-row trigger */
 DROP TRIGGER IF EXISTS trg_taken_courses_grade_log//
-CREATE TRIGGER trg_taken_courses_grade_log
-BEFORE UPDATE ON taken_courses
+
+/*───────────────────────────────────────────────────────────────
+  std_records running GPA
+  • gpa is derived from grade_sum / graded_cnt on every change,
+  • major_gpa_stats follows each record's gpa (and major).
+  FK cascades don't fire triggers – reconcile_gpa_stats covers them.
+───────────────────────────────────────────────────────────────*/
+DROP TRIGGER IF EXISTS trg_std_records_gpa//
+CREATE TRIGGER trg_std_records_gpa
+BEFORE UPDATE ON std_records
+FOR EACH ROW
+BEGIN
+    IF NEW.grade_sum <> OLD.grade_sum OR NEW.graded_cnt <> OLD.graded_cnt THEN
+        SET NEW.gpa = IF(NEW.graded_cnt > 0,
+                         ROUND(NEW.grade_sum / NEW.graded_cnt, 2), NULL);
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_std_records_major_gpa//
+CREATE TRIGGER trg_std_records_major_gpa
+AFTER UPDATE ON std_records
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.gpa <=> OLD.gpa) OR NEW.major_id <> OLD.major_id THEN
+        IF OLD.gpa IS NOT NULL THEN
+            UPDATE major_gpa_stats
+               SET gpa_sum = gpa_sum - OLD.gpa,
+                   gpa_cnt = gpa_cnt - 1
+             WHERE major_id = OLD.major_id;
+        END IF;
+        IF NEW.gpa IS NOT NULL THEN
+            INSERT INTO major_gpa_stats (major_id, gpa_sum, gpa_cnt)
+            VALUES (NEW.major_id, NEW.gpa, 1)
+            ON DUPLICATE KEY UPDATE gpa_sum = gpa_sum + NEW.gpa,
+                                    gpa_cnt = gpa_cnt + 1;
+        END IF;
+    END IF;
+END//
+
+DROP TRIGGER IF EXISTS trg_std_records_major_gpa_del//
+CREATE TRIGGER trg_std_records_major_gpa_del
+AFTER DELETE ON std_records
 FOR EACH ROW
 BEGIN
-    /* fire *only* if the grade is different (NULL-safe) */
-    IF NOT (NEW.grade <=> OLD.grade) THEN
-        INSERT INTO grade_audit (
-            record_id, semester_id, pcid,
-            old_grade, new_grade,
-            actor_mid
-        )
-        VALUES (
-            OLD.record_id,
-            OLD.semester_id,
-            OLD.pcid,
-            OLD.grade,
-            NEW.grade,
-            COALESCE(@current_mid,
-                     '00000000-0000-0000-0000-000000000000')
-        );
+    IF OLD.gpa IS NOT NULL THEN
+        UPDATE major_gpa_stats
+           SET gpa_sum = gpa_sum - OLD.gpa,
+               gpa_cnt = gpa_cnt - 1
+         WHERE major_id = OLD.major_id;
     END IF;
 END//
\ No newline at end of file
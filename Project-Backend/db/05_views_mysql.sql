@@ -6,29 +6,24 @@
 USE university;
 
 -- ── View 1: GPA per student-record  ----------------------------------------
+/* std_records.gpa is maintained by the grading procedures (see
+   trg_std_records_gpa), so this is a plain column read now */
 CREATE OR REPLACE VIEW vw_record_gpa AS
 SELECT
     sr.record_id,
     sr.major_id,
-    /* AVG ignores NULL so ungraded records → NULL */
-    (
-        SELECT AVG(tc.grade)
-        FROM   taken_courses tc
-        WHERE  tc.record_id = sr.record_id
-          AND  tc.status     = 'COMPLETED'
-          AND  tc.grade IS NOT NULL
-    ) AS gpa
+    sr.gpa                                  -- NULL until a course is graded
 FROM std_records sr;
 
 -- ── View 2: average GPA per major  ----------------------------------------
+/* average of the records' GPAs, from the running totals in major_gpa_stats */
 CREATE OR REPLACE VIEW vw_major_avg_gpa AS
 SELECT
     m.major_id,
     m.major_name,
-    ROUND(AVG(rg.gpa), 2) AS avg_gpa        -- NULL-aware average
+    ROUND(s.gpa_sum / NULLIF(s.gpa_cnt, 0), 2) AS avg_gpa   -- NULL: no GPA yet
 FROM   majors m
-LEFT JOIN vw_record_gpa rg ON rg.major_id = m.major_id
-GROUP BY m.major_id, m.major_name
+LEFT JOIN major_gpa_stats s ON s.major_id = m.major_id
 ORDER BY m.major_name;
 
 
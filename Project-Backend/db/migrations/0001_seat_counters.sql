@@ -0,0 +1,20 @@
+/*───────────────────────────────────────────────────────────────
+  0001_seat_counters.sql
+  presented_courses.seats_used – maintained seat counter used by
+  add_taken_course_tx instead of COUNT(*) … FOR UPDATE.
+───────────────────────────────────────────────────────────────*/
+USE university;
+
+ALTER TABLE presented_courses
+    ADD COLUMN seats_used INT NOT NULL DEFAULT 0 AFTER max_capacity,
+    ADD CONSTRAINT chk_seats_used CHECK (seats_used >= 0);
+
+/* backfill: RESERVED + TAKING rows per section */
+UPDATE presented_courses pc
+  LEFT JOIN (
+        SELECT pcid, COUNT(*) AS actual
+          FROM taken_courses
+         WHERE status IN ('RESERVED','TAKING')
+         GROUP BY pcid
+       ) t ON t.pcid = pc.pcid
+   SET pc.seats_used = COALESCE(t.actual, 0);
@@ -0,0 +1,11 @@
+/*───────────────────────────────────────────────────────────────
+  0002_keyset_indexes.sql
+  Index behind the keyset-paginated member list (list_members_page,
+  seek on (lname, fname, mid)).  courses.course_name and
+  rooms.room_label are already UNIQUE, section rosters are bounded by
+  max_capacity and reached through the taken_courses(pcid) FK index.
+───────────────────────────────────────────────────────────────*/
+USE university;
+
+ALTER TABLE members
+    ADD INDEX idx_members_name (lname, fname, mid);
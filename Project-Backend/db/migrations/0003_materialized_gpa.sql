@@ -0,0 +1,42 @@
+/*───────────────────────────────────────────────────────────────
+  0003_materialized_gpa.sql
+  Running GPA state instead of recomputing AVG(grade) on every read:
+  • std_records.grade_sum / graded_cnt – Σ and count of COMPLETED
+    grades, kept by set_student_grade_tx, deactivate_semester and
+    take_seat; std_records.gpa is derived from them by a trigger,
+  • major_gpa_stats – Σ / count of record GPAs per major, kept by
+    triggers on std_records; read by vw_major_avg_gpa.
+  Reload 03_procedures_mysql.sql (procedures + triggers) and
+  05_views_mysql.sql afterwards.
+───────────────────────────────────────────────────────────────*/
+USE university;
+
+ALTER TABLE std_records
+    ADD COLUMN grade_sum  DECIMAL(10,2) NOT NULL DEFAULT 0 AFTER gpa,
+    ADD COLUMN graded_cnt INT           NOT NULL DEFAULT 0 AFTER grade_sum;
+
+CREATE TABLE major_gpa_stats (
+    major_id CHAR(36)      PRIMARY KEY,
+    gpa_sum  DECIMAL(12,2) NOT NULL DEFAULT 0,
+    gpa_cnt  INT           NOT NULL DEFAULT 0,
+    FOREIGN KEY (major_id) REFERENCES majors(major_id)
+        ON DELETE CASCADE
+) ENGINE = InnoDB;
+
+/* backfill: COMPLETED rows per record (the old views' definition) */
+UPDATE std_records sr
+  LEFT JOIN (
+        SELECT record_id, SUM(grade) AS s, COUNT(*) AS n
+          FROM taken_courses
+         WHERE status = 'COMPLETED'
+         GROUP BY record_id
+       ) t ON t.record_id = sr.record_id
+   SET sr.grade_sum  = COALESCE(t.s, 0),
+       sr.graded_cnt = COALESCE(t.n, 0),
+       sr.gpa        = IF(t.n > 0, ROUND(t.s / t.n, 2), NULL);
+
+INSERT INTO major_gpa_stats (major_id, gpa_sum, gpa_cnt)
+SELECT major_id, SUM(gpa), COUNT(gpa)
+  FROM std_records
+ WHERE gpa IS NOT NULL
+ GROUP BY major_id;
@@ -0,0 +1,22 @@
+/*───────────────────────────────────────────────────────────────
+  0004_semester_closeouts.sql
+  Progress table of the chunked close-out that replaces
+  deactivate_semester (begin_semester_closeout / closeout_next_chunk /
+  finish_semester_closeout, driven by api/closeout.py).
+───────────────────────────────────────────────────────────────*/
+USE university;
+
+CREATE TABLE semester_closeouts (
+    sid            CHAR(36) PRIMARY KEY,
+    state          ENUM('RUNNING','DONE','FAILED') NOT NULL DEFAULT 'RUNNING',
+    total_sections INT      NOT NULL,
+    done_sections  INT      NOT NULL DEFAULT 0,
+    after_pcid     CHAR(36) NOT NULL DEFAULT '',
+    error          VARCHAR(255),
+    started_at     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at     TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                             ON UPDATE CURRENT_TIMESTAMP,
+    finished_at    TIMESTAMP NULL,
+    FOREIGN KEY (sid) REFERENCES semesters(sid)
+        ON DELETE CASCADE
+) ENGINE = InnoDB;
@@ -0,0 +1,42 @@
+/*───────────────────────────────────────────────────────────────
+  0005_access_path_indexes.sql
+  One secondary index per hot access path of the stored procedures.
+  Where an index leads with a foreign-key column it also enforces that
+  FK, and InnoDB drops the implicit single-column FK index for it.
+
+  taken_courses
+    (pcid, status)               list_students_in_section[_page],
+                                 list_low_enrolment_courses,
+                                 reconcile_seat_counters
+    (semester_id, pcid, status)  closeout_next_chunk, set_section_grades_tx
+  presented_courses
+    (semester_id, room_id)       add_presented_course room conflict,
+                                 list_presented_courses, close-out
+    (prof_id, semester_id)       list_sections_by_prof,
+                                 list_professor_course_load
+  workers
+    (did, staff_role, end_date)  trg_one_head_per_dept, list_departments
+    (staff_role, member_id)      list_staff_by_role, course load
+  semesters
+    (is_active, start_date)      "the active semester" lookups
+    (sem_title)                  add_presented_course
+
+  Check the plans afterwards:  python manage.py check_query_plans
+───────────────────────────────────────────────────────────────*/
+USE university;
+
+ALTER TABLE taken_courses
+    ADD INDEX idx_tc_pcid_status   (pcid, status),
+    ADD INDEX idx_tc_semester_pcid (semester_id, pcid, status);
+
+ALTER TABLE presented_courses
+    ADD INDEX idx_pc_semester_room (semester_id, room_id),
+    ADD INDEX idx_pc_prof_semester (prof_id, semester_id);
+
+ALTER TABLE workers
+    ADD INDEX idx_workers_did_role (did, staff_role, end_date),
+    ADD INDEX idx_workers_role     (staff_role, member_id);
+
+ALTER TABLE semesters
+    ADD INDEX idx_semesters_active (is_active, start_date),
+    ADD INDEX idx_semesters_title  (sem_title);
@@ -0,0 +1,33 @@
+/*───────────────────────────────────────────────────────────────
+  0006_schedule_columns.sql
+  presented_courses keeps on_days / on_times as typed and gets their
+  parsed form next to them (api/schedule.py):
+
+    day_mask   TINYINT   M=1 T=2 W=4 R=8 F=16 S=32 U=64
+    start_min  SMALLINT  minutes after midnight
+    end_min    SMALLINT
+
+  Room conflicts, professor double-booking (add_presented_course) and
+  student timetable clashes (take_seat) compare these integers instead
+  of REGEXP / SUBSTRING_INDEX / TIME() over every section of the room.
+  The two indexes of 0005 on presented_courses gain start_min as their
+  last column, so the overlap test is a range inside the index.
+
+  Existing rows start at day_mask 0 / NULL times (never conflict) –
+  fill them afterwards:  python manage.py backfill_schedule
+───────────────────────────────────────────────────────────────*/
+USE university;
+
+ALTER TABLE presented_courses
+    ADD COLUMN day_mask  TINYINT UNSIGNED NOT NULL DEFAULT 0 AFTER on_times,
+    ADD COLUMN start_min SMALLINT UNSIGNED AFTER day_mask,
+    ADD COLUMN end_min   SMALLINT UNSIGNED AFTER start_min;
+
+-- new indexes first: they take over the prof_id / semester_id FKs
+ALTER TABLE presented_courses
+    ADD INDEX idx_pc_room_slot (semester_id, room_id, start_min),
+    ADD INDEX idx_pc_prof_slot (prof_id, semester_id, start_min);
+
+ALTER TABLE presented_courses
+    DROP INDEX idx_pc_semester_room,
+    DROP INDEX idx_pc_prof_semester;
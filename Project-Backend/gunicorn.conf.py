@@ -0,0 +1,128 @@
+# gunicorn.conf.py
+"""
+Production server – replaces `manage.py runserver` (Dockerfile):
+
+    DJANGO_SETTINGS_MODULE=university.settings_production \\
+        gunicorn -c gunicorn.conf.py
+
+SERVER_INTERFACE   wsgi (default) → university/wsgi.py, threaded workers
+                   asgi           → university/asgi.py, uvicorn workers
+WEB_CONCURRENCY    worker processes (default: from the CPUs, see below)
+GUNICORN_THREADS   threads per WSGI worker (default 4; 1 → sync workers)
+GUNICORN_BIND      default 0.0.0.0:8071
+GUNICORN_TIMEOUT   s a worker may stay silent before it is killed (30)
+GUNICORN_MAX_REQUESTS  recycle a worker after that many requests (0 = never)
+GUNICORN_ACCESS_LOG    "-" → stdout, unset → off
+GUNICORN_RELOAD    1 → restart workers on code changes (development;
+                   turns preloading off)
+
+The app is loaded once in the master and the workers fork from it
+(api/preload.py: routes, stored-procedure statements, gc.freeze()).
+Semester close-outs left RUNNING by the previous server are resumed in
+a separate process at start-up (api/closeout.py).
+
+Reloading:
+    kill -HUP  <master>   new workers, old ones finish their requests
+                          (up to GUNICORN_GRACEFUL_TIMEOUT); the code
+                          is the preloaded one – settings/env only
+    kill -USR2 <master>   new master + workers on the new code, then
+    kill -QUIT <old>      the old master once the new one is up
+"""
+import glob
+import multiprocessing
+import os
+
+_asgi = os.getenv("SERVER_INTERFACE", "wsgi") == "asgi"
+
+wsgi_app = "university.asgi:application" if _asgi else "university.wsgi:application"
+bind     = os.getenv("GUNICORN_BIND", "0.0.0.0:8071")
+
+
+def _cpus():
+    try:
+        return len(os.sched_getaffinity(0))      # respects taskset / cpusets
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+# ---- processes × threads ------------------------------------------
+# Every thread may hold a MySQL connection (or wait for a DB_POOL slot),
+# so workers × threads must stay well under max_connections.
+#   sync    2 × CPUs + 1 – one request per process, cover blocking I/O
+#   gthread CPUs + 1     – the threads cover the I/O waits
+#   asgi    CPUs         – one event loop per core
+threads = 1 if _asgi else max(1, int(os.getenv("GUNICORN_THREADS", "4")))
+
+if _asgi:
+    worker_class = "uvicorn.workers.UvicornWorker"
+elif threads > 1:
+    worker_class = "gthread"
+else:
+    worker_class = "sync"
+
+if os.getenv("WEB_CONCURRENCY"):
+    workers = int(os.getenv("WEB_CONCURRENCY"))
+elif _asgi:
+    workers = _cpus()
+elif threads > 1:
+    workers = _cpus() + 1
+else:
+    workers = _cpus() * 2 + 1
+
+# ---- lifecycle ----------------------------------------------------
+timeout          = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive        = int(os.getenv("GUNICORN_KEEPALIVE", "5"))     # s, behind a proxy
+max_requests        = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10     # recycled workers don't restart together
+
+reload      = os.getenv("GUNICORN_RELOAD", "0") == "1"
+preload_app = not reload                     # gunicorn can't reload a preloaded app
+
+# heartbeat file in memory, not on a (possibly overlay) disk
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog  = "-"
+loglevel  = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # runs in the master after the preloaded app is imported and before
+    # the first worker is forked
+    import django
+    django.setup()
+    from api.cache import shared
+    if server.cfg.workers > 1 and not shared():
+        # each worker would keep its own identities, versions and tickets
+        raise RuntimeError("more than one worker needs a shared cache (REDIS_URL)")
+
+    from django.conf import settings
+    if settings.METRICS_ENABLED:
+        if server.cfg.workers > 1 and not settings.METRICS_DIR:
+            # /api/metrics would show whichever worker answered the scrape
+            raise RuntimeError("METRICS_ENABLED with more than one worker needs METRICS_DIR")
+        if settings.METRICS_DIR:
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+            for path in glob.glob(os.path.join(settings.METRICS_DIR, "metrics-*.json")):
+                os.remove(path)        # counters restart with the server
+
+    if server.cfg.preload_app:
+        from api.preload import preload
+        preload()
+
+    # close-outs whose driver died with the previous server
+    from api import closeout
+    from api.db import DBError
+    try:
+        sids = closeout.running()
+    except DBError as exc:
+        server.log.warning("unfinished close-outs not checked: %s", exc.msg)
+    else:
+        if sids:
+            server.log.info("resuming %d close-out(s)", len(sids))
+            closeout.spawn(*sids)
+    finally:
+        from django.db import connections
+        connections.close_all()        # no worker inherits the socket
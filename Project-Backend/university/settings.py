@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 import pymysql
 pymysql.install_as_MySQLdb()
 
@@ -22,11 +23,31 @@ INSTALLED_APPS = [
     "api",
 ]
 
+# "db"     → django.contrib.sessions (django_session table)
+# "signed" → stateless signed token in a cookie / bearer header (api/tokens.py);
+#            needs REDIS_URL for its revocation list
+SESSION_MODE           = os.getenv("SESSION_MODE", "db")
+SIGNED_SESSION_COOKIE  = "member_token"
+SIGNED_SESSION_MAX_AGE = 60 * 60 * 24 * 7                 # 7 days, same as sessions
+
 MIDDLEWARE = ["django.middleware.common.CommonMiddleware",
                 "django.contrib.sessions.middleware.SessionMiddleware",
                 # 2. *after* sessions so request.session exists
                 "api.middleware.MemberSessionMiddleware",
 ]
+if SESSION_MODE == "signed":
+    # nothing reads request.session in this mode
+    MIDDLEWARE.remove("django.contrib.sessions.middleware.SessionMiddleware")
+
+# DB / view instrumentation exposed at /api/metrics (api/metrics.py);
+# when off, neither the middleware nor the call wrappers are installed
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+# directory shared by the server's processes; /api/metrics then sums them
+# all (required with more than one gunicorn worker)
+METRICS_DIR           = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "1"))  # snapshot age bound
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, "api.middleware.MetricsMiddleware")
 
 ROOT_URLCONF = "university.urls"
 WSGI_APPLICATION = "university.wsgi.application"
@@ -41,11 +62,124 @@ DATABASES = {
         "PORT": os.getenv("DB_PORT", "3306"),
         "OPTIONS": {"charset": "utf8mb4"},
         "CONN_MAX_AGE": 600,
+        # explicit, so `manage.py test` (api/tests.py needs no database)
+        # also runs without DB_NAME
+        "TEST": {"NAME": "test_" + (os.getenv("DB_NAME") or "university")},
     }
 }
+
+# bounded pool for call_procedure (api/pool.py); SIZE 0 → use Django's
+# per-thread connection as before
+DB_POOL = {
+    "SIZE":       int(os.getenv("DB_POOL_SIZE", "0")),
+    "TIMEOUT":    float(os.getenv("DB_POOL_TIMEOUT", "5")),      # checkout wait, s
+    "PING_AFTER": float(os.getenv("DB_POOL_PING_AFTER", "30")),  # idle s before ping
+}
 AUTHENTICATION_BACKENDS = ["api.auth.MemberBackend"]    
 
-REST_FRAMEWORK = { "UNAUTHENTICATED_USER": None }  # keep auth simple for now
+# shared cache: per-process memory by default, Redis when available so
+# invalidations reach every worker.
+#
+# Everything one process writes and another must see lives here: member
+# identities (invalidate_member), table versions behind the reference
+# caches and list ETags, revoked tokens, enrolment tickets.  LocMem is
+# only correct for a single server process – any multi-worker server
+# needs REDIS_URL (gunicorn.conf.py and settings_production refuse to
+# start without it), and with LocMem a management command's writes reach
+# a running server only once it restarts.
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+if os.getenv("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }
+elif SESSION_MODE == "signed":
+    # the revocation list (api/tokens.py) must reach every process, or a
+    # signed-out token stays valid on all the others
+    raise ImproperlyConfigured("SESSION_MODE=signed needs REDIS_URL")
+
+# identity cache used by MemberBackend.get_user (api/cache.py)
+MEMBER_CACHE_TIMEOUT    = int(os.getenv("MEMBER_CACHE_TIMEOUT", "300"))   # shared layer, s
+MEMBER_CACHE_LOCAL_SIZE = int(os.getenv("MEMBER_CACHE_LOCAL_SIZE", "4096"))
+MEMBER_CACHE_LOCAL_TTL  = float(os.getenv("MEMBER_CACHE_LOCAL_TTL", "5")) # per-process, s:
+                        # how long another worker may still see an invalidated identity
+
+# reference lists – semesters, departments, majors, courses, rooms
+# (api/cache.py).  Entries are invalidated by table version, the timeout
+# only bounds memory.  The versions (also behind the list ETags) live in
+# the shared cache: with LocMem, a write handled by one process or by a
+# management command leaves every other process on its old lists for up
+# to REFERENCE_CACHE_TIMEOUT – so more than one process needs REDIS_URL.
+REFERENCE_CACHE_TIMEOUT     = int(os.getenv("REFERENCE_CACHE_TIMEOUT", "3600"))
+REFERENCE_CACHE_LOCAL_SIZE  = int(os.getenv("REFERENCE_CACHE_LOCAL_SIZE", "256"))
+REFERENCE_CACHE_VERSION_TTL = float(os.getenv("REFERENCE_CACHE_VERSION_TTL", "1")) # per-process, s
+
+# semesters whose section search index (api/catalog.py) a process keeps
+CATALOG_SEMESTERS = int(os.getenv("CATALOG_SEMESTERS", "8"))
+
+# records per transaction when compute_semester_gpa fills sem_gpa
+SEMESTER_GPA_CHUNK = int(os.getenv("SEMESTER_GPA_CHUNK", "500"))
+
+# chunked semester close-out (api/closeout.py)
+SEMESTER_CLOSEOUT = {
+    "CHUNK":      int(os.getenv("SEMESTER_CLOSEOUT_CHUNK", "50")),      # sections per transaction
+    "PAUSE":      float(os.getenv("SEMESTER_CLOSEOUT_PAUSE", "0.05")),  # s between chunks
+}
+
+# key storage: "char" → CHAR(36) UUIDs (db/0*.sql), "binary" → BINARY(16)
+# time-ordered UUIDs (db/binary_uuid/, see `manage.py build_binary_uuid_schema`)
+UUID_STORAGE = os.getenv("UUID_STORAGE", "char")
+
+# grade_audit (api/audit.py):
+#   "transaction" – the grade procedures insert it, one statement per tx
+#   "table"       – grade_audit, written after commit by a batching thread
+#   "file"        – JSON lines appended to PATH by a batching thread
+#   "off"
+GRADE_AUDIT = {
+    "SINK":          os.getenv("GRADE_AUDIT_SINK", "transaction"),
+    "PATH":          os.getenv("GRADE_AUDIT_PATH", str(BASE_DIR / "grade_audit.jsonl")),
+    "BATCH":         int(os.getenv("GRADE_AUDIT_BATCH", "500")),        # entries per write
+    "FLUSH_SECONDS": float(os.getenv("GRADE_AUDIT_FLUSH_SECONDS", "1")), # max age of a batch
+    "MAX_PENDING":   int(os.getenv("GRADE_AUDIT_MAX_PENDING", "100000")), # then oldest dropped
+}
+
+# queued enrolment (api/enrollment_queue.py); off → POST /api/taken-courses
+# runs add_taken_course_tx inline as before.  The queue and its limits are
+# per server process: with N workers, up to N × PER_SECTION transactions
+# hit one section and N × DB_CONCURRENCY the database.  Tickets live in
+# the shared cache (REDIS_URL with more than one worker).
+ENROLLMENT_QUEUE = {
+    "ENABLED":        os.getenv("ENROLLMENT_QUEUE", "0") == "1",
+    "WORKERS":        int(os.getenv("ENROLLMENT_QUEUE_WORKERS", "4")),
+    "MAX_PENDING":    int(os.getenv("ENROLLMENT_QUEUE_MAX_PENDING", "5000")),
+    "PER_SECTION":    int(os.getenv("ENROLLMENT_QUEUE_PER_SECTION", "1")),   # concurrent tx per pcid, per process
+    "DB_CONCURRENCY": int(os.getenv("ENROLLMENT_QUEUE_DB_CONCURRENCY", "4")), # concurrent tx, per process
+    "GROUP_SIZE":     int(os.getenv("ENROLLMENT_QUEUE_GROUP_SIZE", "25")),   # jobs per transaction
+    "RESULT_TTL":     int(os.getenv("ENROLLMENT_QUEUE_RESULT_TTL", "600")),  # ticket lifetime, s
+    "RETRY_AFTER":    int(os.getenv("ENROLLMENT_QUEUE_RETRY_AFTER", "2")),   # s, on 503
+    "MAX_WAIT":       float(os.getenv("ENROLLMENT_QUEUE_MAX_WAIT", "5")),    # s a ticket poll may block
+}
+
+# async twins of the read endpoints (api/async_views.py) on an aiomysql
+# pool (api/adb.py) – for the ASGI server only (SERVER_INTERFACE=asgi);
+# ignored when aiomysql is not installed
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "0") == "1"
+ASYNC_DB_POOL = {
+    "SIZE":    int(os.getenv("ASYNC_DB_POOL_SIZE", "20")),        # connections per process
+    "TIMEOUT": float(os.getenv("ASYNC_DB_POOL_TIMEOUT", "5")),    # checkout wait, s
+    "RECYCLE": int(os.getenv("ASYNC_DB_POOL_RECYCLE", "3600")),   # reconnect after, s
+}
+
+REST_FRAMEWORK = {
+    "UNAUTHENTICATED_USER": None,  # keep auth simple for now
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "api.auth.SignedTokenAuthentication",   # bearer tokens, no CSRF
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+}
 STATIC_URL = "/static/"
 
 
@@ -0,0 +1,55 @@
+"""
+Production profile, used by the gunicorn server (gunicorn.conf.py,
+Dockerfile):
+
+    DJANGO_SETTINGS_MODULE=university.settings_production
+
+Everything in settings.py, minus the development conveniences.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+
+# DEBUG keeps every statement of a request in connection.queries and
+# answers errors with HTML tracebacks
+DEBUG = False
+
+if SECRET_KEY == "unsafe-dev-key":
+    raise ImproperlyConfigured("DJANGO_SECRET must be set in production")
+
+# every gunicorn worker must see the others' invalidations (settings.py)
+if not os.getenv("REDIS_URL"):
+    raise ImproperlyConfigured("REDIS_URL must be set in production")
+
+ALLOWED_HOSTS = [h.strip() for h in os.getenv("DJANGO_ALLOWED_HOSTS", "").split(",") if h.strip()]
+if not ALLOWED_HOSTS:
+    raise ImproperlyConfigured("DJANGO_ALLOWED_HOSTS must be set in production")
+CSRF_TRUSTED_ORIGINS = CSRF_TRUSTED_ORIGINS + [
+    o.strip() for o in os.getenv("CSRF_TRUSTED_ORIGINS", "").split(",") if o.strip()
+]
+
+# persistent connections (CONN_MAX_AGE) are checked once per request
+# instead of failing the first query after MySQL dropped them
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# JSON only – no browsable API templates
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+}
+
+# warnings and errors to stderr; SQL is never logged, whatever the level
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "root": {"handlers": ["console"], "level": os.getenv("DJANGO_LOG_LEVEL", "WARNING")},
+    "loggers": {
+        "django.db.backends": {"handlers": [], "level": "ERROR", "propagate": False},
+        "api.preload":        {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}